@@ -56,6 +56,10 @@ def get_signals_statistics(limit=20):
     
     logger = logging.getLogger(__name__)
     
+    # Строки из буфера записи journal должны быть видны при чтении
+    from journal import flush_signal_log
+    flush_signal_log()
+    
     if not os.path.exists("signals_log.csv"):
         logger.debug("Файл signals_log.csv не найден")
         return []
@@ -60,9 +60,9 @@ class Opportunity:
     readiness_score: float  # 0.0 - 1.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradingDecision:
-    """Финальное решение системы"""
+    """Финальное решение системы (immutable, создаётся на каждый сигнал)"""
     can_trade: bool  # Можно ли торговать
     reason: str  # Причина решения
     risk_level: str  # "LOW" | "MEDIUM" | "HIGH"
@@ -72,7 +72,8 @@ class TradingDecision:
     
     def __post_init__(self):
         if self.recommendations is None:
-            self.recommendations = []
+            # Используем object.__setattr__ потому что dataclass frozen=True блокирует обычное присваивание
+            object.__setattr__(self, "recommendations", [])
 
 
 class DecisionCore:
@@ -235,6 +235,54 @@ class DecisionTrace:
             # Не выбрасываем исключение - логирование не должно влиять на торговую логику
             return -1
     
+    def log_decisions_batch(self, records: List[DecisionRecord]) -> int:
+        """
+        Записывает несколько решений одной транзакцией.
+        
+        Args:
+            records: Список DecisionRecord (например, весь trace одного сигнала)
+        
+        Returns:
+            int: Количество записанных строк (0 при ошибке)
+        
+        Примечание:
+            Одно соединение и один commit на весь список вместо N вызовов log_decision.
+            В случае ошибки логируется, но не выбрасывается исключение.
+        """
+        if not records:
+            return 0
+        
+        try:
+            rows = [
+                (
+                    row["timestamp"],
+                    row["symbol"],
+                    row["decision_source"],
+                    row["allow_trading"],
+                    row["block_level"],
+                    row["reason"],
+                    row["context_snapshot"]
+                )
+                for row in (record.to_dict() for record in records)
+            ]
+            
+            conn = self._get_connection()
+            try:
+                conn.executemany("""
+                    INSERT INTO decision_trace 
+                    (timestamp, symbol, decision_source, allow_trading, block_level, reason, context_snapshot)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+            finally:
+                conn.close()
+            
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Ошибка пакетной записи решений в DecisionTrace: {type(e).__name__}: {e}", exc_info=True)
+            # Не выбрасываем исключение - логирование не должно влиять на торговую логику
+            return 0
+    
     def get_recent_decisions(
         self,
         limit: int = 100,
@@ -88,9 +88,9 @@ class PortfolioDecision(str, Enum):
     SCALE_DOWN = "SCALE_DOWN"  # Уменьшить размер из-за перегрузки
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PortfolioAnalysis:
-    """Результат анализа портфеля"""
+    """Результат анализа портфеля (immutable, создаётся на каждый сигнал)"""
     decision: PortfolioDecision
     reason: str
     recommended_size_multiplier: float = 1.0  # Множитель для размера позиции (0.0 - 1.0)
@@ -55,8 +55,9 @@ class TradingPermission(Enum):
 
 # ========== TRADING INTENT (INPUT) ==========
 # ADR-TRADING-RISK-CORE-001 Section 4: Inputs ONLY
+# Input snapshots are built per decision: slots keep them compact (no per-instance __dict__)
 
-@dataclass
+@dataclass(slots=True)
 class TradingIntent:
     """
     Trading intent - facts only.
@@ -75,7 +76,7 @@ class TradingIntent:
 # ========== CAPITAL & EXPOSURE SNAPSHOT (INPUT) ==========
 # ADR-TRADING-RISK-CORE-001 Section 4: Inputs ONLY
 
-@dataclass
+@dataclass(slots=True)
 class CapitalSnapshot:
     """Current capital state - facts only."""
     current_balance_usd: float
@@ -85,7 +86,7 @@ class CapitalSnapshot:
     loss_7d_usd: float   # Loss in last 7 days
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionSnapshot:
     """Single position snapshot."""
     symbol: str
@@ -96,7 +97,7 @@ class PositionSnapshot:
     leverage: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExposureSnapshot:
     """Current exposure state - facts only."""
     open_positions: List[PositionSnapshot]
@@ -108,7 +109,7 @@ class ExposureSnapshot:
 # ========== BEHAVIORAL COUNTERS (INPUT) ==========
 # ADR-TRADING-RISK-CORE-001 Section 4: Inputs ONLY
 
-@dataclass
+@dataclass(slots=True)
 class BehavioralCounters:
     """Behavioral counters - facts only."""
     actions_last_hour: int
@@ -121,7 +122,7 @@ class BehavioralCounters:
 # ========== SYSTEM HEALTH FLAGS (INPUT) ==========
 # ADR-TRADING-RISK-CORE-001 Section 4: Inputs ONLY
 
-@dataclass
+@dataclass(slots=True)
 class SystemHealthFlags:
     """System health flags - read-only."""
     is_safe_mode: bool
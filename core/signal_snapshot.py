@@ -212,6 +212,27 @@ class SignalSnapshot:
         )
 
 
+# Таблицы преобразования строк IO-слоя в enum (строятся один раз при импорте)
+_DECISION_BY_MODE = {
+    "TRADE": SignalDecision.ENTER,
+    "OBSERVE": SignalDecision.OBSERVE,
+    "CAUTION": SignalDecision.SKIP,
+    "STOP": SignalDecision.BLOCK
+}
+_RISK_BY_NAME = {
+    "LOW": RiskLevel.LOW,
+    "MEDIUM": RiskLevel.MEDIUM,
+    "HIGH": RiskLevel.HIGH
+}
+_VOLATILITY_BY_NAME = {
+    "LOW": VolatilityLevel.LOW,
+    "NORMAL": VolatilityLevel.NORMAL,
+    "HIGH": VolatilityLevel.HIGH,
+    "EXTREME": VolatilityLevel.EXTREME,
+    "UNKNOWN": VolatilityLevel.UNKNOWN
+}
+
+
 def mode_to_decision(mode: str) -> SignalDecision:
     """
     Преобразует режим рынка (market_mode) в решение по сигналу.
@@ -222,13 +243,7 @@ def mode_to_decision(mode: str) -> SignalDecision:
     Returns:
         SignalDecision: Решение по сигналу
     """
-    mapping = {
-        "TRADE": SignalDecision.ENTER,
-        "OBSERVE": SignalDecision.OBSERVE,
-        "CAUTION": SignalDecision.SKIP,
-        "STOP": SignalDecision.BLOCK
-    }
-    return mapping.get(mode, SignalDecision.SKIP)
+    return _DECISION_BY_MODE.get(mode, SignalDecision.SKIP)
 
 
 def risk_string_to_enum(risk: str) -> RiskLevel:
@@ -241,12 +256,7 @@ def risk_string_to_enum(risk: str) -> RiskLevel:
     Returns:
         RiskLevel: Enum уровня риска
     """
-    mapping = {
-        "LOW": RiskLevel.LOW,
-        "MEDIUM": RiskLevel.MEDIUM,
-        "HIGH": RiskLevel.HIGH
-    }
-    return mapping.get(risk, RiskLevel.MEDIUM)
+    return _RISK_BY_NAME.get(risk, RiskLevel.MEDIUM)
 
 
 def volatility_string_to_enum(volatility: str) -> Optional[VolatilityLevel]:
@@ -262,12 +272,5 @@ def volatility_string_to_enum(volatility: str) -> Optional[VolatilityLevel]:
     if not volatility:
         return None
     
-    mapping = {
-        "LOW": VolatilityLevel.LOW,
-        "NORMAL": VolatilityLevel.NORMAL,
-        "HIGH": VolatilityLevel.HIGH,
-        "EXTREME": VolatilityLevel.EXTREME,
-        "UNKNOWN": VolatilityLevel.UNKNOWN
-    }
-    return mapping.get(volatility.upper(), VolatilityLevel.UNKNOWN)
+    return _VOLATILITY_BY_NAME.get(volatility.upper(), VolatilityLevel.UNKNOWN)
 
@@ -6,6 +6,14 @@ from typing import Dict, Tuple, List, Optional
 BASE_URL = "https://api.bybit.com/v5/market/kline"
 INSTRUMENTS_URL = "https://api.bybit.com/v5/market/instruments-info"
 
+
+def _parse_kline(row):
+    """
+    Приводит числовые поля свечи Bybit (open, high, low, close, volume, ...)
+    к float; время открытия (row[0]) остаётся как есть.
+    """
+    return [row[0], *map(float, row[1:])]
+
 def get_candles(symbol, interval, limit=120):
     """
     Получает свечи с Bybit API.
@@ -51,8 +59,9 @@ def get_candles(symbol, interval, limit=120):
             logging.warning("Пустой список свечей для %s (%s). Возможно, символ недоступен на Bybit или переименован.", symbol, interval)
             return []
 
-        # Bybit отдаёт от новых к старым → разворачиваем
-        return list(reversed(candles))
+        # Bybit отдаёт от новых к старым → разворачиваем.
+        # Строки цен парсим в float один раз здесь, а не в каждом индикаторе
+        return [_parse_kline(row) for row in reversed(candles)]
     
     except requests.exceptions.RequestException as e:
         logging.warning("Ошибка при получении свечей для %s (%s): %s", symbol, interval, e)
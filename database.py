@@ -10,7 +10,7 @@ CSV остается для логов (signals_log.csv)
 """
 import sqlite3
 import os
-from datetime import datetime, UTC
+from datetime import datetime, UTC, timedelta
 from typing import List, Dict, Optional
 from pathlib import Path
 import logging
@@ -343,6 +343,60 @@ def get_trades_statistics(days: int = 1) -> Dict:
     }
 
 
+def get_trades_statistics_multi(day_windows=(1, 7)) -> Dict[int, Dict]:
+    """
+    Сводная статистика закрытых сделок сразу по нескольким окнам одним запросом.
+    
+    Окна считаются так же, как в get_trades_statistics (от начала текущих суток UTC).
+    
+    Args:
+        day_windows: Периоды в днях (например, (1, 7))
+    
+    Returns:
+        dict: {days: {"total_trades", "winning_trades", "losing_trades", "total_pnl"}}
+    """
+    windows = sorted(set(day_windows))
+    if not windows:
+        return {}
+    
+    day_start = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    cutoffs = [(day_start - timedelta(days=days)).isoformat() for days in windows]
+    
+    columns = []
+    params = []
+    for i, cutoff in enumerate(cutoffs):
+        columns.append(
+            f"SUM(CASE WHEN timestamp >= ? THEN 1 ELSE 0 END) as total_{i}, "
+            f"SUM(CASE WHEN timestamp >= ? AND pnl > 0 THEN 1 ELSE 0 END) as wins_{i}, "
+            f"SUM(CASE WHEN timestamp >= ? AND pnl < 0 THEN 1 ELSE 0 END) as losses_{i}, "
+            f"SUM(CASE WHEN timestamp >= ? THEN pnl ELSE 0 END) as pnl_{i}"
+        )
+        params.extend((cutoff, cutoff, cutoff, cutoff))
+    # Самое широкое окно ограничивает сканирование
+    params.append(min(cutoffs))
+    
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {', '.join(columns)} FROM trades WHERE status = 'CLOSED' AND timestamp >= ?",
+            params
+        )
+        row = cursor.fetchone()
+    finally:
+        conn.close()
+    
+    result = {}
+    for i, days in enumerate(windows):
+        result[days] = {
+            "total_trades": row[f"total_{i}"] or 0,
+            "winning_trades": row[f"wins_{i}"] or 0,
+            "losing_trades": row[f"losses_{i}"] or 0,
+            "total_pnl": row[f"pnl_{i}"] or 0.0,
+        }
+    return result
+
+
 def get_current_balance_from_db(initial_balance: float = 10000.0) -> float:
     """
     Рассчитывает текущий баланс на основе закрытых сделок.
@@ -370,6 +424,46 @@ def get_current_balance_from_db(initial_balance: float = 10000.0) -> float:
     return max(balance, 10.0)  # Минимум 10 USDT
 
 
+# Размер пачки строк для executemany при миграции
+MIGRATION_BATCH_SIZE = 10000
+
+_MIGRATION_INSERT_SQL = """
+    INSERT INTO trades (
+        timestamp, symbol, side, entry, stop, target, status,
+        position_size, leverage, close_price, close_reason, pnl
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _insert_migration_batch(cursor: sqlite3.Cursor, batch: List[tuple]) -> int:
+    """
+    Вставляет пачку сделок одним executemany.
+    
+    Если пачка не вставилась целиком, откатывает её до savepoint и
+    повторяет построчно, чтобы пропустить только проблемные строки.
+    
+    Returns:
+        int: Количество строк с ошибками
+    """
+    cursor.execute("SAVEPOINT migration_batch")
+    try:
+        cursor.executemany(_MIGRATION_INSERT_SQL, batch)
+        cursor.execute("RELEASE migration_batch")
+        return 0
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK TO migration_batch")
+        cursor.execute("RELEASE migration_batch")
+    
+    errors = 0
+    for params in batch:
+        try:
+            cursor.execute(_MIGRATION_INSERT_SQL, params)
+        except sqlite3.Error as e:
+            errors += 1
+            logger.warning(f"Ошибка при миграции строки: {e}")
+    return errors
+
+
 def migrate_from_csv(csv_file: str = "demo_trades.csv"):
     """
     Мигрирует данные из CSV в SQLite.
@@ -390,6 +484,14 @@ def migrate_from_csv(csv_file: str = "demo_trades.csv"):
     errors = 0
     
     try:
+        # Уже существующие сделки загружаем один раз, а не SELECT на каждую строку
+        cursor.execute("SELECT timestamp, symbol, status FROM trades")
+        existing = {tuple(row) for row in cursor.fetchall()}
+        batch = []
+        
+        # Вся миграция - одна транзакция (savepoint пачек вложены в неё)
+        cursor.execute("BEGIN")
+        
         with open(csv_file, "r", encoding="utf-8") as f:
             reader = csv.reader(f)
             
@@ -444,30 +546,32 @@ def migrate_from_csv(csv_file: str = "demo_trades.csv"):
                             pass
                     
                     # Проверяем, не существует ли уже эта сделка
-                    cursor.execute("""
-                        SELECT id FROM trades WHERE timestamp = ? AND symbol = ? AND status = ?
-                    """, (timestamp, symbol, status))
-                    
-                    if cursor.fetchone():
+                    key = (timestamp, symbol, status)
+                    if key in existing:
                         # Сделка уже существует, пропускаем
                         continue
+                    existing.add(key)
                     
-                    # Добавляем сделку
-                    cursor.execute("""
-                        INSERT INTO trades (
-                            timestamp, symbol, side, entry, stop, target, status,
-                            position_size, leverage, close_price, close_reason, pnl
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (timestamp, symbol, side, entry, stop, target, status,
-                          position_size, leverage, close_price, close_reason, pnl))
+                    # Добавляем сделку в пачку
+                    batch.append((timestamp, symbol, side, entry, stop, target, status,
+                                  position_size, leverage, close_price, close_reason, pnl))
                     
-                    migrated += 1
+                    if len(batch) >= MIGRATION_BATCH_SIZE:
+                        batch_errors = _insert_migration_batch(cursor, batch)
+                        migrated += len(batch) - batch_errors
+                        errors += batch_errors
+                        batch = []
                     
                 except Exception as e:
                     errors += 1
                     logger.warning(f"Ошибка при миграции строки: {e}")
                     continue
         
+        if batch:
+            batch_errors = _insert_migration_batch(cursor, batch)
+            migrated += len(batch) - batch_errors
+            errors += batch_errors
+        
         conn.commit()
         conn.close()
         
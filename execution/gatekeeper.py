@@ -3,7 +3,10 @@ Gatekeeper - между сигналами и пользователем
 
 Проверяет сигналы через Decision Core и Portfolio Brain перед отправкой пользователю.
 """
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Any
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cache, cached_property
 from core.decision_core import get_decision_core, TradingDecision
 from core.portfolio_brain import (
     get_portfolio_brain, PortfolioBrain, PortfolioAnalysis,
@@ -15,19 +18,23 @@ from core.system_guardian import get_system_guardian
 from core.risk_core import (
     get_risk_core, TradingIntent, CapitalSnapshot, ExposureSnapshot,
     PositionSnapshot, BehavioralCounters, SystemHealthFlags,
-    TradingPermission
+    TradingPermission, RiskState
 )
 from trade_manager import get_open_trades
 from capital import get_current_balance, INITIAL_BALANCE, RISK_PERCENT
 from telegram_bot import send_message, send_chart
 from datetime import datetime, UTC, timedelta
-from bot_statistics import get_trade_statistics
+from database import get_trades_statistics_multi
+import atexit
 import logging
+import operator
+import queue
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 from signals import build_signal
 
-# MetaDecisionBrain - опциональный импорт (если модуль недоступен, система продолжит работать)
 # MetaDecisionBrain - опциональный импорт (если модуль недоступен, система продолжит работать)
 try:
     from brains.meta_decision_brain import (
@@ -43,11 +50,12 @@ except ImportError:
 
 # DecisionTrace - опциональный импорт (для объяснимости решений)
 try:
-    from core.decision_trace import DecisionTrace, BlockLevel as TraceBlockLevel
+    from core.decision_trace import DecisionTrace, DecisionRecord, BlockLevel as TraceBlockLevel
     DECISION_TRACE_AVAILABLE = True
 except ImportError:
     DECISION_TRACE_AVAILABLE = False
     DecisionTrace = None
+    DecisionRecord = None
     TraceBlockLevel = None
 
 # PositionSizer - опциональный импорт
@@ -58,13 +66,156 @@ except ImportError:
     POSITION_SIZER_AVAILABLE = False
     PositionSizer = None
     PortfolioStateAdapter = None
-try:
-    from core.decision_trace import DecisionTrace, BlockLevel as TraceBlockLevel
-    DECISION_TRACE_AVAILABLE = True
-except ImportError:
-    DECISION_TRACE_AVAILABLE = False
-    DecisionTrace = None
-    TraceBlockLevel = None
+
+# system_state текущего тика (устанавливается на время обработки пачки сигналов)
+_current_system_state: ContextVar = ContextVar("gatekeeper_system_state", default=None)
+
+
+def _get_system_state():
+    """Возвращает system_state текущего тика или глобальный SystemState"""
+    system_state = _current_system_state.get()
+    if system_state is None:
+        from system_state import get_system_state
+        system_state = get_system_state()
+    return system_state
+
+
+# Флаги здоровья системы, которые читают Risk Core и MetaDecisionBrain
+_SH_FIELDS = operator.attrgetter("system_health.safe_mode", "system_health.consecutive_errors")
+
+
+def _read_health(system_state) -> tuple:
+    """Возвращает (safe_mode, consecutive_errors); (False, 0) если system_health недоступен"""
+    try:
+        safe_mode, consecutive_errors = _SH_FIELDS(system_state)
+    except AttributeError:
+        return False, 0
+    return bool(safe_mode), int(consecutive_errors)
+
+
+# Доля баланса, выделяемая под риск одной сделки
+RISK_FRACTION = RISK_PERCENT / 100.0
+
+@dataclass
+class DecisionContext:
+    """
+    Данные одного решения Gatekeeper.
+    
+    Баланс, открытые сделки и статистика запрашиваются лениво и не более
+    одного раза на сигнал: все фильтры (Risk Core, MetaDecisionBrain,
+    Portfolio Brain, PositionSizer) используют один и тот же снимок.
+    """
+    system_state: Any = None
+    
+    @cached_property
+    def balance(self) -> float:
+        return get_current_balance()
+    
+    @cached_property
+    def open_trades(self) -> List[Dict]:
+        return get_open_trades()
+    
+    @cached_property
+    def trade_stats(self) -> Dict[int, Dict]:
+        """Статистика закрытых сделок за 1 и 7 дней (один запрос к БД)"""
+        return get_trades_statistics_multi((1, 7))
+    
+    @property
+    def stats_24h(self) -> Dict:
+        return self.trade_stats.get(1, {})
+    
+    @property
+    def stats_7d(self) -> Dict:
+        return self.trade_stats.get(7, {})
+    
+    @cached_property
+    def recent_signals(self) -> List[Dict]:
+        return getattr(self.system_state, 'recent_signals', None) or []
+    
+    @cached_property
+    def now(self) -> datetime:
+        """Единая временная метка решения"""
+        return datetime.now(UTC)
+    
+    @cached_property
+    def action_counts(self):
+        """(actions_last_hour, actions_last_24h) за один проход по recent_signals"""
+        now = self.now
+        last_hour = 0
+        last_24h = 0
+        for signal in self.recent_signals:
+            age = (now - signal.get('timestamp', now)).total_seconds()
+            if age < 86400:
+                last_24h += 1
+                if age < 3600:
+                    last_hour += 1
+        return last_hour, last_24h
+    
+    @cached_property
+    def open_positions(self) -> List[PositionSnapshot]:
+        """Открытые позиции в формате Risk Core"""
+        return [
+            PositionSnapshot(
+                symbol=trade.get("symbol", ""),
+                side=trade.get("side", "LONG"),
+                position_size_usd=float(trade.get("position_size", 0)),
+                entry_price=float(trade.get("entry", 0)),
+                stop_price=float(trade.get("stop", 0)),
+                leverage=trade.get("leverage")
+            )
+            for trade in self.open_trades
+        ]
+    
+    @cached_property
+    def exposure_totals(self):
+        """(total_exposure_usd, max_single_position_usd) за один проход по позициям"""
+        total = 0.0
+        largest = 0.0
+        for pos in self.open_positions:
+            size = pos.position_size_usd
+            total += size
+            if size > largest:
+                largest = size
+        return total, largest
+    
+    @property
+    def total_exposure_usd(self) -> float:
+        return self.exposure_totals[0]
+    
+    @cached_property
+    def portfolio_positions(self):
+        """Открытые позиции в формате Portfolio Brain"""
+        return convert_trades_to_positions(self.open_trades)
+    
+    @cached_property
+    def portfolio_state(self) -> PortfolioState:
+        """PortfolioState для Portfolio Brain / PositionSizer"""
+        if not self.open_trades:
+            # Пустой портфель - минимальный PortfolioState
+            return PortfolioState(
+                total_exposure=0.0,
+                long_exposure=0.0,
+                short_exposure=0.0,
+                net_exposure=0.0,
+                risk_budget=self.balance * RISK_FRACTION,
+                used_risk=0.0
+            )
+        risk_budget = self.balance * RISK_FRACTION * len(self.open_trades)  # Упрощённо
+        return calculate_portfolio_state(
+            open_positions=self.portfolio_positions,
+            risk_budget=risk_budget,
+            initial_balance=INITIAL_BALANCE
+        )
+
+
+# Максимальный размер очереди записи DecisionTrace (при переполнении теряются самые старые записи)
+TRACE_QUEUE_MAXSIZE = 10000
+
+# Сколько сигналов фоновый поток записывает за одну транзакцию
+TRACE_WRITE_BATCH = 64
+
+# Сколько секунд flush_traces() по умолчанию ждёт дозаписи очереди
+TRACE_FLUSH_TIMEOUT = 5.0
 
 
 class Gatekeeper:
@@ -74,6 +225,12 @@ class Gatekeeper:
     Только сигналы, прошедшие проверку, доходят до пользователя.
     """
     
+    __slots__ = (
+        "decision_core", "portfolio_brain", "risk_core", "meta_decision_brain",
+        "decision_trace", "trace_enabled", "_trace_queue", "position_sizer",
+        "blocked_signals_count", "approved_signals_count"
+    )
+    
     def __init__(self):
         self.decision_core = get_decision_core()
         self.portfolio_brain = get_portfolio_brain()
@@ -98,6 +255,18 @@ class Gatekeeper:
                 logger.warning(f"DecisionTrace недоступен: {type(e).__name__}: {e}")
                 self.decision_trace = None
                 self.trace_enabled = False
+        # Очередь записи trace: запись в БД выполняется фоновым потоком,
+        # а не на критическом пути сигнала (один писатель сохраняет порядок)
+        self._trace_queue = None
+        if self.trace_enabled:
+            self._trace_queue = queue.Queue(maxsize=TRACE_QUEUE_MAXSIZE)
+            threading.Thread(
+                target=self._trace_writer_loop,
+                name="DecisionTraceWriter",
+                daemon=True
+            ).start()
+            # Поток daemon: без flush при выходе очередь была бы потеряна
+            atexit.register(self.flush_traces)
         # PositionSizer - опционально (для расчёта размера позиции)
         self.position_sizer = None
         if POSITION_SIZER_AVAILABLE:
@@ -106,14 +275,9 @@ class Gatekeeper:
             except Exception as e:
                 logger.warning(f"PositionSizer недоступен: {type(e).__name__}: {e}")
                 self.position_sizer = None
+        # Счётчики решений (total вычисляется в get_stats)
         self.blocked_signals_count = 0
         self.approved_signals_count = 0
-        # Явное состояние (статистика)
-        self.state = {
-            "blocked": 0,
-            "approved": 0,
-            "total": 0
-        }
     
     def reset(self):
         """
@@ -122,11 +286,6 @@ class Gatekeeper:
         """
         self.blocked_signals_count = 0
         self.approved_signals_count = 0
-        self.state = {
-            "blocked": 0,
-            "approved": 0,
-            "total": 0
-        }
     
     def check_signal(self, symbol: str, signal_data: Dict, system_state=None) -> bool:
         """
@@ -141,35 +300,30 @@ class Gatekeeper:
             bool: True если сигнал одобрен, False если заблокирован
         """
         try:
-            # Получаем system_state если не передан
+            # Получаем system_state если не передан (system_state тика или глобальный)
             if system_state is None:
-                from system_state import get_system_state
-                system_state = get_system_state()
+                system_state = _get_system_state()
             
             # Получаем решение от Decision Core
             decision = self.decision_core.should_i_trade(symbol=symbol, system_state=system_state)
             
             if not decision.can_trade:
                 self.blocked_signals_count += 1
-                self._update_state()
                 self._log_blocked_signal(symbol, decision)
                 return False
             
             # Дополнительные проверки
             if not self._check_signal_quality(signal_data, decision):
                 self.blocked_signals_count += 1
-                self._update_state()
                 logger.debug(f"Gatekeeper: сигнал {symbol} заблокирован из-за качества (размер или плечо)")
                 return False
             
             self.approved_signals_count += 1
-            self._update_state()
             return True
         except Exception as e:
             # Критическая ошибка - блокируем сигнал для безопасности
             logger.error(f"Критическая ошибка в Gatekeeper.check_signal для {symbol}: {type(e).__name__}: {e}", exc_info=True)
             self.blocked_signals_count += 1
-            self._update_state()
             return False
     
     def send_signal(self, symbol: str, signal_data: Dict, 
@@ -191,11 +345,66 @@ class Gatekeeper:
             system_state: Состояние системы (опционально)
             snapshot: SignalSnapshot (опционально, для портфельного анализа)
         """
+        self._send_one(
+            symbol, signal_data, states, directions, risk, score, mode, reasons,
+            system_state=system_state, snapshot=snapshot
+        )
+    
+    def send_signals_batch(self, items: List[Dict], system_state=None, on_processed=None):
+        """
+        Отправляет пачку сигналов одного тика.
+        
+        system_state и разрешение SystemGuardian получаются ОДИН раз на пачку.
+        Risk Core и Portfolio Brain по-прежнему оцениваются для каждого сигнала
+        отдельно: сигнал, обработанный раньше, может открыть позицию.
+        
+        Args:
+            items: Список kwargs для send_signal (symbol, signal_data, states, ...)
+            system_state: Состояние системы (опционально)
+            on_processed: callback(item), вызывается после обработки каждого сигнала
+        """
+        guardian_permission = None
         try:
-            # Получаем system_state если не передан
             if system_state is None:
-                from system_state import get_system_state
-                system_state = get_system_state()
+                system_state = _get_system_state()
+            guardian_permission = get_system_guardian().can_trade_sync()
+        except Exception as e:
+            # Не удалось получить общий контекст - каждый сигнал получит его сам
+            logger.error(f"Ошибка подготовки пачки сигналов в Gatekeeper: {type(e).__name__}: {e}", exc_info=True)
+        
+        # system_state тика доступен всем вложенным проверкам без повторного получения
+        token = _current_system_state.set(system_state)
+        try:
+            for item in items:
+                self._send_one(
+                    **item,
+                    system_state=system_state,
+                    guardian_permission=guardian_permission
+                )
+                if on_processed:
+                    on_processed(item)
+        finally:
+            _current_system_state.reset(token)
+    
+    def _send_one(self, symbol: str, signal_data: Dict,
+                  states: Dict, directions: Dict,
+                  risk: str, score: int, mode: str, reasons: list,
+                  system_state=None, snapshot: Optional[SignalSnapshot] = None,
+                  guardian_permission=None):
+        """
+        Проводит один сигнал через все фильтры и отправляет его.
+        
+        Args:
+            guardian_permission: Заранее полученное разрешение SystemGuardian
+                (для пачки сигналов); None - запросить для этого сигнала
+        """
+        try:
+            # Получаем system_state если не передан (system_state тика или глобальный)
+            if system_state is None:
+                system_state = _get_system_state()
+            
+            # Баланс, сделки и статистика - один раз на решение
+            ctx = DecisionContext(system_state=system_state)
             
             # ========== SYSTEM GUARDIAN - ОБЯЗАТЕЛЬНЫЙ ГЛОБАЛЬНЫЙ БАРЬЕР ==========
             # АРХИТЕКТУРНЫЙ ИНВАРИАНТ: Невозможно отправить сигнал без прохождения SystemGuardian
@@ -212,8 +421,10 @@ class Gatekeeper:
             # - Обходить SystemGuardian
             # - Вызывать async методы SystemGuardian напрямую
             # - Отправлять сигналы без проверки SystemGuardian
-            system_guardian = get_system_guardian()
-            permission = system_guardian.can_trade_sync()
+            permission = guardian_permission
+            if permission is None:
+                system_guardian = get_system_guardian()
+                permission = system_guardian.can_trade_sync()
             
             # АРХИТЕКТУРНОЕ ПРИНУЖДЕНИЕ: Если SystemGuardian блокирует → немедленный выход
             if not permission.allowed:
@@ -222,7 +433,6 @@ class Gatekeeper:
                     f"(blocked_by: {permission.blocked_by})"
                 )
                 self.blocked_signals_count += 1
-                self._update_state()
                 return  # Early exit - fail-safe (архитектурно принудительно)
             
             # ========== DECISION TRACE - ЛОКАЛЬНЫЙ СБОР РЕШЕНИЙ ==========
@@ -237,7 +447,7 @@ class Gatekeeper:
             # FAIL-CLOSED ENFORCEMENT: Risk Core evaluation is MANDATORY and AUTHORITATIVE
             # Any failure (exception, None, malformed result) → DENY + HALTED immediately
             try:
-                risk_core_result = self._check_risk_core(symbol, signal_data, system_state)
+                risk_core_result = self._check_risk_core(symbol, signal_data, system_state, ctx)
                 
                 # FAIL-CLOSED: If Risk Core returns None or malformed result → DENY + HALTED
                 if not risk_core_result:
@@ -246,15 +456,13 @@ class Gatekeeper:
                         f"ADR-TRADING-RISK-CORE-001 violation: enforcing DENY + HALTED"
                     )
                     # Treat as DENY + HALTED (fail-closed)
-                    from core.risk_core import RiskState
                     risk_reason = "Risk Core evaluation failed (returned None) → DENY + HALTED"
                     block_level = TraceBlockLevel.HARD if TraceBlockLevel else None
                     trace_entries.append(("RiskCore", False, risk_reason, block_level))
-                    logger.error(f"[TRACE] RiskCore → DENY → {risk_reason}")
-                    print(f"   🚫 Risk Core evaluation failed for {symbol}: enforcing DENY + HALTED")
+                    logger.error("[TRACE] RiskCore → DENY → %s", risk_reason)
+                    logger.info("🚫 Risk Core evaluation failed for %s: enforcing DENY + HALTED", symbol)
                     self.blocked_signals_count += 1
-                    self._update_state()
-                    self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                    self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                     return  # Early exit - fail-closed enforcement
                 
                 # Validate result structure (fail-closed)
@@ -264,22 +472,19 @@ class Gatekeeper:
                         f"ADR-TRADING-RISK-CORE-001 violation: enforcing DENY + HALTED"
                     )
                     # Treat as DENY + HALTED (fail-closed)
-                    from core.risk_core import RiskState
                     risk_reason = f"Risk Core evaluation returned malformed result → DENY + HALTED"
                     block_level = TraceBlockLevel.HARD if TraceBlockLevel else None
                     trace_entries.append(("RiskCore", False, risk_reason, block_level))
-                    logger.error(f"[TRACE] RiskCore → DENY → {risk_reason}")
-                    print(f"   🚫 Risk Core evaluation malformed for {symbol}: enforcing DENY + HALTED")
+                    logger.error("[TRACE] RiskCore → DENY → %s", risk_reason)
+                    logger.info("🚫 Risk Core evaluation malformed for %s: enforcing DENY + HALTED", symbol)
                     self.blocked_signals_count += 1
-                    self._update_state()
-                    self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                    self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                     return  # Early exit - fail-closed enforcement
                 
                 # Extract result (validated)
                 permission, risk_state, violation_report = risk_core_result
                 
                 # Validate result types (fail-closed)
-                from core.risk_core import RiskState
                 if not isinstance(permission, TradingPermission) or not isinstance(risk_state, RiskState):
                     logger.critical(
                         f"Risk Core evaluation returned invalid types for {symbol}: "
@@ -290,11 +495,10 @@ class Gatekeeper:
                     risk_reason = f"Risk Core evaluation returned invalid types → DENY + HALTED"
                     block_level = TraceBlockLevel.HARD if TraceBlockLevel else None
                     trace_entries.append(("RiskCore", False, risk_reason, block_level))
-                    logger.error(f"[TRACE] RiskCore → DENY → {risk_reason}")
-                    print(f"   🚫 Risk Core evaluation invalid types for {symbol}: enforcing DENY + HALTED")
+                    logger.error("[TRACE] RiskCore → DENY → %s", risk_reason)
+                    logger.info("🚫 Risk Core evaluation invalid types for %s: enforcing DENY + HALTED", symbol)
                     self.blocked_signals_count += 1
-                    self._update_state()
-                    self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                    self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                     return  # Early exit - fail-closed enforcement
                 
                 # Логируем решение Risk Core
@@ -304,7 +508,7 @@ class Gatekeeper:
                     risk_reason += f", violations: {len(violation_report.violations)}"
                 block_level = TraceBlockLevel.HARD if (not risk_allowed and TraceBlockLevel) else (TraceBlockLevel.NONE if TraceBlockLevel else None)
                 trace_entries.append(("RiskCore", risk_allowed, risk_reason, block_level))
-                logger.info(f"[TRACE] RiskCore → {'ALLOW' if risk_allowed else 'DENY'} → {risk_reason}")
+                logger.info("[TRACE] RiskCore → %s → %s", "ALLOW" if risk_allowed else "DENY", risk_reason)
                 
                 if permission == TradingPermission.DENY:
                     # Risk Core заблокировал торговлю (veto power)
@@ -312,11 +516,10 @@ class Gatekeeper:
                         f"Signal blocked by Risk Core for {symbol}: {risk_state.value} "
                         f"(violations: {len(violation_report.violations) if violation_report else 0})"
                     )
-                    print(f"   🚫 Risk Core заблокировал сигнал для {symbol}: {risk_state.value}")
+                    logger.info("🚫 Risk Core заблокировал сигнал для %s: %s", symbol, risk_state.value)
                     self.blocked_signals_count += 1
-                    self._update_state()
                     # Сохраняем trace ПОСЛЕ принятия решения
-                    self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                    self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                     return  # Early exit - Risk Core veto
                 
                 # Если ALLOW_LIMITED, ограничиваем размер позиции
@@ -336,34 +539,31 @@ class Gatekeeper:
                     exc_info=True
                 )
                 # Treat as DENY + HALTED (fail-closed)
-                from core.risk_core import RiskState
                 risk_reason = f"Risk Core evaluation exception: {type(e).__name__} → DENY + HALTED"
                 block_level = TraceBlockLevel.HARD if TraceBlockLevel else None
                 trace_entries.append(("RiskCore", False, risk_reason, block_level))
-                logger.error(f"[TRACE] RiskCore → DENY → {risk_reason}")
-                print(f"   🚫 Risk Core evaluation exception for {symbol}: enforcing DENY + HALTED")
+                logger.error("[TRACE] RiskCore → DENY → %s", risk_reason)
+                logger.info("🚫 Risk Core evaluation exception for %s: enforcing DENY + HALTED", symbol)
                 self.blocked_signals_count += 1
-                self._update_state()
-                self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                 return  # Early exit - fail-closed enforcement
             
             # ========== META DECISION BRAIN - ВТОРОЙ ФИЛЬТР ==========
             # Проверяем через MetaDecisionBrain ДО всех остальных проверок
             if self.meta_decision_brain and snapshot:
-                meta_result = self._check_meta_decision(snapshot, system_state)
+                meta_result = self._check_meta_decision(snapshot, system_state, ctx)
                 if meta_result:
                     # Логируем решение MetaDecisionBrain
                     block_level = TraceBlockLevel.HARD if (meta_result.block_level and hasattr(meta_result.block_level, 'value') and meta_result.block_level.value == "HARD") else TraceBlockLevel.NONE
                     trace_entries.append(("META", meta_result.allow_trading, meta_result.reason, block_level))
-                    logger.info(f"[TRACE] META → {'ALLOW' if meta_result.allow_trading else 'BLOCK'} → reason={meta_result.reason}")
+                    logger.info("[TRACE] META → %s → reason=%s", "ALLOW" if meta_result.allow_trading else "BLOCK", meta_result.reason)
                     
                     if not meta_result.allow_trading:
                         # MetaDecisionBrain заблокировал торговлю
-                        print(f"   🚫 MetaDecisionBrain заблокировал сигнал для {symbol}: {meta_result.reason}")
+                        logger.info("🚫 MetaDecisionBrain заблокировал сигнал для %s: %s", symbol, meta_result.reason)
                         self.blocked_signals_count += 1
-                        self._update_state()
                         # Сохраняем trace ПОСЛЕ принятия решения
-                        self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                        self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                         return  # Early exit - не вызываем DecisionCore, PortfolioBrain
             
             # Проверяем через Gatekeeper
@@ -372,33 +572,32 @@ class Gatekeeper:
                 # Логируем решение DecisionCore
                 decision = self.decision_core.should_i_trade(symbol=symbol, system_state=system_state)
                 trace_entries.append(("DecisionCore", False, decision.reason if decision else "Signal blocked", TraceBlockLevel.NONE))
-                logger.info(f"[TRACE] DecisionCore → BLOCK → reason={decision.reason if decision else 'Signal blocked'}")
-                print(f"   🚫 Gatekeeper заблокировал сигнал для {symbol}")
+                logger.info("[TRACE] DecisionCore → BLOCK → reason=%s", decision.reason if decision else "Signal blocked")
+                logger.info("🚫 Gatekeeper заблокировал сигнал для %s", symbol)
                 # Сохраняем trace ПОСЛЕ принятия решения
-                self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                 return
             
             # Логируем решение DecisionCore (если прошло)
             decision = self.decision_core.should_i_trade(symbol=symbol, system_state=system_state)
             trace_entries.append(("DecisionCore", True, decision.reason if decision else "Signal approved", TraceBlockLevel.NONE))
-            logger.info(f"[TRACE] DecisionCore → ALLOW → reason={decision.reason if decision else 'Signal approved'}")
+            logger.info("[TRACE] DecisionCore → ALLOW → reason=%s", decision.reason if decision else "Signal approved")
             
             # Портфельный анализ (если есть snapshot)
             portfolio_analysis = None
             if snapshot:
-                portfolio_analysis = self._check_portfolio(snapshot)
+                portfolio_analysis = self._check_portfolio(snapshot, ctx)
                 if portfolio_analysis:
                     # Логируем решение PortfolioBrain
                     portfolio_allowed = portfolio_analysis.decision != PortfolioDecision.BLOCK
                     trace_entries.append(("PortfolioBrain", portfolio_allowed, portfolio_analysis.reason, TraceBlockLevel.NONE))
-                    logger.info(f"[TRACE] PortfolioBrain → {'ALLOW' if portfolio_allowed else 'BLOCK'} → reason={portfolio_analysis.reason}")
+                    logger.info("[TRACE] PortfolioBrain → %s → reason=%s", "ALLOW" if portfolio_allowed else "BLOCK", portfolio_analysis.reason)
                     
                     if portfolio_analysis.decision == PortfolioDecision.BLOCK:
-                        print(f"   🚫 Portfolio Brain заблокировал сигнал для {symbol}: {portfolio_analysis.reason}")
+                        logger.info("🚫 Portfolio Brain заблокировал сигнал для %s: %s", symbol, portfolio_analysis.reason)
                         self.blocked_signals_count += 1
-                        self._update_state()
                         # Сохраняем trace ПОСЛЕ принятия решения
-                        self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                        self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                         return
                 
                 # Применяем размер позиции из portfolio_analysis
@@ -406,25 +605,24 @@ class Gatekeeper:
                     original_size = signal_data.get("position_size", 0.0)
                     if original_size > 0:
                         signal_data["position_size"] = original_size * portfolio_analysis.recommended_size_multiplier
-                        print(f"   📉 Portfolio Brain уменьшил размер позиции для {symbol}: {portfolio_analysis.reason}")
+                        logger.info("📉 Portfolio Brain уменьшил размер позиции для %s: %s", symbol, portfolio_analysis.reason)
             
             # ========== POSITION SIZER - ПОСЛЕДНИЙ ШАГ ПЕРЕД ОТПРАВКОЙ ==========
             # Рассчитываем финальный размер позиции через PositionSizer
             if self.position_sizer and snapshot:
-                sizing_result = self._calculate_position_size(snapshot, portfolio_analysis)
+                sizing_result = self._calculate_position_size(snapshot, portfolio_analysis, ctx)
                 if sizing_result:
                     # Логируем решение PositionSizer
                     trace_entries.append(("PositionSizer", sizing_result.position_allowed, sizing_result.reason, TraceBlockLevel.NONE))
-                    logger.info(f"[TRACE] PositionSizer → {'ALLOW' if sizing_result.position_allowed else 'BLOCK'} → reason={sizing_result.reason}")
+                    logger.info("[TRACE] PositionSizer → %s → reason=%s", "ALLOW" if sizing_result.position_allowed else "BLOCK", sizing_result.reason)
                     
                     if not sizing_result.position_allowed:
                         # PositionSizer заблокировал торговлю (риск слишком мал)
-                        logger.info(f"[SIZER] Trade blocked: {sizing_result.reason}")
-                        print(f"   🚫 PositionSizer заблокировал сигнал для {symbol}: {sizing_result.reason}")
+                        logger.info("[SIZER] Trade blocked: %s", sizing_result.reason)
+                        logger.info("🚫 PositionSizer заблокировал сигнал для %s: %s", symbol, sizing_result.reason)
                         self.blocked_signals_count += 1
-                        self._update_state()
                         # Сохраняем trace ПОСЛЕ принятия решения
-                        self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
+                        self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="BLOCK")
                         return
                     
                     # Применяем размер позиции из PositionSizer
@@ -434,11 +632,11 @@ class Gatekeeper:
                         if original_size > 0:
                             size_multiplier = sizing_result.position_size_usd / original_size
                             signal_data["position_size"] = sizing_result.position_size_usd
-                            logger.info(f"[SIZER] size_multiplier={size_multiplier:.2f}, final_risk={sizing_result.final_risk:.2f}%")
+                            logger.info("[SIZER] size_multiplier=%.2f, final_risk=%.2f%%", size_multiplier, sizing_result.final_risk)
                         else:
                             # Если размера не было, используем рассчитанный
                             signal_data["position_size"] = sizing_result.position_size_usd
-                            logger.info(f"[SIZER] position_size={sizing_result.position_size_usd:.2f} USDT, final_risk={sizing_result.final_risk:.2f}%")
+                            logger.info("[SIZER] position_size=%.2f USDT, final_risk=%.2f%%", sizing_result.position_size_usd, sizing_result.final_risk)
             
             # Получаем решение для контекста
             decision = self.decision_core.should_i_trade(symbol=symbol, system_state=system_state)
@@ -488,62 +686,63 @@ class Gatekeeper:
             extra += f"\n\nПричины:\n- " + "\n- ".join(reasons)
             
             # Отправляем
-            print(f"   📤 Отправка сигнала через Gatekeeper для {symbol}...")
+            logger.info("📤 Отправка сигнала через Gatekeeper для %s...", symbol)
             try:
                 send_message(msg + extra)
                 send_chart(symbol)
-                print(f"   ✅ Сигнал отправлен для {symbol}")
+                logger.info("✅ Сигнал отправлен для %s", symbol)
                 # Логируем финальное решение - SEND
-                logger.info(f"[TRACE] FINAL → SEND → signal sent to user")
+                logger.info("[TRACE] FINAL → SEND → signal sent to user")
                 # Сохраняем trace ПОСЛЕ принятия решения
-                self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="SEND")
+                self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="SEND")
             except Exception as e:
                 logger.error(f"Ошибка отправки сигнала для {symbol}: {type(e).__name__}: {e}", exc_info=True)
                 # Логируем финальное решение - ERROR
-                logger.info(f"[TRACE] FINAL → ERROR → {type(e).__name__}: {e}")
+                logger.info("[TRACE] FINAL → ERROR → %s: %s", type(e).__name__, e)
                 # Сохраняем trace ПОСЛЕ принятия решения
-                self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="ERROR")
+                self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="ERROR")
                 # Не блокируем счетчик, так как проверка прошла успешно
         except Exception as e:
             # Критическая ошибка
             logger.error(f"Критическая ошибка в Gatekeeper.send_signal для {symbol}: {type(e).__name__}: {e}", exc_info=True)
             # Логируем финальное решение - ERROR
-            logger.info(f"[TRACE] FINAL → ERROR → {type(e).__name__}: {e}")
+            logger.info("[TRACE] FINAL → ERROR → %s: %s", type(e).__name__, e)
             # Сохраняем trace ПОСЛЕ принятия решения (если есть)
             if 'trace_entries' in locals():
-                self._save_decision_trace(symbol, snapshot, trace_entries, final_decision="ERROR")
+                self._enqueue_decision_trace(symbol, snapshot, trace_entries, final_decision="ERROR")
             self.blocked_signals_count += 1
-            self._update_state()
     
-    def _check_portfolio(self, snapshot: SignalSnapshot) -> Optional[PortfolioAnalysis]:
+    def _check_portfolio(
+        self,
+        snapshot: SignalSnapshot,
+        ctx: Optional[DecisionContext] = None
+    ) -> Optional[PortfolioAnalysis]:
         """
         Проверяет сигнал через Portfolio Brain.
         
         Args:
             snapshot: SignalSnapshot для анализа
+            ctx: DecisionContext текущего решения (опционально)
         
         Returns:
             PortfolioAnalysis или None (если нет открытых позиций)
         """
+        if ctx is None:
+            ctx = DecisionContext()
         try:
             # Получаем открытые сделки
-            open_trades = get_open_trades()
-            if not open_trades:
+            if not ctx.open_trades:
                 return None  # Нет позиций - портфельный анализ не нужен
             
-            # Преобразуем в PositionSnapshot
-            open_positions = convert_trades_to_positions(open_trades)
-            
-            # Вычисляем PortfolioState
-            current_balance = get_current_balance()
-            risk_budget = current_balance * (RISK_PERCENT / 100.0) * len(open_trades)  # Упрощённо
-            
-            portfolio_state = calculate_portfolio_state(
-                open_positions=open_positions,
-                risk_budget=risk_budget,
-                initial_balance=INITIAL_BALANCE
-            )
-            
+            # Позиции и PortfolioState (общие для всех фильтров решения)
+            open_positions = ctx.portfolio_positions
+            portfolio_state = ctx.portfolio_state
+
+            # Короткий путь: символ не пересекается с портфелем → полный анализ не нужен
+            shortcut = self._uncorrelated_portfolio_analysis(snapshot, open_positions, portfolio_state)
+            if shortcut:
+                return shortcut
+
             # Анализируем через Portfolio Brain
             analysis = self.portfolio_brain.evaluate(
                 snapshot=snapshot,
@@ -555,7 +754,61 @@ class Gatekeeper:
         except Exception as e:
             logger.error(f"Ошибка портфельного анализа для {snapshot.symbol}: {type(e).__name__}: {e}", exc_info=True)
             return None  # В случае ошибки не блокируем сигнал
-    
+
+    def _uncorrelated_portfolio_analysis(
+        self,
+        snapshot: SignalSnapshot,
+        open_positions: List,
+        portfolio_state: PortfolioState
+    ) -> Optional[PortfolioAnalysis]:
+        """
+        Возвращает ALLOW без вызова Portfolio Brain, если сигнал не коррелирует с портфелем.
+
+        Короткий путь срабатывает только когда ни одно HARD-условие Portfolio Brain
+        заведомо не может выполниться:
+        - символа нет в портфеле и его MarketState не представлен в портфеле
+        - утилизация риска < 50%
+        - confidence сигнала >= 0.4, entropy каждой позиции <= 0.75
+        - total_exposure <= 80% risk_budget (не срабатывают BLOCK по экспозиции и REDUCE)
+        - confidence сигнала >= 0.8 × средней confidence портфеля (SCALE_DOWN #3)
+
+        Returns:
+            PortfolioAnalysis(ALLOW) или None (нужен полный анализ)
+        """
+        if portfolio_state.risk_budget <= 0:
+            return None
+        risk_utilization_ratio = portfolio_state.used_risk / portfolio_state.risk_budget
+        if risk_utilization_ratio >= 0.5 or snapshot.confidence < 0.4:
+            return None
+        if portfolio_state.total_exposure > portfolio_state.risk_budget * 0.8:
+            return None
+
+        book_symbols = {pos.symbol for pos in open_positions}
+        if snapshot.symbol in book_symbols:
+            return None
+
+        signal_state = snapshot.states.get(snapshot.timeframe_anchor)
+        book_states = {pos.market_state for pos in open_positions if pos.market_state}
+        if signal_state and signal_state in book_states:
+            return None
+
+        if any(pos.entropy > 0.75 for pos in open_positions):
+            return None
+
+        # Средняя confidence портфеля, взвешенная по размеру (как в Portfolio Brain)
+        total_size = sum(pos.size for pos in open_positions)
+        if total_size > 0:
+            average_confidence = sum(pos.confidence * pos.size for pos in open_positions) / total_size
+            if snapshot.confidence < average_confidence * 0.8:
+                return None
+
+        return PortfolioAnalysis(
+            decision=PortfolioDecision.ALLOW,
+            reason="No correlated exposure",
+            recommended_size_multiplier=1.0,
+            risk_utilization_ratio=risk_utilization_ratio
+        )
+
     def _check_signal_quality(self, signal_data: Dict, decision: TradingDecision) -> bool:
         """
         Проверяет качество сигнала.
@@ -581,22 +834,15 @@ class Gatekeeper:
         
         return True
     
-    def _update_state(self):
-        """Обновляет явное состояние"""
-        self.state = {
-            "blocked": self.blocked_signals_count,
-            "approved": self.approved_signals_count,
-            "total": self.blocked_signals_count + self.approved_signals_count
-        }
-    
     def _log_blocked_signal(self, symbol: str, decision: TradingDecision):
         """Логирует заблокированный сигнал"""
-        print(f"🚫 Gatekeeper заблокировал сигнал для {symbol}: {decision.reason}")
+        logger.info("🚫 Gatekeeper заблокировал сигнал для %s: %s", symbol, decision.reason)
     
     def _check_meta_decision(
         self, 
         snapshot: SignalSnapshot, 
-        system_state
+        system_state,
+        ctx: Optional[DecisionContext] = None
     ) -> Optional[MetaDecisionResult]:
         """
         Проверяет сигнал через MetaDecisionBrain.
@@ -604,12 +850,15 @@ class Gatekeeper:
         Args:
             snapshot: SignalSnapshot для анализа
             system_state: Состояние системы
+            ctx: DecisionContext текущего решения (опционально)
             
         Returns:
             MetaDecisionResult или None (если MetaDecisionBrain недоступен)
         """
         if not self.meta_decision_brain or not META_DECISION_AVAILABLE:
             return None
+        if ctx is None:
+            ctx = DecisionContext(system_state=system_state)
         
         try:
             # Извлекаем данные из snapshot и system_state
@@ -618,26 +867,26 @@ class Gatekeeper:
             entropy_score = snapshot.entropy
             
             # Вычисляем portfolio_exposure из открытых позиций
+            # (без позиций баланс не запрашивается - экспозиция заведомо 0)
             portfolio_exposure = 0.0
             try:
-                open_trades = get_open_trades()
-                if open_trades:
-                    current_balance = get_current_balance()
+                total_exposure_usd = ctx.total_exposure_usd
+                if total_exposure_usd > 0:
+                    current_balance = ctx.balance
                     if current_balance > 0:
                         # Упрощённый расчёт: сумма всех позиций / баланс
-                        total_exposure = sum(trade.get("size", 0) for trade in open_trades)
-                        portfolio_exposure = min(1.0, total_exposure / current_balance)
+                        portfolio_exposure = min(1.0, total_exposure_usd / current_balance)
             except Exception:
                 portfolio_exposure = 0.0
             
-            # Получаем signals_count_recent из system_state
-            signals_count_recent = len(system_state.recent_signals) if system_state and hasattr(system_state, 'recent_signals') else 0
+            # signals_count_recent - из того же снимка recent_signals, что видит Risk Core
+            signals_count_recent = len(ctx.recent_signals)
             
             # Преобразуем system_health в SystemHealthStatus
+            safe_mode, consecutive_errors = _read_health(system_state)
             system_health = SystemHealthStatus.OK
-            if system_state and hasattr(system_state, 'system_health'):
-                if system_state.system_health.safe_mode or system_state.system_health.consecutive_errors > 5:
-                    system_health = SystemHealthStatus.DEGRADED
+            if safe_mode or consecutive_errors > 5:
+                system_health = SystemHealthStatus.DEGRADED
             
             # Вызываем MetaDecisionBrain
             meta_result = self.meta_decision_brain.evaluate(
@@ -660,7 +909,8 @@ class Gatekeeper:
     def _calculate_position_size(
         self,
         snapshot: SignalSnapshot,
-        portfolio_analysis: Optional[PortfolioAnalysis]
+        portfolio_analysis: Optional[PortfolioAnalysis],
+        ctx: Optional[DecisionContext] = None
     ):
         """
         Рассчитывает размер позиции через PositionSizer.
@@ -668,6 +918,7 @@ class Gatekeeper:
         Args:
             snapshot: SignalSnapshot для анализа
             portfolio_analysis: Результат PortfolioBrain (опционально)
+            ctx: DecisionContext текущего решения (опционально)
         
         Returns:
             PositionSizingResult или None (если PositionSizer недоступен)
@@ -677,38 +928,15 @@ class Gatekeeper:
         """
         if not self.position_sizer or not POSITION_SIZER_AVAILABLE:
             return None
+        if ctx is None:
+            ctx = DecisionContext()
         
         try:
-            # Вычисляем portfolio_state (используем ту же логику, что и в _check_portfolio)
-            open_trades = get_open_trades()
-            portfolio_state = None
-            
-            if open_trades:
-                open_positions = convert_trades_to_positions(open_trades)
-                current_balance = get_current_balance()
-                risk_budget = current_balance * (RISK_PERCENT / 100.0) * len(open_trades)
-                portfolio_state = calculate_portfolio_state(
-                    open_positions=open_positions,
-                    risk_budget=risk_budget,
-                    initial_balance=INITIAL_BALANCE
-                )
-            else:
-                # Пустой портфель - создаём минимальный PortfolioState
-                from core.portfolio_brain import PortfolioState
-                portfolio_state = PortfolioState(
-                    total_exposure=0.0,
-                    long_exposure=0.0,
-                    short_exposure=0.0,
-                    net_exposure=0.0,
-                    risk_budget=get_current_balance() * (RISK_PERCENT / 100.0),
-                    used_risk=0.0
-                )
+            # Баланс и portfolio_state - те же, что и в _check_portfolio
+            balance = ctx.balance
             
             # Используем PortfolioStateAdapter для совместимости с PositionSizer
-            portfolio_adapter = PortfolioStateAdapter(portfolio_state)
-            
-            # Получаем баланс
-            balance = get_current_balance()
+            portfolio_adapter = PortfolioStateAdapter(ctx.portfolio_state)
             
             # Вызываем PositionSizer
             sizing_result = self.position_sizer.calculate(
@@ -725,7 +953,7 @@ class Gatekeeper:
             logger.warning(f"Ошибка в PositionSizer для {snapshot.symbol}: {type(e).__name__}: {e}")
             return None
     
-    def _save_decision_trace(
+    def _enqueue_decision_trace(
         self,
         symbol: str,
         snapshot: Optional[SignalSnapshot],
@@ -733,66 +961,139 @@ class Gatekeeper:
         final_decision: str
     ):
         """
-        Сохраняет trace решений в DecisionTrace ПОСЛЕ принятия решения.
-        
-        Args:
-            symbol: Торговая пара
-            snapshot: SignalSnapshot (опционально)
-            trace_entries: Список решений [(source, allow_trading, reason, block_level), ...]
-            final_decision: Финальное решение (SEND, BLOCK, ERROR)
+        Ставит trace решений в очередь фоновой записи (не блокирует сигнал).
         
-        Примечание:
-            Вызывается ПОСЛЕ принятия решения, не влияет на runtime-логику.
+        При переполнении очереди отбрасывается самая старая запись.
         """
-        if not self.trace_enabled or not self.decision_trace:
+        if not self.trace_enabled or self._trace_queue is None:
             return
         
+        item = (symbol, snapshot, trace_entries, final_decision)
         try:
-            # Сохраняем каждое решение из trace
-            for source, allow_trading, reason, block_level in trace_entries:
-                # Формируем context_snapshot из snapshot (если есть)
-                context_snapshot = {}
-                if snapshot:
-                    context_snapshot = {
-                        "confidence": snapshot.confidence,
-                        "entropy": snapshot.entropy,
-                        "score": snapshot.score,
-                        "risk_level": snapshot.risk_level.value if snapshot.risk_level else None,
-                        "market_regime": snapshot.market_regime.trend_type if snapshot.market_regime else None
-                    }
-                
-                # Добавляем финальное решение в контекст
-                context_snapshot["final_decision"] = final_decision
-                
-                # Сохраняем в DecisionTrace
-                self.decision_trace.log_decision(
-                    symbol=symbol,
-                    decision_source=source,
-                    allow_trading=allow_trading,
-                    block_level=block_level,
-                    reason=reason,
-                    context_snapshot=context_snapshot
-                )
+            self._trace_queue.put_nowait(item)
+        except queue.Full:
+            try:
+                self._trace_queue.get_nowait()
+                self._trace_queue.task_done()
+            except queue.Empty:
+                pass
+            try:
+                self._trace_queue.put_nowait(item)
+            except queue.Full:
+                logger.warning(f"Очередь DecisionTrace переполнена, trace для {symbol} отброшен")
+    
+    def flush_traces(self, timeout: float = TRACE_FLUSH_TIMEOUT) -> bool:
+        """
+        Ждёт, пока фоновый поток запишет все trace из очереди (включая текущую пачку).
+        
+        Args:
+            timeout: Максимальное время ожидания в секундах
+        
+        Returns:
+            bool: True если очередь записана, False если истёк timeout
+        """
+        trace_queue = self._trace_queue
+        if trace_queue is None:
+            return True
+        # queue.Queue.join() не принимает timeout - ждём на том же условии
+        deadline = time.monotonic() + timeout
+        with trace_queue.all_tasks_done:
+            while trace_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        f"DecisionTrace: {trace_queue.unfinished_tasks} записей не сохранены за {timeout}s"
+                    )
+                    return False
+                trace_queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def _trace_writer_loop(self):
+        """
+        Фоновый поток: сохраняет trace из очереди.
+        
+        Ждёт первую запись, затем забирает всё накопившееся (до TRACE_WRITE_BATCH
+        сигналов) и пишет одной транзакцией.
+        """
+        while True:
+            items = [self._trace_queue.get()]
+            while len(items) < TRACE_WRITE_BATCH:
+                try:
+                    items.append(self._trace_queue.get_nowait())
+                except queue.Empty:
+                    break
             
-            # Сохраняем финальное решение
-            final_allow = final_decision == "SEND"
-            self.decision_trace.log_decision(
+            try:
+                records = []
+                for symbol, snapshot, trace_entries, final_decision in items:
+                    try:
+                        records.extend(self._build_trace_records(symbol, snapshot, trace_entries, final_decision))
+                    except Exception as e:
+                        logger.warning(f"Ошибка сохранения DecisionTrace для {symbol}: {type(e).__name__}: {e}")
+                if records and self.decision_trace:
+                    self.decision_trace.log_decisions_batch(records)
+            except Exception as e:
+                # Не выбрасываем исключение - trace не должен влиять на торговую логику
+                logger.warning(f"Ошибка пакетной записи DecisionTrace: {type(e).__name__}: {e}")
+            finally:
+                for _ in items:
+                    self._trace_queue.task_done()
+    
+    def _build_trace_records(
+        self,
+        symbol: str,
+        snapshot: Optional[SignalSnapshot],
+        trace_entries: List[tuple],
+        final_decision: str
+    ) -> List:
+        """Собирает DecisionRecord для trace одного сигнала (включая финальное решение)"""
+        timestamp = datetime.now(UTC)
+        
+        # context_snapshot одинаков для всех записей trace: собираем один раз
+        # и разделяем между записями (DecisionRecord его не изменяет)
+        context_snapshot = {}
+        if snapshot:
+            context_snapshot = {
+                "confidence": snapshot.confidence,
+                "entropy": snapshot.entropy,
+                "score": snapshot.score,
+                "risk_level": snapshot.risk_level.value if snapshot.risk_level else None,
+                "market_regime": snapshot.market_regime.trend_type if snapshot.market_regime else None
+            }
+        context_snapshot["final_decision"] = final_decision
+        
+        records = []
+        for source, allow_trading, reason, block_level in trace_entries:
+            records.append(DecisionRecord(
+                timestamp=timestamp,
                 symbol=symbol,
-                decision_source="Gatekeeper",
-                allow_trading=final_allow,
-                block_level=TraceBlockLevel.NONE if final_allow else TraceBlockLevel.HARD,
-                reason=f"Final decision: {final_decision}",
-                context_snapshot={"final_decision": final_decision, "trace_entries_count": len(trace_entries)}
-            )
-        except Exception as e:
-            # Не выбрасываем исключение - trace не должен влиять на торговую логику
-            logger.warning(f"Ошибка сохранения DecisionTrace для {symbol}: {type(e).__name__}: {e}")
+                decision_source=source,
+                allow_trading=allow_trading,
+                block_level=block_level,
+                reason=reason,
+                context_snapshot=context_snapshot
+            ))
+        
+        # Финальное решение
+        final_allow = final_decision == "SEND"
+        records.append(DecisionRecord(
+            timestamp=timestamp,
+            symbol=symbol,
+            decision_source="Gatekeeper",
+            allow_trading=final_allow,
+            block_level=TraceBlockLevel.NONE if final_allow else TraceBlockLevel.HARD,
+            reason=f"Final decision: {final_decision}",
+            context_snapshot={"final_decision": final_decision, "trace_entries_count": len(trace_entries)}
+        ))
+        
+        return records
     
     def _check_risk_core(
         self,
         symbol: str,
         signal_data: Dict,
-        system_state
+        system_state,
+        ctx: Optional[DecisionContext] = None
     ) -> Optional[tuple]:
         """
         Проверяет сигнал через Risk Core.
@@ -803,10 +1104,13 @@ class Gatekeeper:
             symbol: Торговая пара
             signal_data: Данные сигнала
             system_state: Состояние системы
+            ctx: DecisionContext текущего решения (опционально)
         
         Returns:
             Tuple (TradingPermission, RiskState, ViolationReport) или None (если ошибка)
         """
+        if ctx is None:
+            ctx = DecisionContext(system_state=system_state)
         try:
             # Собираем Trading Intent (ADR-TRADING-RISK-CORE-001 Section 4: Inputs ONLY)
             zone = signal_data.get("zone", {})
@@ -814,7 +1118,10 @@ class Gatekeeper:
             stop_price = zone.get("stop", 0.0)
             position_size_usd = signal_data.get("position_size", 0.0)
             leverage = signal_data.get("leverage")
-            side = "LONG" if signal_data.get("side") == "LONG" else "SHORT"
+            # Сторона передаётся как есть: неизвестное значение отклонит
+            # валидация Risk Core (fail-closed), а не превратится в SHORT.
+            # Если side не передан - определяем по положению стопа
+            side = signal_data.get("side") or ("LONG" if stop_price < entry_price else "SHORT")
             
             if entry_price <= 0 or stop_price <= 0 or position_size_usd <= 0:
                 # Недостаточно данных для Risk Core - fail-closed
@@ -831,11 +1138,11 @@ class Gatekeeper:
             )
             
             # Собираем Capital Snapshot
-            current_balance = get_current_balance()
+            current_balance = ctx.balance
             
             # Получаем статистику для расчета потерь
-            stats_24h = get_trade_statistics(days=1) or {}
-            stats_7d = get_trade_statistics(days=7) or {}
+            stats_24h = ctx.stats_24h
+            stats_7d = ctx.stats_7d
             
             total_loss_usd = max(0, INITIAL_BALANCE - current_balance)
             loss_24h_usd = abs(stats_24h.get("total_pnl", 0.0)) if stats_24h.get("total_pnl", 0) < 0 else 0.0
@@ -849,22 +1156,9 @@ class Gatekeeper:
                 loss_7d_usd=loss_7d_usd
             )
             
-            # Собираем Exposure Snapshot
-            open_trades = get_open_trades()
-            open_positions = [
-                PositionSnapshot(
-                    symbol=trade.get("symbol", ""),
-                    side=trade.get("side", "LONG"),
-                    position_size_usd=float(trade.get("position_size", 0)),
-                    entry_price=float(trade.get("entry", 0)),
-                    stop_price=float(trade.get("stop", 0)),
-                    leverage=trade.get("leverage")
-                )
-                for trade in open_trades
-            ]
-            
-            total_exposure_usd = sum(pos.position_size_usd for pos in open_positions)
-            max_single_position_usd = max([pos.position_size_usd for pos in open_positions], default=0.0)
+            # Собираем Exposure Snapshot (позиции общие для всех фильтров решения)
+            open_positions = ctx.open_positions
+            total_exposure_usd, max_single_position_usd = ctx.exposure_totals
             
             # Correlation groups (strategy-blind) - упрощенная реализация
             # В реальной системе это должно быть вычислено из корреляций
@@ -879,9 +1173,8 @@ class Gatekeeper:
             
             # Собираем Behavioral Counters
             # Упрощенная реализация - в реальной системе это должно отслеживаться
-            recent_signals = getattr(system_state, 'recent_signals', []) if system_state else []
-            actions_last_hour = len([s for s in recent_signals if (datetime.now(UTC) - s.get('timestamp', datetime.now(UTC))).total_seconds() < 3600])
-            actions_last_24h = len([s for s in recent_signals if (datetime.now(UTC) - s.get('timestamp', datetime.now(UTC))).total_seconds() < 86400])
+            recent_signals = ctx.recent_signals
+            actions_last_hour, actions_last_24h = ctx.action_counts
             
             # Получаем информацию о потерях из статистики
             consecutive_losses = 0
@@ -891,7 +1184,7 @@ class Gatekeeper:
                 if losing_trades > 0:
                     consecutive_losses = losing_trades
                     # Приблизительная временная метка последней потери
-                    last_loss_timestamp = datetime.now(UTC) - timedelta(hours=1)
+                    last_loss_timestamp = ctx.now - timedelta(hours=1)
             
             behavioral = BehavioralCounters(
                 actions_last_hour=actions_last_hour,
@@ -902,10 +1195,11 @@ class Gatekeeper:
             )
             
             # Собираем System Health Flags
+            safe_mode, consecutive_errors = _read_health(system_state)
             system_health = SystemHealthFlags(
-                is_safe_mode=getattr(system_state, 'system_health', None).safe_mode if (system_state and hasattr(system_state, 'system_health')) else False,
-                consecutive_errors=getattr(system_state, 'system_health', None).consecutive_errors if (system_state and hasattr(system_state, 'system_health')) else 0,
-                runtime_healthy=not (getattr(system_state, 'system_health', None).safe_mode if (system_state and hasattr(system_state, 'system_health')) else False),
+                is_safe_mode=safe_mode,
+                consecutive_errors=consecutive_errors,
+                runtime_healthy=not safe_mode,
                 critical_modules_available=True  # Упрощенно - в реальной системе проверять через SystemGuardian
             )
             
@@ -933,18 +1227,25 @@ class Gatekeeper:
     
     def get_stats(self) -> Dict:
         """Получить статистику Gatekeeper"""
-        # Используем явное состояние
-        self._update_state()
-        return self.state.copy()
+        blocked = self.blocked_signals_count
+        approved = self.approved_signals_count
+        return {"blocked": blocked, "approved": approved, "total": blocked + approved}
 
 
 # Глобальный экземпляр
-_gatekeeper = None
-
+@cache
 def get_gatekeeper() -> Gatekeeper:
-    """Получить глобальный экземпляр Gatekeeper"""
-    global _gatekeeper
-    if _gatekeeper is None:
-        _gatekeeper = Gatekeeper()
-    return _gatekeeper
+    """Получить глобальный экземпляр Gatekeeper (создаётся при первом вызове)"""
+    return Gatekeeper()
+
+
+def flush_traces(timeout: float = TRACE_FLUSH_TIMEOUT) -> bool:
+    """
+    Дописывает очередь DecisionTrace глобального Gatekeeper (перед выходом из процесса).
+    
+    Если Gatekeeper ещё не создан, писать нечего - экземпляр не создаётся.
+    """
+    if not get_gatekeeper.cache_info().currsize:
+        return True
+    return get_gatekeeper().flush_traces(timeout)
 
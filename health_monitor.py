@@ -10,12 +10,45 @@ from telegram_bot import send_message
 try:
     import psutil
     PSUTIL_AVAILABLE = True
+    # Первый вызов без интервала задаёт базу: следующие вызовы cpu_percent(interval=None)
+    # возвращают загрузку CPU с момента предыдущего вызова без блокировки на 1 секунду
+    psutil.cpu_percent(interval=None)
 except ImportError:
     PSUTIL_AVAILABLE = False
 
 HEARTBEAT_INTERVAL = 3600  # Отправка heartbeat каждые 60 минут (1 час)
 LAST_HEARTBEAT_FILE = "last_heartbeat.txt"
 
+# Шаблоны heartbeat сообщения (собираются один раз при импорте)
+HEARTBEAT_TEMPLATE = (
+    "💓 **Heartbeat**\n\n"
+    "✅ Бот работает нормально"
+    "{system_info}\n\n"
+    "⏰ {timestamp}"
+).format
+SYSTEM_INFO_TEMPLATE = (
+    "\n📊 Система:\n"
+    "CPU: {cpu}%\n"
+    "RAM: {ram}%\n"
+    "Disk: {disk}%"
+).format
+
+
+def _persist_heartbeat_timestamp(timestamp: float):
+    """
+    Атомарно записывает время последнего heartbeat.
+    
+    Запись идёт во временный файл, который затем заменяет LAST_HEARTBEAT_FILE
+    через os.replace: прерванная запись не оставляет повреждённый файл.
+    """
+    tmp_path = LAST_HEARTBEAT_FILE + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(timestamp))
+        os.replace(tmp_path, LAST_HEARTBEAT_FILE)
+    except Exception:
+        pass
+
 
 def send_heartbeat():
     """
@@ -28,35 +61,20 @@ def send_heartbeat():
         system_info = ""
         if PSUTIL_AVAILABLE:
             try:
-                cpu_percent = psutil.cpu_percent(interval=1)
-                memory = psutil.virtual_memory()
-                memory_percent = memory.percent
-                disk = psutil.disk_usage('/')
-                disk_percent = disk.percent
-                system_info = (
-                    f"\n📊 Система:\n"
-                    f"CPU: {cpu_percent}%\n"
-                    f"RAM: {memory_percent}%\n"
-                    f"Disk: {disk_percent}%"
+                system_info = SYSTEM_INFO_TEMPLATE(
+                    cpu=psutil.cpu_percent(interval=None),
+                    ram=psutil.virtual_memory().percent,
+                    disk=psutil.disk_usage('/').percent
                 )
             except Exception:
                 system_info = ""
         
-        message = (
-            f"💓 **Heartbeat**\n\n"
-            f"✅ Бот работает нормально"
-            f"{system_info}\n\n"
-            f"⏰ {timestamp}"
-        )
+        message = HEARTBEAT_TEMPLATE(system_info=system_info, timestamp=timestamp)
         
         send_message(message)
         
         # Сохраняем время последнего heartbeat
-        try:
-            with open(LAST_HEARTBEAT_FILE, "w", encoding="utf-8") as f:
-                f.write(str(time.time()))
-        except Exception:
-            pass
+        _persist_heartbeat_timestamp(time.time())
             
     except Exception as e:
         print(f"⚠️ Ошибка отправки heartbeat: {e}")
@@ -1,19 +1,70 @@
-def atr(candles, period=14):
-    trs = []
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+
+# Кэш float-представления свечей. Один и тот же список свечей (например, 15m)
+# за тик проходит через несколько индикаторов подряд: строки биржи
+# конвертируются в float один раз на список, а не в каждом индикаторе.
+_OHLC_CACHE_SIZE = 16
+_ohlc_cache = OrderedDict()
 
-    for i in range(1, len(candles)):
-        high = float(candles[i][2])
-        low = float(candles[i][3])
-        prev_close = float(candles[i-1][4])
+# Колонки свечи: [time, open, high, low, close, volume, ...]
+_HIGH = itemgetter(2)
+_LOW = itemgetter(3)
+_CLOSE = itemgetter(4)
 
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
+
+def _ohlc(candles):
+    """
+    Возвращает (highs, lows, closes) - списки float для списка свечей.
+    
+    Ключ кэша - идентичность списка; запись хранит ссылку на сам список
+    (id не переиспользуется, пока запись жива) и его длину.
+    """
+    key = id(candles)
+    entry = _ohlc_cache.get(key)
+    if entry is not None and entry[0] is candles and entry[1] == len(candles):
+        return entry[2]
+    
+    if candles and type(candles[0][4]) is float:
+        # Свечи из data_loader уже с float-полями: только выборка колонок
+        columns = (
+            list(map(_HIGH, candles)),
+            list(map(_LOW, candles)),
+            list(map(_CLOSE, candles)),
+        )
+    else:
+        columns = (
+            [float(c[2]) for c in candles],
+            [float(c[3]) for c in candles],
+            [float(c[4]) for c in candles],
         )
-        trs.append(tr)
+    _ohlc_cache[key] = (candles, len(candles), columns)
+    if len(_ohlc_cache) > _OHLC_CACHE_SIZE:
+        try:
+            _ohlc_cache.popitem(last=False)
+        except KeyError:
+            pass
+    return columns
+
+
+def atr(candles, period=14):
+    """
+    Рассчитывает ATR (Average True Range) за последние period свечей.
+    
+    В расчёт входят только последние period True Range, поэтому
+    обрабатываются лишь последние period + 1 свечей, а не вся история.
+    """
+    highs, lows, closes = _ohlc(candles)
+    total = 0.0
+    start = max(1, len(closes) - period)
+
+    # TR = max(high - low, |high - prev_close|, |low - prev_close|)
+    #    = max(high, prev_close) - min(low, prev_close) при high >= low
+    for high, low, prev_close in zip(highs[start:], lows[start:], closes[start - 1:]):
+        total += max(high, prev_close) - min(low, prev_close)
 
-    return sum(trs[-period:]) / period
+    return total / period
 
 
 def rsi(candles, period=14):
@@ -24,24 +75,21 @@ def rsi(candles, period=14):
     if len(candles) < period + 1:
         return 50.0  # Нейтральное значение
     
-    closes = [float(c[4]) for c in candles]
-    gains = []
-    losses = []
+    # В среднее входят только последние period изменений цены
+    closes = _ohlc(candles)[2][-(period + 1):]
     
-    for i in range(1, len(closes)):
-        change = closes[i] - closes[i-1]
+    # Суммы приростов и падений без промежуточных списков
+    gain_sum = 0.0
+    loss_sum = 0.0
+    for prev, price in zip(closes, closes[1:]):
+        change = price - prev
         if change > 0:
-            gains.append(change)
-            losses.append(0)
+            gain_sum += change
         else:
-            gains.append(0)
-            losses.append(abs(change))
+            loss_sum -= change
     
-    if len(gains) < period:
-        return 50.0
-    
-    avg_gain = sum(gains[-period:]) / period
-    avg_loss = sum(losses[-period:]) / period
+    avg_gain = gain_sum / period
+    avg_loss = loss_sum / period
     
     if avg_loss == 0:
         return 100.0
@@ -52,6 +100,30 @@ def rsi(candles, period=14):
     return rsi_value
 
 
+@lru_cache(maxsize=32)
+def _ema_coefficients(period):
+    """Коэффициенты EMA (multiplier, decay) для периода; периодов в боте немного"""
+    multiplier = 2 / (period + 1)
+    return multiplier, 1 - multiplier
+
+
+def _ema(data, period):
+    """
+    Ряд EMA для списка значений (первое значение - затравка).
+    
+    Коэффициенты и append вынесены из цикла: рекуррентность остаётся
+    последовательной, но без повторных вычислений на каждой итерации.
+    """
+    multiplier, decay = _ema_coefficients(period)
+    prev = data[0]
+    ema_values = [prev]
+    append = ema_values.append
+    for price in data[1:]:
+        prev = (price * multiplier) + (prev * decay)
+        append(prev)
+    return ema_values
+
+
 def macd(candles, fast_period=12, slow_period=26, signal_period=9):
     """
     Рассчитывает MACD (Moving Average Convergence Divergence).
@@ -60,24 +132,19 @@ def macd(candles, fast_period=12, slow_period=26, signal_period=9):
     if len(candles) < slow_period + signal_period:
         return {"macd": 0, "signal": 0, "histogram": 0, "trend": "NEUTRAL"}
     
-    closes = [float(c[4]) for c in candles]
-    
-    # EMA быстрая
-    def ema(data, period):
-        multiplier = 2 / (period + 1)
-        ema_values = [data[0]]
-        for price in data[1:]:
-            ema_values.append((price * multiplier) + (ema_values[-1] * (1 - multiplier)))
-        return ema_values
-    
-    fast_ema = ema(closes, fast_period)
-    slow_ema = ema(closes, slow_period)
+    closes = _ohlc(candles)[2]
     
+    # EMA быстрая и медленная
+    return _macd_from_ema(_ema(closes, fast_period), _ema(closes, slow_period), signal_period)
+
+
+def _macd_from_ema(fast_ema, slow_ema, signal_period):
+    """MACD по готовым рядам быстрой и медленной EMA"""
     # MACD линия
     macd_line = [fast_ema[i] - slow_ema[i] for i in range(len(slow_ema))]
     
     # Signal линия (EMA от MACD)
-    signal_line = ema(macd_line[-signal_period:], signal_period)
+    signal_line = _ema(macd_line[-signal_period:], signal_period)
     
     # Histogram
     histogram = macd_line[-1] - signal_line[-1] if signal_line else 0
@@ -119,17 +186,18 @@ def trend_strength(candles, period=20):
     if len(candles) < period:
         return 50.0
     
-    highs = [float(c[2]) for c in candles[-period:]]
-    lows = [float(c[3]) for c in candles[-period:]]
+    highs, lows, _ = _ohlc(candles)
+    highs = highs[-period:]
+    lows = lows[-period:]
     
     # Подсчет восходящих и нисходящих свечей
     up_count = 0
     down_count = 0
     
-    for i in range(1, len(highs)):
-        if highs[i] > highs[i-1] and lows[i] > lows[i-1]:
+    for prev_high, high, prev_low, low in zip(highs, highs[1:], lows, lows[1:]):
+        if high > prev_high and low > prev_low:
             up_count += 1
-        elif highs[i] < highs[i-1] and lows[i] < lows[i-1]:
+        elif high < prev_high and low < prev_low:
             down_count += 1
     
     total = up_count + down_count
@@ -156,22 +224,23 @@ def bollinger_bands(candles, period=20, std_dev=2):
             "width_pct": 0
         }
     
-    closes = [float(c[4]) for c in candles[-period:]]
-    
-    # SMA (средняя линия)
-    sma = sum(closes) / len(closes)
+    # SMA и стандартное отклонение за один проход (алгоритм Уэлфорда)
+    count = 0
+    sma = 0.0
+    m2 = 0.0
+    current_price = 0.0
+    for current_price in _ohlc(candles)[2][-period:]:
+        count += 1
+        delta = current_price - sma
+        sma += delta / count
+        m2 += delta * (current_price - sma)
     
-    # Стандартное отклонение
-    variance = sum((x - sma) ** 2 for x in closes) / len(closes)
-    std = variance ** 0.5
+    std = (m2 / count) ** 0.5
     
     # Верхняя и нижняя полосы
     upper = sma + (std_dev * std)
     lower = sma - (std_dev * std)
     
-    # Текущая цена
-    current_price = closes[-1]
-    
     # Позиция цены относительно полос
     width = upper - lower
     width_pct = (width / sma) * 100 if sma > 0 else 0
@@ -208,41 +277,31 @@ def stochastic(candles, k_period=14, d_period=3):
             "signal": "NEUTRAL"  # OVERBOUGHT, OVERSOLD, NEUTRAL
         }
     
-    # Берем последние k_period свечей
-    recent_candles = candles[-k_period:]
-    highs = [float(c[2]) for c in recent_candles]
-    lows = [float(c[3]) for c in recent_candles]
-    closes = [float(c[4]) for c in recent_candles]
-    
-    highest_high = max(highs)
-    lowest_low = min(lows)
-    current_close = closes[-1]
-    
-    # %K
-    if highest_high == lowest_low:
-        k = 50.0
-    else:
-        k = ((current_close - lowest_low) / (highest_high - lowest_low)) * 100
+    # %D - среднее последних значений %K (не больше k_period), каждое по окну из
+    # k_period свечей. Цены конвертируются один раз для всего нужного диапазона,
+    # окна берутся срезами уже готовых списков
+    d_count = min(d_period, k_period)
+    span = k_period + d_count - 1
+    highs, lows, closes = _ohlc(candles)
+    highs = highs[-span:]
+    lows = lows[-span:]
+    closes = closes[-span:]
     
-    # %D (SMA от %K за d_period периодов)
-    # Для упрощения используем последние значения
     k_values = []
-    for i in range(len(candles) - k_period, len(candles)):
-        if i >= 0:
-            period_highs = [float(c[2]) for c in candles[max(0, i-k_period+1):i+1]]
-            period_lows = [float(c[3]) for c in candles[max(0, i-k_period+1):i+1]]
-            period_close = float(candles[i][4])
-            
-            period_highest = max(period_highs) if period_highs else period_close
-            period_lowest = min(period_lows) if period_lows else period_close
-            
-            if period_highest == period_lowest:
-                k_val = 50.0
-            else:
-                k_val = ((period_close - period_lowest) / (period_highest - period_lowest)) * 100
-            k_values.append(k_val)
-    
-    d = sum(k_values[-d_period:]) / len(k_values[-d_period:]) if k_values else 50.0
+    for end in range(len(closes) - d_count + 1, len(closes) + 1):
+        period_highest = max(highs[end - k_period:end])
+        period_lowest = min(lows[end - k_period:end])
+        period_close = closes[end - 1]
+        
+        if period_highest == period_lowest:
+            k_val = 50.0
+        else:
+            k_val = ((period_close - period_lowest) / (period_highest - period_lowest)) * 100
+        k_values.append(k_val)
+    
+    # %K - по последнему окну
+    k = k_values[-1]
+    d = sum(k_values) / len(k_values)
     
     # Сигнал
     if k > 80:
@@ -270,45 +329,34 @@ def adx(candles, period=14):
             "strength": "WEAK"  # WEAK, MODERATE, STRONG
         }
     
-    # Расчет +DM и -DM
-    plus_dm = []
-    minus_dm = []
-    
-    for i in range(1, len(candles)):
-        high_diff = float(candles[i][2]) - float(candles[i-1][2])
-        low_diff = float(candles[i-1][3]) - float(candles[i][3])
-        
-        if high_diff > low_diff and high_diff > 0:
-            plus_dm.append(high_diff)
-        else:
-            plus_dm.append(0)
+    # В сглаживание входят только последние period значений +DM/-DM/TR,
+    # поэтому считаем их по последним period + 1 свечам
+    highs, lows, closes = _ohlc(candles)
+    highs = highs[-(period + 1):]
+    lows = lows[-(period + 1):]
+    closes = closes[-(period + 1):]
+    
+    # Суммы +DM, -DM и True Range за один проход
+    plus_dm_sum = 0.0
+    minus_dm_sum = 0.0
+    tr_sum = 0.0
+    
+    for prev_high, high, prev_low, low, prev_close in zip(highs, highs[1:], lows, lows[1:], closes):
+        high_diff = high - prev_high
+        low_diff = prev_low - low
         
-        if low_diff > high_diff and low_diff > 0:
-            minus_dm.append(low_diff)
-        else:
-            minus_dm.append(0)
-    
-    # Расчет True Range
-    trs = []
-    for i in range(1, len(candles)):
-        high = float(candles[i][2])
-        low = float(candles[i][3])
-        prev_close = float(candles[i-1][4])
+        # +DM и -DM взаимоисключающие: учитывается большее из движений, если оно > 0
+        if high_diff > low_diff:
+            if high_diff > 0:
+                plus_dm_sum += high_diff
+        elif low_diff > high_diff and low_diff > 0:
+            minus_dm_sum += low_diff
         
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        trs.append(tr)
-    
-    # Сглаживание (упрощенная версия)
-    if len(plus_dm) < period or len(trs) < period:
-        return {"adx": 0, "strength": "WEAK"}
+        tr_sum += max(high, prev_close) - min(low, prev_close)
     
-    avg_plus_dm = sum(plus_dm[-period:]) / period
-    avg_minus_dm = sum(minus_dm[-period:]) / period
-    avg_tr = sum(trs[-period:]) / period
+    avg_plus_dm = plus_dm_sum / period
+    avg_minus_dm = minus_dm_sum / period
+    avg_tr = tr_sum / period
     
     if avg_tr == 0:
         return {"adx": 0, "strength": "WEAK"}
@@ -355,18 +403,13 @@ def ema_crossover(candles, fast_period=12, slow_period=26):
             "slow_ema": 0
         }
     
-    closes = [float(c[4]) for c in candles]
-    
-    def ema(data, period):
-        multiplier = 2 / (period + 1)
-        ema_values = [data[0]]
-        for price in data[1:]:
-            ema_values.append((price * multiplier) + (ema_values[-1] * (1 - multiplier)))
-        return ema_values
-    
-    fast_ema_vals = ema(closes, fast_period)
-    slow_ema_vals = ema(closes, slow_period)
+    closes = _ohlc(candles)[2]
     
+    return _ema_crossover_from_ema(_ema(closes, fast_period), _ema(closes, slow_period))
+
+
+def _ema_crossover_from_ema(fast_ema_vals, slow_ema_vals):
+    """Сигнал пересечения по готовым рядам быстрой и медленной EMA"""
     # Берем последние значения
     fast_current = fast_ema_vals[-1]
     fast_prev = fast_ema_vals[-2] if len(fast_ema_vals) > 1 else fast_current
@@ -400,11 +443,8 @@ def volume_analysis(candles, period=20):
         }
     
     # Используем диапазон (high - low) как прокси для объема
-    ranges = []
-    for c in candles[-period:]:
-        high = float(c[2])
-        low = float(c[3])
-        ranges.append(high - low)
+    highs, lows, _ = _ohlc(candles)
+    ranges = [high - low for high, low in zip(highs[-period:], lows[-period:])]
     
     current_range = ranges[-1]
     avg_range = sum(ranges[:-1]) / len(ranges[:-1]) if len(ranges) > 1 else current_range
@@ -427,3 +467,35 @@ def volume_analysis(candles, period=20):
         "volume_ratio": volume_ratio,
         "is_high_volume": is_high_volume
     }
+
+
+def compute_bundle(candles):
+    """
+    Рассчитывает набор индикаторов для одного списка свечей за один вызов.
+    
+    Все индикаторы работают с общими float-колонками (_ohlc), а ряды
+    EMA(12) и EMA(26) считаются один раз и используются и для MACD,
+    и для пересечения EMA.
+    
+    Returns:
+        dict: rsi, macd, momentum, bb, stoch, adx, ema_cross, volume
+              (параметры по умолчанию, как в signal_generator)
+    """
+    closes = _ohlc(candles)[2]
+    
+    # Общие EMA для MACD (нужно >= 35 свечей) и пересечения EMA (>= 27)
+    fast_ema = slow_ema = None
+    if len(closes) >= 26 + 1:
+        fast_ema = _ema(closes, 12)
+        slow_ema = _ema(closes, 26)
+    
+    return {
+        "rsi": rsi(candles, period=14),
+        "macd": _macd_from_ema(fast_ema, slow_ema, 9) if len(closes) >= 26 + 9 else macd(candles),
+        "momentum": momentum(candles),
+        "bb": bollinger_bands(candles, period=20),
+        "stoch": stochastic(candles, k_period=14),
+        "adx": adx(candles, period=14),
+        "ema_cross": _ema_crossover_from_ema(fast_ema, slow_ema) if fast_ema is not None else ema_crossover(candles),
+        "volume": volume_analysis(candles, period=20),
+    }
@@ -1,14 +1,115 @@
+import atexit
 import csv
 import os
+import threading
+import time
 from datetime import datetime, UTC, timedelta
 from typing import List, Dict, Optional
-from core.market_state import MarketState, state_to_string
-from core.signal_snapshot import SignalSnapshot, SignalDecision
+from core.market_state import MarketState, state_to_string, normalize_states_dict
+from core.signal_snapshot import SignalSnapshot, SignalDecision, risk_string_to_enum
 
 # ========== FAULT INJECTION (для тестирования устойчивости) ==========
 
 FAULT_INJECT_STORAGE_FAILURE = os.environ.get("FAULT_INJECT_STORAGE_FAILURE", "false").lower() == "true"
 
+# ========== SIGNALS LOG (CSV) ==========
+
+SIGNALS_LOG_FILE = "signals_log.csv"
+SIGNALS_LOG_HEADER = [
+    "timestamp",
+    "symbol",
+    "state_1h",
+    "state_30m",
+    "state_15m",
+    "state_5m",
+    "risk",
+    "entry",
+    "exit",
+    "r"
+]
+
+# Буфер сбрасывается на диск после стольких строк или секунд с прошлого сброса
+SIGNALS_LOG_FLUSH_ROWS = 20
+SIGNALS_LOG_FLUSH_INTERVAL = 5.0
+
+
+class _SignalCsvWriter:
+    """
+    Буферизованная запись signals_log.csv.
+    
+    Файл открывается один раз и остаётся открытым между записями;
+    проверка существования файла (для заголовка) - только при открытии.
+    Буфер сбрасывается пачками, перед чтением лога и при выходе из процесса.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._writer = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _open(self):
+        file_exists = os.path.exists(self.path)
+        self._file = open(self.path, "a", newline="", encoding="utf-8", buffering=1 << 16)
+        self._writer = csv.writer(self._file)
+        # Если файл новый, записываем заголовки
+        if not file_exists:
+            self._writer.writerow(SIGNALS_LOG_HEADER)
+    
+    def _flush_locked(self, now: float):
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = now
+    
+    def writerow(self, row: list):
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._writer.writerow(row)
+            self._pending += 1
+            now = time.monotonic()
+            if self._pending >= SIGNALS_LOG_FLUSH_ROWS or now - self._last_flush >= SIGNALS_LOG_FLUSH_INTERVAL:
+                self._flush_locked(now)
+    
+    def flush(self, timeout: float = -1) -> bool:
+        """
+        Сбрасывает буфер на диск.
+        
+        timeout >= 0 ограничивает ожидание lock (путь перед os._exit не должен
+        зависнуть на заблокированной записи). Returns: False если lock не получен.
+        """
+        if not self._lock.acquire(timeout=timeout):
+            return False
+        try:
+            if self._file is not None and self._pending:
+                self._flush_locked(time.monotonic())
+        finally:
+            self._lock.release()
+        return True
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._writer = None
+                self._pending = 0
+
+
+_signals_log_writer = _SignalCsvWriter(SIGNALS_LOG_FILE)
+atexit.register(_signals_log_writer.close)
+
+
+def flush_signal_log(timeout: float = -1) -> bool:
+    """
+    Сбрасывает буфер signals_log.csv на диск.
+    
+    Вызывать перед чтением лога и перед os._exit() (atexit там не выполняется).
+    """
+    return _signals_log_writer.flush(timeout)
+
 def log_signal(symbol, states, risk):
     """
     УСТАРЕВШАЯ функция - используйте log_signal_snapshot().
@@ -31,52 +132,33 @@ def log_signal_snapshot(snapshot: SignalSnapshot):
         Fault injection проверяется в SignalSnapshotStore.save() - entry point.
         Эта функция вызывается только после проверки fault injection.
     """
-    file_exists = os.path.exists("signals_log.csv")
-    with open("signals_log.csv", "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        
-        # Если файл новый, записываем заголовки
-        if not file_exists:
-            writer.writerow([
-                "timestamp",
-                "symbol",
-                "state_1h",
-                "state_30m",
-                "state_15m",
-                "state_5m",
-                "risk",
-                "entry",
-                "exit",
-                "r"
-            ])
-        
-        # Преобразуем domain-объект в строки (IO-граница)
-        timestamp = snapshot.timestamp.isoformat()
-        state_1h = state_to_string(snapshot.states.get("1h"))
-        state_30m = state_to_string(snapshot.states.get("30m"))
-        state_15m = state_to_string(snapshot.states.get("15m"))
-        state_5m = state_to_string(snapshot.states.get("5m"))
-        risk_str = snapshot.risk_level.value if snapshot.risk_level else ""
-        
-        # Entry/Exit из snapshot
-        entry_str = f"{snapshot.entry:.4f}" if snapshot.entry else "NO_ENTRY"
-        exit_str = f"{snapshot.tp:.4f}" if snapshot.tp else "NO_EXIT"
-        
-        # R-ratio из snapshot
-        rr_str = f"R={snapshot.rr_ratio:.2f}" if snapshot.rr_ratio else "R=0"
-        
-        writer.writerow([
-            timestamp,
-            snapshot.symbol,
-            state_1h,
-            state_30m,
-            state_15m,
-            state_5m,
-            risk_str,
-            entry_str,
-            exit_str,
-            rr_str
-        ])
+    # Преобразуем domain-объект в строки (IO-граница)
+    timestamp = snapshot.timestamp.isoformat()
+    state_1h = state_to_string(snapshot.states.get("1h"))
+    state_30m = state_to_string(snapshot.states.get("30m"))
+    state_15m = state_to_string(snapshot.states.get("15m"))
+    state_5m = state_to_string(snapshot.states.get("5m"))
+    risk_str = snapshot.risk_level.value if snapshot.risk_level else ""
+    
+    # Entry/Exit из snapshot
+    entry_str = f"{snapshot.entry:.4f}" if snapshot.entry else "NO_ENTRY"
+    exit_str = f"{snapshot.tp:.4f}" if snapshot.tp else "NO_EXIT"
+    
+    # R-ratio из snapshot
+    rr_str = f"R={snapshot.rr_ratio:.2f}" if snapshot.rr_ratio else "R=0"
+    
+    _signals_log_writer.writerow([
+        timestamp,
+        snapshot.symbol,
+        state_1h,
+        state_30m,
+        state_15m,
+        state_5m,
+        risk_str,
+        entry_str,
+        exit_str,
+        rr_str
+    ])
 
 
 def log_signal_snapshot_from_legacy(symbol: str, states: Dict[str, Optional[MarketState]], risk: str):
@@ -90,9 +172,6 @@ def log_signal_snapshot_from_legacy(symbol: str, states: Dict[str, Optional[Mark
         states: Словарь состояний
         risk: Уровень риска (строка)
     """
-    from core.signal_snapshot import risk_string_to_enum
-    from core.market_state import normalize_states_dict
-    
     normalized_states = normalize_states_dict(states)
     risk_enum = risk_string_to_enum(risk)
     
@@ -111,6 +190,67 @@ def log_signal_snapshot_from_legacy(symbol: str, states: Dict[str, Optional[Mark
     # Логируем через основной метод
     log_signal_snapshot(snapshot)
 
+# Старые форматы времени без timezone (до перехода на isoformat)
+_LEGACY_TIMESTAMP_FORMATS = ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S')
+
+
+def _parse_signal_timestamp(time_str: str) -> Optional[datetime]:
+    """
+    Парсит время строки signals_log.csv и нормализует к UTC (offset-aware).
+    
+    log_signal_snapshot пишет isoformat(), поэтому основной путь -
+    fromisoformat (в 3.11 понимает и 'Z'); strptime только для старых строк.
+    
+    Returns:
+        datetime в UTC или None, если формат не распознан
+    """
+    try:
+        signal_time = datetime.fromisoformat(time_str)
+    except ValueError:
+        for fmt in _LEGACY_TIMESTAMP_FORMATS:
+            try:
+                signal_time = datetime.strptime(time_str, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    
+    tzinfo = signal_time.tzinfo
+    # Если datetime без timezone, добавляем UTC
+    if tzinfo is None:
+        return signal_time.replace(tzinfo=UTC)
+    if tzinfo is UTC:
+        return signal_time
+    return signal_time.astimezone(UTC)
+
+
+def _iter_lines_reversed(path: str, chunk_size: int = 65536):
+    """
+    Итерирует строки файла с конца к началу, читая его блоками.
+    
+    Строки signals_log.csv не содержат переводов строк внутри полей,
+    поэтому достаточно резать по переводу строки.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail = b""
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + tail
+            lines = chunk.split(b"\n")
+            # Первая строка блока может быть неполной - дочитаем её со следующим блоком
+            tail = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+        if tail:
+            yield tail.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
 def get_recent_signals(since: Optional[datetime] = None) -> List[Dict]:
     """
     Получает недавние сигналы.
@@ -123,65 +263,49 @@ def get_recent_signals(since: Optional[datetime] = None) -> List[Dict]:
     """
     signals = []
     
+    # Строки из буфера записи должны быть видны при чтении
+    flush_signal_log()
+    
+    # Нормализуем since к UTC для сравнения (один раз на вызов)
+    since_normalized = None
+    if since:
+        if since.tzinfo is None:
+            since_normalized = since.replace(tzinfo=UTC)
+        else:
+            since_normalized = since.astimezone(UTC)
+    
     try:
-        with open("signals_log.csv", "r", newline="") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) < 2:
+        # Лог пишется в хронологическом порядке: читаем с конца
+        # и останавливаемся на первой строке старше since
+        for row in csv.reader(_iter_lines_reversed(SIGNALS_LOG_FILE)):
+            if len(row) < 2:
+                continue
+            
+            try:
+                # Парсим время и нормализуем к UTC (offset-aware)
+                signal_time = _parse_signal_timestamp(row[0].strip())
+                if signal_time is None:
+                    # Пропускаем строку, если не удалось распарсить (в т.ч. заголовок)
                     continue
                 
-                try:
-                    # Парсим время и нормализуем к UTC (offset-aware)
-                    time_str = str(row[0]).strip()
-                    
-                    # Обрабатываем разные форматы
-                    if 'Z' in time_str:
-                        time_str = time_str.replace('Z', '+00:00')
-                    
-                    # Пробуем парсить ISO формат
-                    try:
-                        signal_time = datetime.fromisoformat(time_str)
-                    except ValueError:
-                        # Если не получилось, пробуем другие форматы
-                        # Может быть старый формат без timezone
-                        try:
-                            signal_time = datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S.%f')
-                        except ValueError:
-                            try:
-                                signal_time = datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S')
-                            except ValueError:
-                                # Пропускаем строку, если не удалось распарсить
-                                continue
-                    
-                    # Если datetime без timezone, добавляем UTC
-                    if signal_time.tzinfo is None:
-                        signal_time = signal_time.replace(tzinfo=UTC)
-                    # Нормализуем к UTC для сравнения
-                    signal_time = signal_time.astimezone(UTC)
-                    
-                    # Нормализуем since к UTC для сравнения
-                    if since:
-                        if since.tzinfo is None:
-                            since_normalized = since.replace(tzinfo=UTC)
-                        else:
-                            since_normalized = since.astimezone(UTC)
-                        if signal_time < since_normalized:
-                            continue
-                    
-                    signals.append({
-                        "timestamp": signal_time,
-                        "symbol": row[1] if len(row) > 1 else "",
-                        "states": {
-                            "1h": row[2] if len(row) > 2 else None,
-                            "30m": row[3] if len(row) > 3 else None,
-                            "15m": row[4] if len(row) > 4 else None,
-                            "5m": row[5] if len(row) > 5 else None,
-                        },
-                        "risk": row[6] if len(row) > 6 else None
-                    })
-                except (ValueError, IndexError):
-                    continue
+                if since_normalized is not None and signal_time < since_normalized:
+                    break
+                
+                signals.append({
+                    "timestamp": signal_time,
+                    "symbol": row[1] if len(row) > 1 else "",
+                    "states": {
+                        "1h": row[2] if len(row) > 2 else None,
+                        "30m": row[3] if len(row) > 3 else None,
+                        "15m": row[4] if len(row) > 4 else None,
+                        "5m": row[5] if len(row) > 5 else None,
+                    },
+                    "risk": row[6] if len(row) > 6 else None
+                })
+            except (ValueError, IndexError):
+                continue
     except FileNotFoundError:
         pass
     
+    signals.reverse()
     return signals
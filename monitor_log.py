@@ -1,5 +1,46 @@
+import atexit
+import queue
+import threading
 from datetime import datetime, UTC
 
+MONITOR_LOG_FILE = "monitor.log"
+
+# Строки пишет фоновый поток: вызывающий код только кладёт их в очередь
+_queue = queue.SimpleQueue()
+_writer_thread = None
+_writer_lock = threading.Lock()
+_STOP = object()
+
+
+def _drain():
+    """Пишет строки из очереди в открытый файл; flush - когда очередь опустела"""
+    with open(MONITOR_LOG_FILE, "a", buffering=1 << 16) as f:
+        while True:
+            line = _queue.get()
+            if line is _STOP:
+                return
+            f.write(line)
+            if _queue.empty():
+                f.flush()
+
+
+def _stop_writer():
+    """Дописывает очередь и останавливает поток при выходе из процесса"""
+    if _writer_thread is not None:
+        _queue.put(_STOP)
+        _writer_thread.join(timeout=5)
+
+
+def _ensure_writer():
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_drain, name="monitor-log-writer", daemon=True)
+            _writer_thread.start()
+            atexit.register(_stop_writer)
+
+
 def log_monitor(symbol, timeframe):
-    with open("monitor.log", "a") as f:
-        f.write(f"{datetime.now(UTC)} | {symbol} | {timeframe}\n")
+    if _writer_thread is None:
+        _ensure_writer()
+    _queue.put(f"{datetime.now(UTC)} | {symbol} | {timeframe}\n")
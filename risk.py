@@ -1,5 +1,46 @@
+import logging
+from enum import IntFlag
 from typing import Optional, Dict
 from core.market_state import MarketState, normalize_states_dict
+from indicators import atr
+
+logger = logging.getLogger(__name__)
+
+
+class RiskFlag(IntFlag):
+    """Факторы дополнительного риска в enhanced_risk_level"""
+    STOP_HIGH = 1
+    STOP_MEDIUM = 2
+    CRITICAL_LOW_LIQUIDITY = 4
+    WEAK_ADX = 8
+    RSI_EXTREME = 16
+    BB_EXTREME = 32
+    VERY_HIGH_VOLATILITY = 64
+    HIGH_VOLATILITY = 128
+
+
+# Вес каждого фактора в risk_score
+_RISK_FLAG_WEIGHTS = {
+    RiskFlag.STOP_HIGH: 2,
+    RiskFlag.STOP_MEDIUM: 1,
+    RiskFlag.CRITICAL_LOW_LIQUIDITY: 2,
+    RiskFlag.WEAK_ADX: 1,
+    RiskFlag.RSI_EXTREME: 1,
+    RiskFlag.BB_EXTREME: 1,
+    RiskFlag.VERY_HIGH_VOLATILITY: 2,
+    RiskFlag.HIGH_VOLATILITY: 1,
+}
+
+# risk_score для каждой комбинации флагов: индекс - int(flags)
+_RISK_SCORE_TABLE = tuple(
+    sum(weight for flag, weight in _RISK_FLAG_WEIGHTS.items() if mask & flag)
+    for mask in range(1 << len(RiskFlag))
+)
+
+# ATR добавляет 0-2 балла и влияет на итог только при базовом LOW и таких
+# risk_score до него: 0 (LOW/MEDIUM) и 2-3 (MEDIUM/HIGH). При 1 итог всегда
+# MEDIUM, при >= 4 - HIGH, при базовом MEDIUM - MEDIUM.
+_ATR_DECISIVE_SCORES = frozenset((0, 2, 3))
 
 def risk_level(states: Dict[str, Optional[MarketState]], directions=None) -> str:
     """
@@ -15,16 +56,17 @@ def risk_level(states: Dict[str, Optional[MarketState]], directions=None) -> str
     # Нормализуем и проверяем инварианты
     states = normalize_states_dict(states)
     
-    # Проверка инварианта: все значения должны быть MarketState enum или None
-    import logging
-    logger = logging.getLogger(__name__)
-    for key, state in states.items():
-        if state is not None and not isinstance(state, MarketState):
-            logger.error(
-                f"INVARIANT VIOLATION in risk_level: state[{key}] = {state} (type: {type(state).__name__}), "
-                f"expected MarketState or None. This is an architectural error."
-            )
-            states[key] = None
+    # Проверка инварианта: все значения должны быть MarketState enum или None.
+    # normalize_states_dict уже гарантирует это, поэтому повторная проверка
+    # только в debug-режиме (python -O её убирает)
+    if __debug__:
+        for key, state in states.items():
+            if state is not None and not isinstance(state, MarketState):
+                logger.error(
+                    f"INVARIANT VIOLATION in risk_level: state[{key}] = {state} (type: {type(state).__name__}), "
+                    f"expected MarketState or None. This is an architectural error."
+                )
+                states[key] = None
     
     # Абсолютный запрет
     if states.get("1h") is None:
@@ -132,9 +174,8 @@ def enhanced_risk_level(states: Dict[str, Optional[MarketState]], stop_info=None
     if base_risk == "HIGH":
         return "HIGH"
     
-    # Дополнительные проверки
-    risk_score = 0
-    risk_reasons = []
+    # Дополнительные проверки: собираем флаги, risk_score - одна выборка из таблицы
+    flags = 0
     
     # Проверка стопа
     if stop_info:
@@ -143,68 +184,49 @@ def enhanced_risk_level(states: Dict[str, Optional[MarketState]], stop_info=None
         
         stop_risk = stop_info.get("risk_level", "LOW")
         if stop_risk == "HIGH":
-            risk_score += 2
-            risk_reasons.append("Стоп-лосс слишком рискованный")
+            flags |= RiskFlag.STOP_HIGH  # Стоп-лосс слишком рискованный
         elif stop_risk == "MEDIUM":
-            risk_score += 1
+            flags |= RiskFlag.STOP_MEDIUM
     
     # Проверка объемов
     if volume_info:
-        volume_trend = volume_info.get("volume_trend", "NORMAL")
-        volume_ratio = volume_info.get("volume_ratio", 1.0)
-        if volume_trend == "LOW" or volume_ratio < 0.5:
-            risk_score += 2
-            risk_reasons.append("Критически низкая ликвидность")
-        elif volume_trend == "LOW":
-            risk_score += 1
-            risk_reasons.append("Низкая ликвидность")
+        if volume_info.get("volume_trend", "NORMAL") == "LOW" or volume_info.get("volume_ratio", 1.0) < 0.5:
+            flags |= RiskFlag.CRITICAL_LOW_LIQUIDITY
     
     # Проверка индикаторов
     if momentum_data:
         # ADX - слабый тренд увеличивает риск
-        adx_15m = momentum_data.get("adx_15m", {})
-        adx_strength = adx_15m.get("strength", "WEAK")
-        if adx_strength == "WEAK":
-            risk_score += 1
-            risk_reasons.append("Слабый тренд (ADX)")
+        if momentum_data.get("adx_15m", {}).get("strength", "WEAK") == "WEAK":
+            flags |= RiskFlag.WEAK_ADX
         
         # RSI - экстремальные значения
         rsi_15m = momentum_data.get("rsi_15m", 50)
         if rsi_15m > 80 or rsi_15m < 20:
-            risk_score += 1
-            risk_reasons.append(f"RSI в экстремальной зоне ({rsi_15m:.1f})")
+            flags |= RiskFlag.RSI_EXTREME
         
         # Bollinger Bands - цена за пределами полос
-        bb_15m = momentum_data.get("bb_15m", {})
-        bb_position = bb_15m.get("position", "MIDDLE")
-        if bb_position in ["ABOVE_UPPER", "BELOW_LOWER"]:
-            risk_score += 1
-            risk_reasons.append(f"Цена в экстремальной зоне BB ({bb_position})")
+        if momentum_data.get("bb_15m", {}).get("position", "MIDDLE") in ("ABOVE_UPPER", "BELOW_LOWER"):
+            flags |= RiskFlag.BB_EXTREME
         
-        # Stochastic - перекупленность/перепроданность
-        stoch_15m = momentum_data.get("stoch_15m", {})
-        stoch_signal = stoch_15m.get("signal", "NEUTRAL")
-        if stoch_signal in ["OVERBOUGHT", "OVERSOLD"]:
-            # Это может быть как хорошо, так и плохо, в зависимости от направления
-            # Не добавляем риск, но учитываем в контексте
-            pass
+        # Stochastic (перекупленность/перепроданность) может быть как хорошо,
+        # так и плохо в зависимости от направления - в риск не добавляем
+    
+    risk_score = _RISK_SCORE_TABLE[flags]
     
-    # Проверка волатильности (ATR)
-    if candles_map and candles_map.get("15m"):
+    # Проверка волатильности (ATR) - самая дорогая, только если может изменить итог
+    if base_risk == "LOW" and risk_score in _ATR_DECISIVE_SCORES and candles_map and candles_map.get("15m"):
         try:
-            from indicators import atr
             atr_15m = atr(candles_map["15m"])
             current_price = float(candles_map["15m"][-1][4])
             atr_pct = (atr_15m / current_price) * 100 if current_price > 0 else 0
             
             # Очень высокая волатильность (>5%) - рискованно
             if atr_pct > 5.0:
-                risk_score += 2
-                risk_reasons.append(f"Очень высокая волатильность ({atr_pct:.2f}%)")
+                flags |= RiskFlag.VERY_HIGH_VOLATILITY
             # Высокая волатильность (3-5%) - средний риск
             elif atr_pct > 3.0:
-                risk_score += 1
-                risk_reasons.append(f"Высокая волатильность ({atr_pct:.2f}%)")
+                flags |= RiskFlag.HIGH_VOLATILITY
+            risk_score = _RISK_SCORE_TABLE[flags]
         except Exception:
             pass
     
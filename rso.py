@@ -11,14 +11,26 @@ ABSOLUTE RULES:
 - STRICT SCHEMAS: Output must follow JSON/MD schemas exactly
 """
 
+import io
 import json
+import re
 import sys
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any
 import logging
 
+# orjson сериализует сразу в bytes (C-реализация); без него — stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Настройка логирования для RSO (только для отладки, не для вывода)
 logging.basicConfig(
     level=logging.WARNING,
@@ -26,6 +38,102 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Размер блока для чтения хвоста runner.log с конца
+_TAIL_CHUNK_SIZE = 65536
+
+# Уровень логирования - первое вхождение имени уровня отдельным словом
+_LEVEL_RE = re.compile(r'\b(CRITICAL|ERROR|WARNING|INFO|DEBUG)\b')
+
+# Формат StructuredFormatter из runner.py:
+# timestamp=... level=... pid=... task=... component=... message=...
+_STRUCTURED_LOG_RE = re.compile(r'timestamp=(\S+) level=(\S+) .*?message=(.*)', re.DOTALL)
+
+# Прочие строки: "<дата> <время> <поле> [сообщение]" (разбиение по одиночным пробелам)
+_PLAIN_LOG_RE = re.compile(r'([^ ]* [^ ]*) [^ ]*(?: (.*))?', re.DOTALL)
+
+
+def _read_tail_lines(path: Path, limit: int) -> List[bytes]:
+    """
+    Возвращает последние limit строк файла (как tail -n), без загрузки всего файла.
+    
+    Файл читается блоками с конца, пока не набрано limit строк или не достигнуто начало.
+    """
+    lines = []  # В обратном порядке
+    # Блоки читаем сами, поэтому буфер BufferedReader (и лишнее копирование) не нужен
+    with open(path, 'rb', buffering=0) as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        carry = b""
+        while position > 0 and len(lines) < limit:
+            read_size = min(_TAIL_CHUNK_SIZE, position)
+            position -= read_size
+            f.seek(position)
+            # Концы строк сохраняем, чтобы \r\n на границе блоков склеился корректно
+            parts = (f.read(read_size) + carry).splitlines(keepends=True)
+            # Первая строка блока может быть неполной - дочитаем её со следующим блоком
+            carry = parts.pop(0) if position > 0 else b""
+            lines.extend(reversed(parts))
+    
+    del lines[limit:]
+    lines.reverse()
+    return [line.rstrip(b"\r\n") for line in lines]
+
+
+def _build_trans_dict(trans) -> Dict[str, Any]:
+    """Преобразует StateTransition в словарь для отчёта"""
+    return {
+        "from_state": trans.from_state.value,
+        "to_state": trans.to_state.value,
+        "reason": trans.reason,
+        "timestamp": trans.timestamp.isoformat(),
+        "incident_id": trans.incident_id,
+        "owner": trans.owner,
+        "metadata": trans.metadata
+    }
+
+
+def _dump_json(data: Any) -> bytes:
+    """Сериализует значение в UTF-8 JSON bytes с отступом 2"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _iter_json_report_chunks(report: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Сериализует JSON отчет по ключам верхнего уровня.
+    
+    Результат побайтно совпадает с _dump_json(report), но в памяти
+    одновременно находится одно сериализованное значение, а не весь отчет.
+    """
+    if not report:
+        yield b"{}"
+        return
+    
+    separator = b"{\n  "
+    for key, value in report.items():
+        # Вложенное значение сдвигаем на один уровень отступа
+        yield separator + _dump_json(key) + b": " + _dump_json(value).replace(b"\n", b"\n  ")
+        separator = b",\n  "
+    yield b"\n}"
+
+
+def _write_report(path: Path, chunks: Iterable[bytes]) -> None:
+    """
+    Записывает отчет напрямую через os.write, без буферного слоя Python.
+    
+    Отчет уже сериализован частями, поэтому каждая часть - один системный вызов.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        for data in chunks:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+    finally:
+        os.close(fd)
+
 
 class RSOReader:
     """
@@ -45,6 +153,20 @@ class RSOReader:
             project_root = os.path.dirname(os.path.abspath(__file__))
         self.project_root = Path(project_root)
         self._sys_path_added = False
+        # Словари уже прочитанных переходов: _transitions только дополняется,
+        # поэтому при повторном чтении преобразуются лишь новые переходы.
+        # Кэш покрывает хвост _transitions[_trans_cache_start:_trans_cache_len]
+        self._trans_cache: List[Dict[str, Any]] = []
+        self._trans_cache_start = 0
+        self._trans_cache_len = 0
+        self._trans_lock = threading.Lock()
+        # FSM - долгоживущий синглтон, а список _transitions не пересоздаётся:
+        # ссылку на него берём один раз на экземпляр FSM
+        self._sm = None
+        self._trans_attr = None
+        # Функции доступа к синглтонам системы (модули импортируются один раз)
+        self._get_state_machine = None
+        self._get_system_state = None
     
     def _ensure_sys_path(self):
         """Добавляет project_root в sys.path для импорта модулей (только чтение)"""
@@ -52,6 +174,73 @@ class RSOReader:
             sys.path.insert(0, str(self.project_root))
             self._sys_path_added = True
     
+    def _read_state_machine(self):
+        """Возвращает FSM через get_state_machine(); модуль импортируется при первом вызове"""
+        if self._get_state_machine is None:
+            self._ensure_sys_path()
+            from system_state_machine import get_state_machine
+            self._get_state_machine = get_state_machine
+        return self._get_state_machine()
+    
+    def _read_system_state_object(self):
+        """Возвращает SystemState через get_system_state(); модуль импортируется при первом вызове"""
+        if self._get_system_state is None:
+            self._ensure_sys_path()
+            from system_state import get_system_state
+            self._get_system_state = get_system_state
+        return self._get_system_state()
+    
+    def _get_transitions(self, state_machine) -> Optional[List]:
+        """
+        Возвращает список переходов FSM (или None), кэшируя ссылку на него.
+        
+        При смене экземпляра FSM кэш словарей переходов сбрасывается.
+        """
+        if state_machine is not self._sm:
+            self._sm = state_machine
+            self._trans_attr = getattr(state_machine, '_transitions', None)
+            self._trans_cache = []
+            self._trans_cache_start = 0
+            self._trans_cache_len = 0
+        return self._trans_attr
+    
+    def _read_transitions(self, state_machine, limit: int) -> List[Dict[str, Any]]:
+        """
+        Возвращает последние limit переходов, досчитывая кэш только по новым.
+        
+        Словари строятся только для нужного хвоста истории, а не для всех переходов.
+        """
+        if limit <= 0:
+            return []
+        
+        # Читатели могут работать параллельно (см. main) - кэш общий
+        with self._trans_lock:
+            source = self._get_transitions(state_machine)
+            if source is None:
+                return []
+            
+            total = len(source)
+            wanted_start = max(0, total - limit)
+            
+            if total < self._trans_cache_len or wanted_start >= self._trans_cache_len:
+                # История сократилась (другой FSM), кэш пуст или целиком устарел -
+                # строим только нужный хвост
+                self._trans_cache = [_build_trans_dict(trans) for trans in source[wanted_start:]]
+                self._trans_cache_start = wanted_start
+            else:
+                if wanted_start < self._trans_cache_start:
+                    # Запрошено больше, чем в кэше - достраиваем начало
+                    self._trans_cache[:0] = [
+                        _build_trans_dict(trans) for trans in source[wanted_start:self._trans_cache_start]
+                    ]
+                    self._trans_cache_start = wanted_start
+                self._trans_cache.extend(
+                    _build_trans_dict(trans) for trans in source[self._trans_cache_len:]
+                )
+            self._trans_cache_len = total
+            
+            return self._trans_cache[-limit:]
+    
     def read_fsm_state(self) -> Optional[Dict[str, Any]]:
         """
         Читает текущее состояние FSM (State Machine).
@@ -60,10 +249,7 @@ class RSOReader:
             Dict с информацией о состоянии или None если недоступно
         """
         try:
-            self._ensure_sys_path()
-            from system_state_machine import get_state_machine
-            
-            state_machine = get_state_machine()
+            state_machine = self._read_state_machine()
             if state_machine is None:
                 return None
             
@@ -71,18 +257,7 @@ class RSOReader:
             state_info = state_machine.get_state_info()
             
             # Читаем переходы (только чтение)
-            transitions = []
-            if hasattr(state_machine, '_transitions'):
-                for trans in state_machine._transitions:
-                    transitions.append({
-                        "from_state": trans.from_state.value,
-                        "to_state": trans.to_state.value,
-                        "reason": trans.reason,
-                        "timestamp": trans.timestamp.isoformat(),
-                        "incident_id": trans.incident_id,
-                        "owner": trans.owner,
-                        "metadata": trans.metadata
-                    })
+            transitions = self._read_transitions(state_machine, 50)
             
             return {
                 "current_state": state_info.get("state"),
@@ -93,24 +268,24 @@ class RSOReader:
                 "last_heartbeat": state_info.get("last_heartbeat"),
                 "transitions_count": state_info.get("transitions_count"),
                 "last_transition": state_info.get("last_transition"),
-                "all_transitions": transitions[-50:] if transitions else []  # Последние 50 переходов
+                "all_transitions": transitions  # Последние 50 переходов
             }
         except Exception as e:
             logger.warning(f"Failed to read FSM state: {e}")
             return None
     
-    def read_system_state(self) -> Optional[Dict[str, Any]]:
+    def read_system_state(self, observation_time: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Читает состояние системы (SystemState).
         
+        Args:
+            observation_time: Время наблюдения в ISO формате (по умолчанию - текущее)
+        
         Returns:
             Dict с информацией о состоянии системы или None если недоступно
         """
         try:
-            self._ensure_sys_path()
-            from system_state import get_system_state
-            
-            system_state = get_system_state()
+            system_state = self._read_system_state_object()
             if system_state is None:
                 return None
             
@@ -119,7 +294,7 @@ class RSOReader:
             
             # Добавляем дополнительную информацию (только чтение)
             return {
-                "timestamp": datetime.now(UTC).isoformat(),
+                "timestamp": observation_time or datetime.now(UTC).isoformat(),
                 "system_health": {
                     "is_running": system_state.system_health.is_running,
                     "safe_mode": system_state.system_health.safe_mode,
@@ -158,19 +333,17 @@ class RSOReader:
         Returns:
             List словарей с записями логов
         """
-        logs = []
+        # Не больше limit записей независимо от числа прочитанных строк
+        logs = deque(maxlen=max(limit, 0))
         log_file = self.project_root / "runner.log"
         
         if not log_file.exists():
-            return logs
+            return []
         
         try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-                
             # Читаем последние limit строк
-            for line in lines[-limit:]:
-                line = line.strip()
+            for raw_line in _read_tail_lines(log_file, limit):
+                line = raw_line.decode('utf-8', 'ignore').strip()
                 if not line:
                     continue
                 
@@ -182,37 +355,27 @@ class RSOReader:
                     "message": None
                 }
                 
-                # Пытаемся извлечь timestamp и level
-                parts = line.split(' ', 3)
-                if len(parts) >= 3:
-                    try:
-                        # Пробуем распарсить timestamp
-                        timestamp_str = parts[0] + ' ' + parts[1]
+                # Извлекаем timestamp, level и message одним сопоставлением
+                match = _STRUCTURED_LOG_RE.match(line)
+                if match:
+                    log_entry["timestamp"], log_entry["level"], log_entry["message"] = match.groups()
+                else:
+                    match = _PLAIN_LOG_RE.fullmatch(line)
+                    if match:
+                        timestamp_str, message = match.groups()
                         log_entry["timestamp"] = timestamp_str
-                        log_entry["message"] = parts[3] if len(parts) > 3 else line
+                        log_entry["message"] = message if message is not None else line
                         
                         # Ищем уровень логирования
-                        if '[CRITICAL]' in line or 'CRITICAL' in line:
-                            log_entry["level"] = "CRITICAL"
-                        elif '[ERROR]' in line or 'ERROR' in line:
-                            log_entry["level"] = "ERROR"
-                        elif '[WARNING]' in line or 'WARNING' in line:
-                            log_entry["level"] = "WARNING"
-                        elif '[INFO]' in line or 'INFO' in line:
-                            log_entry["level"] = "INFO"
-                        elif '[DEBUG]' in line or 'DEBUG' in line:
-                            log_entry["level"] = "DEBUG"
-                        else:
-                            log_entry["level"] = "UNKNOWN"
-                    except Exception:
-                        log_entry["message"] = line
+                        level_match = _LEVEL_RE.search(line)
+                        log_entry["level"] = level_match.group(1) if level_match else "UNKNOWN"
                 
                 logs.append(log_entry)
         
         except Exception as e:
             logger.warning(f"Failed to read logs: {e}")
         
-        return logs
+        return list(logs)
     
     def read_fsm_transitions(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -225,27 +388,11 @@ class RSOReader:
             List словарей с переходами состояний
         """
         try:
-            self._ensure_sys_path()
-            from system_state_machine import get_state_machine
-            
-            state_machine = get_state_machine()
+            state_machine = self._read_state_machine()
             if state_machine is None:
                 return []
             
-            transitions = []
-            if hasattr(state_machine, '_transitions'):
-                for trans in state_machine._transitions[-limit:]:
-                    transitions.append({
-                        "from_state": trans.from_state.value,
-                        "to_state": trans.to_state.value,
-                        "reason": trans.reason,
-                        "timestamp": trans.timestamp.isoformat(),
-                        "incident_id": trans.incident_id,
-                        "owner": trans.owner,
-                        "metadata": trans.metadata
-                    })
-            
-            return transitions
+            return self._read_transitions(state_machine, limit)
         except Exception as e:
             logger.warning(f"Failed to read FSM transitions: {e}")
             return []
@@ -263,7 +410,8 @@ class RSOOutput:
         fsm_state: Optional[Dict],
         system_state: Optional[Dict],
         logs: List[Dict],
-        transitions: List[Dict]
+        transitions: List[Dict],
+        observation_time: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Генерирует JSON отчет согласно схеме.
@@ -273,13 +421,14 @@ class RSOOutput:
             system_state: Состояние системы
             logs: Логи
             transitions: Переходы FSM
+            observation_time: Время наблюдения в ISO формате (по умолчанию - текущее)
         
         Returns:
             Dict с JSON структурой отчета
         """
         return {
             "rso_version": "1.0",
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": observation_time or datetime.now(UTC).isoformat(),
             "observation_type": "read_only",
             "fsm_state": fsm_state,
             "system_state": system_state,
@@ -297,7 +446,8 @@ class RSOOutput:
         fsm_state: Optional[Dict],
         system_state: Optional[Dict],
         logs: List[Dict],
-        transitions: List[Dict]
+        transitions: List[Dict],
+        observation_time: Optional[str] = None
     ) -> str:
         """
         Генерирует Markdown отчет согласно схеме.
@@ -307,102 +457,112 @@ class RSOOutput:
             system_state: Состояние системы
             logs: Логи
             transitions: Переходы FSM
+            observation_time: Время наблюдения в ISO формате (по умолчанию - текущее)
         
         Returns:
             Строка с Markdown отчетом
         """
-        md = []
-        md.append("# Runtime Safety Observer (RSO) v1.0 Report")
-        md.append("")
-        md.append(f"**Observation Time:** {datetime.now(UTC).isoformat()}")
-        md.append(f"**Observer Mode:** External (Read-Only)")
-        md.append("")
+        md = io.StringIO()
+        write = md.write
+        write("# Runtime Safety Observer (RSO) v1.0 Report\n")
+        write("\n")
+        write(f"**Observation Time:** {observation_time or datetime.now(UTC).isoformat()}\n")
+        write(f"**Observer Mode:** External (Read-Only)\n")
+        write("\n")
         
         # FSM State
-        md.append("## FSM State")
+        write("## FSM State\n")
         if fsm_state:
-            md.append(f"- **Current State:** `{fsm_state.get('current_state', 'UNKNOWN')}`")
+            write(f"- **Current State:** `{fsm_state.get('current_state', 'UNKNOWN')}`\n")
             duration = fsm_state.get('duration_in_state')
             if duration is not None:
-                md.append(f"- **Duration in State:** `{duration:.1f}s`")
-            md.append(f"- **Consecutive Errors:** `{fsm_state.get('consecutive_errors', 0)}`")
-            md.append(f"- **Recovery Cycles:** `{fsm_state.get('recovery_cycles', 0)}`")
+                write(f"- **Duration in State:** `{duration:.1f}s`\n")
+            write(f"- **Consecutive Errors:** `{fsm_state.get('consecutive_errors', 0)}`\n")
+            write(f"- **Recovery Cycles:** `{fsm_state.get('recovery_cycles', 0)}`\n")
             safe_mode_at = fsm_state.get('safe_mode_entered_at')
             if safe_mode_at:
-                md.append(f"- **Safe Mode Entered At:** `{safe_mode_at}`")
+                write(f"- **Safe Mode Entered At:** `{safe_mode_at}`\n")
             last_transition = fsm_state.get('last_transition')
             if last_transition:
-                md.append(f"- **Last Transition:** `{last_transition.get('from')}` → `{last_transition.get('to')}`")
-                md.append(f"  - Reason: `{last_transition.get('reason', 'N/A')}`")
-                md.append(f"  - Incident ID: `{last_transition.get('incident_id', 'N/A')}`")
+                write(f"- **Last Transition:** `{last_transition.get('from')}` → `{last_transition.get('to')}`\n")
+                write(f"  - Reason: `{last_transition.get('reason', 'N/A')}`\n")
+                write(f"  - Incident ID: `{last_transition.get('incident_id', 'N/A')}`\n")
         else:
-            md.append("- **Status:** FSM state unavailable")
-        md.append("")
+            write("- **Status:** FSM state unavailable\n")
+        write("\n")
         
         # System State
-        md.append("## System State")
+        write("## System State\n")
         if system_state:
             health = system_state.get('system_health', {})
-            md.append("### System Health")
-            md.append(f"- **Is Running:** `{health.get('is_running', False)}`")
-            md.append(f"- **Safe Mode:** `{health.get('safe_mode', False)}`")
-            md.append(f"- **Trading Paused:** `{health.get('trading_paused', False)}`")
-            md.append(f"- **Consecutive Errors:** `{health.get('consecutive_errors', 0)}`")
+            write("### System Health\n")
+            write(f"- **Is Running:** `{health.get('is_running', False)}`\n")
+            write(f"- **Safe Mode:** `{health.get('safe_mode', False)}`\n")
+            write(f"- **Trading Paused:** `{health.get('trading_paused', False)}`\n")
+            write(f"- **Consecutive Errors:** `{health.get('consecutive_errors', 0)}`\n")
             
             perf = system_state.get('performance_metrics', {})
-            md.append("### Performance Metrics")
-            md.append(f"- **Total Cycles:** `{perf.get('total_cycles', 0)}`")
-            md.append(f"- **Successful Cycles:** `{perf.get('successful_cycles', 0)}`")
-            md.append(f"- **Errors:** `{perf.get('errors', 0)}`")
+            write("### Performance Metrics\n")
+            write(f"- **Total Cycles:** `{perf.get('total_cycles', 0)}`\n")
+            write(f"- **Successful Cycles:** `{perf.get('successful_cycles', 0)}`\n")
+            write(f"- **Errors:** `{perf.get('errors', 0)}`\n")
             
             trading = system_state.get('trading_decision', {})
-            md.append("### Trading Decision")
-            md.append(f"- **Can Trade:** `{trading.get('can_trade', False)}`")
+            write("### Trading Decision\n")
+            write(f"- **Can Trade:** `{trading.get('can_trade', False)}`\n")
         else:
-            md.append("- **Status:** System state unavailable")
-        md.append("")
+            write("- **Status:** System state unavailable\n")
+        write("\n")
         
         # FSM Transitions
-        md.append("## FSM Transitions")
+        write("## FSM Transitions\n")
         if transitions:
-            md.append(f"**Total Transitions:** {len(transitions)}")
-            md.append("")
-            md.append("| From | To | Reason | Timestamp | Incident ID | Owner |")
-            md.append("|------|----|----|-----------|-------------|-------|")
+            write(f"**Total Transitions:** {len(transitions)}\n")
+            write("\n")
+            write("| From | To | Reason | Timestamp | Incident ID | Owner |\n")
+            write("|------|----|----|-----------|-------------|-------|\n")
             for trans in transitions[-20:]:  # Последние 20 переходов
-                from_state = trans.get('from_state', 'N/A')
-                to_state = trans.get('to_state', 'N/A')
-                reason = trans.get('reason', 'N/A')[:50]  # Ограничиваем длину
-                timestamp = trans.get('timestamp', 'N/A')[:19]  # Без микросекунд
-                incident_id = trans.get('incident_id', 'N/A')[:12]  # Первые 12 символов
-                owner = trans.get('owner', 'N/A')
-                md.append(f"| `{from_state}` | `{to_state}` | `{reason}` | `{timestamp}` | `{incident_id}` | `{owner}` |")
+                # Усечение через точность %-формата: reason до 50 символов,
+                # timestamp без микросекунд, первые 12 символов incident_id
+                write("| `%s` | `%s` | `%.50s` | `%.19s` | `%.12s` | `%s` |\n" % (
+                    trans.get('from_state', 'N/A'),
+                    trans.get('to_state', 'N/A'),
+                    trans.get('reason', 'N/A'),
+                    trans.get('timestamp', 'N/A'),
+                    trans.get('incident_id', 'N/A'),
+                    trans.get('owner', 'N/A'),
+                ))
         else:
-            md.append("- **Status:** No transitions available")
-        md.append("")
+            write("- **Status:** No transitions available\n")
+        write("\n")
         
         # Recent Logs
-        md.append("## Recent Logs")
+        write("## Recent Logs\n")
         if logs:
-            md.append(f"**Total Log Entries:** {len(logs)}")
-            md.append("")
-            md.append("| Timestamp | Level | Message |")
-            md.append("|-----------|-------|---------|")
+            write(f"**Total Log Entries:** {len(logs)}\n")
+            write("\n")
+            write("| Timestamp | Level | Message |\n")
+            write("|-----------|-------|---------|\n")
             for log in logs[-20:]:  # Последние 20 логов
-                timestamp = log.get('timestamp', 'N/A')[:19] if log.get('timestamp') else 'N/A'
-                level = log.get('level', 'UNKNOWN')
-                message = log.get('message', log.get('raw', 'N/A'))[:100]  # Ограничиваем длину
-                md.append(f"| `{timestamp}` | `{level}` | `{message}` |")
+                message = log.get('message')
+                if message is None:
+                    message = log.get('raw', 'N/A')
+                # Усечение через точность %-формата: timestamp без микросекунд, message до 100 символов
+                write("| `%.19s` | `%s` | `%.100s` |\n" % (
+                    log.get('timestamp') or 'N/A',
+                    log.get('level', 'UNKNOWN'),
+                    message,
+                ))
         else:
-            md.append("- **Status:** No logs available")
-        md.append("")
+            write("- **Status:** No logs available\n")
+        write("\n")
         
-        md.append("---")
-        md.append("")
-        md.append("**Note:** This is a read-only observation. No verdicts are computed.")
-        md.append("**Observer:** External process, no control actions performed.")
+        write("---\n")
+        write("\n")
+        write("**Note:** This is a read-only observation. No verdicts are computed.\n")
+        write("**Observer:** External process, no control actions performed.")
         
-        return "\n".join(md)
+        return md.getvalue()
 
 
 def main():
@@ -449,29 +609,44 @@ def main():
     # Создаем читатель
     reader = RSOReader(project_root)
     
-    # Читаем данные (только чтение)
-    fsm_state = reader.read_fsm_state()
-    system_state = reader.read_system_state()
-    logs = reader.read_structured_logs(limit=100)
-    transitions = reader.read_fsm_transitions(limit=50)
-    
-    # Генерируем отчеты
-    json_report = RSOOutput.generate_json_report(fsm_state, system_state, logs, transitions)
-    md_report = RSOOutput.generate_markdown_report(fsm_state, system_state, logs, transitions)
+    # Одно время наблюдения на весь отчет: состояние системы, отчеты и имена файлов
+    now = datetime.now(UTC)
+    observation_time = now.isoformat()
+    timestamp_str = now.strftime("%Y%m%d_%H%M%S")
     
-    # Выводим отчеты
-    timestamp_str = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    # Читаем данные (только чтение). Чтение runner.log - IO, остальное - чтение
+    # объектов в памяти, поэтому источники читаются параллельно.
+    # sys.path меняем и синглтоны FSM / SystemState создаём до запуска потоков:
+    # get_state_machine() и get_system_state() не защищены lock, и параллельный
+    # первый вызов мог бы создать два экземпляра
+    reader._ensure_sys_path()
+    for create_singleton in (reader._read_state_machine, reader._read_system_state_object):
+        try:
+            create_singleton()
+        except Exception:
+            # Ошибку покажет соответствующий reader в отчете
+            pass
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        fsm_future = executor.submit(reader.read_fsm_state)
+        system_future = executor.submit(reader.read_system_state, observation_time)
+        logs_future = executor.submit(reader.read_structured_logs, limit=100)
+        transitions_future = executor.submit(reader.read_fsm_transitions, limit=50)
+        fsm_state = fsm_future.result()
+        system_state = system_future.result()
+        logs = logs_future.result()
+        transitions = transitions_future.result()
     
+    # Генерируем и выводим только запрошенные отчеты
     if not args.md_only:
+        json_report = RSOOutput.generate_json_report(fsm_state, system_state, logs, transitions, observation_time)
         json_file = output_dir / f"rso_report_{timestamp_str}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(json_report, f, indent=2, ensure_ascii=False)
+        _write_report(json_file, _iter_json_report_chunks(json_report))
         print(f"JSON report written to: {json_file}")
     
     if not args.json_only:
+        md_report = RSOOutput.generate_markdown_report(fsm_state, system_state, logs, transitions, observation_time)
         md_file = output_dir / f"rso_report_{timestamp_str}.md"
-        with open(md_file, 'w', encoding='utf-8') as f:
-            f.write(md_report)
+        _write_report(md_file, (md_report.encode('utf-8'),))
         print(f"Markdown report written to: {md_file}")
     
     # Выводим краткую информацию в stdout
@@ -22,19 +22,27 @@ INVARIANTS:
 - FATAL_REAPER runs in daemon thread, checks every 1-2 seconds
 - ThreadWatchdog enforces SAFE_MODE TTL with direct os._exit
 """
+import array
 import asyncio
+import atexit
+import bisect
+import functools
+import itertools
 import logging
+import logging.handlers
+import queue
 import sys
-import traceback
 import signal
 import os
 import time
 import threading
-import uuid
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
 from datetime import datetime, UTC, timedelta
-from enum import Enum
+from enum import Enum, IntEnum
 from pathlib import Path
-from typing import Set, Optional
+from typing import Set, Optional, Tuple
 
 # File locking (Unix only)
 try:
@@ -54,6 +62,7 @@ from chaos_engine import get_chaos_engine, ChaosType
 from system_state_machine import get_state_machine, SystemState as SystemStateEnum
 from task_dump import log_task_dump
 from systemd_integration import get_systemd_integration, ExitCode
+from structured_formatter import StructuredFormatter, JsonLinesFormatter, StructuredQueueHandler
 
 # Импорты для анализа рынка (будем вызывать напрямую)
 from config import SYMBOLS, TIMEFRAMES
@@ -63,17 +72,14 @@ from correlation_analysis import analyze_market_correlations
 from spike_alert import check_all_symbols_for_spikes
 from signal_generator import generate_signals_for_symbols
 
-# Экосистема
-from core.decision_core import get_decision_core
-from brains.market_regime_brain import get_market_regime_brain
-from brains.risk_exposure_brain import get_risk_exposure_brain
-from brains.cognitive_filter import get_cognitive_filter
-from brains.opportunity_awareness import get_opportunity_awareness
-from execution.gatekeeper import get_gatekeeper
+# Экосистема (core/brains/execution) импортируется лениво в run_market_analysis:
+# повторный запуск, отклонённый check_single_instance, не платит за её импорт
 
 # Настройки
 BASE_DIR = Path(__file__).parent.absolute()
 LOG_FILE = os.environ.get("LOG_FILE", str(BASE_DIR / "runner.log"))
+# Формат runner.log: "text" (key=value, читает rso.py) или "ndjson" (JSON Lines)
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").lower()
 PID_FILE = os.environ.get("PID_FILE", str(BASE_DIR / "market_bot.pid"))
 ANALYSIS_INTERVAL = int(os.environ.get("BOT_INTERVAL", "300"))  # 5 минут (базовый интервал)
 MAX_CONSECUTIVE_ERRORS = int(os.environ.get("MAX_CONSECUTIVE_ERRORS", "5"))
@@ -122,6 +128,8 @@ ITERATION_BUDGET_SECONDS = 60.0  # 60 секунд - жесткий лимит 
 SAFE_MODE_TTL = 600.0  # 600 секунд (10 минут) - TTL для SAFE_MODE
 GRACEFUL_SHUTDOWN_TIMEOUT = 10.0  # 10 секунд - жёсткий таймаут на graceful shutdown
 FATAL_EXIT_CODE = 10  # Exit code для FATAL состояния (systemd restart)
+SIGNAL_LOG_FLUSH_TIMEOUT = 2.0  # секунд ожидания записи signals_log.csv в flush_logs()
+TRACE_FLUSH_TIMEOUT = 3.0  # секунд на дозапись очереди DecisionTrace при выходе
 
 # ========== THREAD WATCHDOG CONSTANTS ==========
 THREAD_WATCHDOG_INTERVAL = 5.0  # Проверка каждые 5 секунд
@@ -133,110 +141,136 @@ _chaos_was_active: bool = False  # Флаг: был ли chaos активен (
 # HARDENING: _safe_mode_entered_at УДАЛЕН - теперь управляется state machine
 
 # ========== THREAD-SAFE HEARTBEAT ACCESS ==========
-_heartbeat_lock = threading.Lock()  # Lock для thread-safe доступа к last_heartbeat
+# Unix timestamp последнего heartbeat этого процесса (0.0 = ещё не было).
+# Пишет только asyncio heartbeat loop, читает ThreadWatchdog: присваивание
+# float атомарно под GIL, lock не нужен
+_last_heartbeat_ts: float = 0.0
 
 # ========== STRUCTURED LOGGING ==========
+# Формат строки лога - StructuredFormatter (structured_formatter.py)
 
-class StructuredFormatter(logging.Formatter):
+# Имя текущей asyncio-задачи для логов: выставляется один раз при старте задачи
+# (см. spawn_task), вместо asyncio.current_task() на каждую запись
+_task_name_var: ContextVar[str] = ContextVar("task_name", default="main")
+
+
+async def _run_with_task_name(coro, name: str):
+    """Выполняет корутину, предварительно записав имя задачи в ContextVar"""
+    _task_name_var.set(name)
+    return await coro
+
+
+def spawn_task(coro, name: str) -> asyncio.Task:
+    """asyncio.create_task с именем задачи, доступным логированию через ContextVar"""
+    return asyncio.create_task(_run_with_task_name(coro, name), name=name)
+
+
+class ContextFilter(logging.Filter):
     """
-    Structured formatter для production logging.
-    Формат: timestamp | level | pid | task | component | message
+    Добавляет в запись component и task_name.
+    
+    Висит на QueueHandler, поэтому работает только для записей, прошедших
+    фильтр по уровню, и не подменяет глобальную LogRecordFactory.
     """
-    def __init__(self):
-        super().__init__()
-        self.pid = os.getpid()
-    
-    def format(self, record: logging.LogRecord) -> str:
-        # Извлекаем task name из record (если есть)
-        task_name = getattr(record, 'task_name', None)
-        if task_name is None:
-            # Пытаемся получить из текущего task (безопасно)
-            try:
-                current_task = asyncio.current_task()
-                if current_task:
-                    task_name = current_task.get_name()
-                else:
-                    task_name = 'main'
-            except RuntimeError:
-                # Нет event loop - не async контекст
-                task_name = 'main'
-        
-        component = getattr(record, 'component', 'runner')
-        
-        # Формируем структурированное сообщение
-        timestamp = datetime.fromtimestamp(record.created, tz=UTC).isoformat()
-        level = record.levelname
-        message = record.getMessage()
-        
-        # JSON-like структурированный формат (читаемый для journalctl)
-        log_entry = (
-            f"timestamp={timestamp} "
-            f"level={level} "
-            f"pid={self.pid} "
-            f"task={task_name} "
-            f"component={component} "
-            f"message={message}"
-        )
-        
-        # Добавляем exception info если есть
-        if record.exc_info:
-            log_entry += f"\n{self.formatException(record.exc_info)}"
-        
-        return log_entry
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Добавляем component из logger name
+        if not hasattr(record, 'component'):
+            head, sep, _ = record.name.partition('.')
+            record.component = head if sep else 'runner'
+        
+        # Имя задачи берём из ContextVar (выставляется в spawn_task)
+        if not hasattr(record, 'task_name'):
+            record.task_name = _task_name_var.get()
+        return True
+
+
+# Фоновый поток, который форматирует записи и пишет их в файл/stdout
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_listener_lock = threading.Lock()
 
 # Настройка структурированного логирования
 def setup_structured_logging():
-    """Настраивает структурированное логирование для production"""
+    """
+    Настраивает структурированное логирование для production.
+    
+    Логгеры только кладут запись в очередь (QueueHandler); форматирование и
+    запись в файл/stdout выполняет QueueListener в отдельном потоке, поэтому
+    event loop не блокируется на write().
+    """
+    global _log_listener
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
     
     # Удаляем существующие handlers
     root_logger.handlers.clear()
+    if _log_listener is not None:
+        _log_listener.stop()
     
     # Создаём formatter
     formatter = StructuredFormatter()
     
     # File handler
     file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
-    file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+    file_handler.setFormatter(JsonLinesFormatter() if LOG_FORMAT == "ndjson" else formatter)
     
     # Console handler (для systemd/journalctl)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root_logger.addHandler(queue_handler)
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
     
     return root_logger
 
-# Инициализируем логирование
-root_logger = setup_structured_logging()
-logger = logging.getLogger(__name__)
-
-# Настраиваем record factory для автоматического добавления component и task_name
-old_factory = logging.getLogRecordFactory()
 
-def enhanced_record_factory(*args, **kwargs):
-    """Enhanced record factory для добавления component и task_name"""
-    record = old_factory(*args, **kwargs)
-    
-    # Добавляем component из logger name
-    if not hasattr(record, 'component'):
-        record.component = record.name.split('.')[0] if '.' in record.name else 'runner'
+def flush_logs():
+    """
+    Дописывает все записи из очереди логов в handlers.
     
-    # Добавляем task_name если в async контексте
-    if not hasattr(record, 'task_name'):
+    Вызывается перед os._exit() и при завершении процесса: без этого записи,
+    ещё не обработанные QueueListener, будут потеряны.
+    Заодно дописывает очередь DecisionTrace и буфер signals_log.csv -
+    os._exit() пропускает atexit.
+    """
+    # Модули не импортируем на пути выхода: если модуль не загружен, писать нечего
+    gatekeeper = sys.modules.get("execution.gatekeeper")
+    if gatekeeper is not None:
         try:
-            current_task = asyncio.current_task()
-            if current_task:
-                record.task_name = current_task.get_name()
-        except RuntimeError:
-            # Нет event loop
+            gatekeeper.flush_traces(TRACE_FLUSH_TIMEOUT)
+        except Exception:
+            pass
+    journal = sys.modules.get("journal")
+    if journal is not None:
+        try:
+            journal.flush_signal_log(timeout=SIGNAL_LOG_FLUSH_TIMEOUT)
+        except Exception:
             pass
     
-    return record
+    with _log_listener_lock:
+        if _log_listener is None:
+            return
+        # stop() дожидается обработки очереди; после него поток запускается заново
+        _log_listener.stop()
+        _log_listener.start()
+
+
+def _stop_log_listener():
+    """Останавливает поток логирования при выходе из интерпретатора"""
+    with _log_listener_lock:
+        if _log_listener is not None:
+            _log_listener.stop()
 
-logging.setLogRecordFactory(enhanced_record_factory)
 
+# Инициализируем логирование
+root_logger = setup_structured_logging()
+atexit.register(_stop_log_listener)
+logger = logging.getLogger(__name__)
 
 # Импортируем SystemState
 from system_state import SystemState
@@ -301,49 +335,57 @@ _analysis_metrics = {
 # Histogram buckets for analysis duration (seconds)
 ANALYSIS_DURATION_BUCKETS = [0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0]
 
-# Prometheus metrics state
+# Prometheus counters: фиксированные смещения в array.array вместо ключей dict
+IDX_ANALYSIS_DURATION_COUNT = 0
+IDX_HEARTBEAT_ENFORCEMENT = 1
+_counters = array.array('q', [0] * 2)
+
+# Счётчики, которые читает /metrics: next() у itertools.count - один вызов C
+# без read-modify-write; последнее выданное значение публикуется в int
+_scheduler_stalls_counter = itertools.count(1)
+_scheduler_stalls_total = 0
+_analysis_cycles_counter = itertools.count(1)
+_analysis_cycles_total = 0
+
+# Histogram: cumulative счётчики по ANALYSIS_DURATION_BUCKETS и сумма длительностей
+_ANALYSIS_DURATION_BOUNDS = tuple(ANALYSIS_DURATION_BUCKETS)
+_hist_buckets = array.array('q', [0] * len(_ANALYSIS_DURATION_BOUNDS))
+_hist_sum = array.array('d', [0.0])
+
+# Prometheus metrics state (метрики со строковыми labels)
 _prometheus_metrics = {
-    # Histogram: analysis duration buckets
-    "analysis_duration_buckets": {bucket: 0 for bucket in ANALYSIS_DURATION_BUCKETS},
-    "analysis_duration_sum": 0.0,  # Sum of all durations
-    "analysis_duration_count": 0,  # Total observations
-    
-    # Counters
-    "scheduler_stalls_total": 0,
-    "analysis_cycles_total": 0,
     # Admin command counters with result labels
     # Structure: {"command": {"result": count}}
-    "admin_commands_total": {
-        "pause": {"success": 0},
-        "resume": {"success": 0, "blocked_safe_mode": 0}
-    }
+    # Counter сам возвращает 0 для новых result - инициализация не нужна
+    "admin_commands_total": defaultdict(Counter, {
+        "pause": Counter({"success": 0}),
+        "resume": Counter({"success": 0, "blocked_safe_mode": 0})
+    })
 }
 
 # Adaptive system state (volatility tracking, recovery cycles)
-_adaptive_system_state = {
-    "volatility_state": "MEDIUM",  # LOW, MEDIUM, HIGH (from market_regime.volatility_level)
-    "adaptive_interval": None,  # Current adaptive interval (None = not initialized)
-    "recovery_cycles": 0,  # Consecutive successful cycles while trading_paused
-}
+# Слотовые dataclass-синглтоны: доступ к полю - чтение слота, без хеширования ключа
+@dataclass(slots=True)
+class AdaptiveSystemState:
+    volatility_state: str = "MEDIUM"  # LOW, MEDIUM, HIGH (from market_regime.volatility_level)
+    adaptive_interval: Optional[float] = None  # Current adaptive interval (None = not initialized)
+    recovery_cycles: int = 0  # Consecutive successful cycles while trading_paused
+
+_adaptive_system_state = AdaptiveSystemState()
 
 # Control plane state (manual pause tracking)
-_control_plane_state = {
-    "manual_pause_active": False,  # True if trading was paused manually (via admin/telegram)
-    # NOTE: admin_commands_total moved to _prometheus_metrics for single source of truth
-}
+# NOTE: admin_commands_total moved to _prometheus_metrics for single source of truth
+@dataclass(slots=True)
+class ControlPlaneState:
+    manual_pause_active: bool = False  # True if trading was paused manually (via admin/telegram)
+
+_control_plane_state = ControlPlaneState()
 
 # ========== CONCURRENCY PROTECTION FOR HTTP HANDLERS ==========
 # Lock to prevent race conditions in HTTP handlers (especially admin commands)
 # REQUIREMENT: Concurrent HTTP requests cannot race-clear safe_mode or resume trading while safe_mode == true
-# Initialized lazily in start_http_server() when event loop is available
-_admin_command_lock = None
-
-def _get_admin_lock():
-    """Returns the admin command lock, initializing it if needed"""
-    global _admin_command_lock
-    if _admin_command_lock is None:
-        _admin_command_lock = asyncio.Lock()
-    return _admin_command_lock
+# Created once in start_http_server(), before any handler can run
+_admin_command_lock: Optional[asyncio.Lock] = None
 
 def get_analysis_metrics():
     """Возвращает текущие метрики анализа для health endpoint"""
@@ -355,8 +397,15 @@ def update_analysis_metrics(metrics_update: dict):
     _analysis_metrics.update(metrics_update)
 
 def get_prometheus_metrics():
-    """Возвращает текущие Prometheus метрики"""
-    return _prometheus_metrics.copy()
+    """Возвращает текущие Prometheus метрики (dict собирается только при запросе)"""
+    metrics = _prometheus_metrics.copy()
+    metrics["analysis_duration_buckets"] = dict(zip(_ANALYSIS_DURATION_BOUNDS, _hist_buckets))
+    metrics["analysis_duration_sum"] = _hist_sum[0]
+    metrics["analysis_duration_count"] = _counters[IDX_ANALYSIS_DURATION_COUNT]
+    metrics["scheduler_stalls_total"] = _scheduler_stalls_total
+    metrics["analysis_cycles_total"] = _analysis_cycles_total
+    metrics["heartbeat_enforcement_total"] = _counters[IDX_HEARTBEAT_ENFORCEMENT]
+    return metrics
 
 def record_analysis_duration(duration: float):
     """
@@ -368,29 +417,33 @@ def record_analysis_duration(duration: float):
     - Each bucket counts all observations <= bucket value
     - Values < smallest bucket are still counted in smallest bucket
     """
-    global _prometheus_metrics
     # Обновляем sum и count
-    _prometheus_metrics["analysis_duration_sum"] += duration
-    _prometheus_metrics["analysis_duration_count"] += 1
+    _hist_sum[0] += duration
+    _counters[IDX_ANALYSIS_DURATION_COUNT] += 1
     
     # Обновляем buckets (cumulative - все bucket'ы >= duration увеличиваются)
-    for bucket in ANALYSIS_DURATION_BUCKETS:
-        if duration <= bucket:
-            _prometheus_metrics["analysis_duration_buckets"][bucket] += 1
+    if duration <= _ANALYSIS_DURATION_BOUNDS[0]:
+        # Типичный здоровый цикл попадает во все buckets - без поиска
+        first = 0
+    else:
+        # bisect_left находит первый bucket с границей >= duration
+        first = bisect.bisect_left(_ANALYSIS_DURATION_BOUNDS, duration, 1)
+    for i in range(first, len(_hist_buckets)):
+        _hist_buckets[i] += 1
 
 def increment_scheduler_stalls():
     """Увеличивает счетчик scheduler stalls (NON-BLOCKING)"""
-    global _prometheus_metrics
-    _prometheus_metrics["scheduler_stalls_total"] += 1
+    global _scheduler_stalls_total
+    _scheduler_stalls_total = next(_scheduler_stalls_counter)
 
 def increment_analysis_cycles():
     """Увеличивает счетчик завершенных циклов анализа (NON-BLOCKING)"""
-    global _prometheus_metrics
-    _prometheus_metrics["analysis_cycles_total"] += 1
+    global _analysis_cycles_total
+    _analysis_cycles_total = next(_analysis_cycles_counter)
 
 def get_adaptive_system_state():
-    """Возвращает текущее состояние адаптивной системы"""
-    return _adaptive_system_state.copy()
+    """Возвращает копию текущего состояния адаптивной системы (dict)"""
+    return asdict(_adaptive_system_state)
 
 def update_volatility_state(volatility_level: str):
     """Обновляет состояние волатильности (NON-BLOCKING)"""
@@ -399,11 +452,11 @@ def update_volatility_state(volatility_level: str):
     if volatility_level in ["LOW", "NORMAL", "MEDIUM", "HIGH", "EXTREME"]:
         # Маппинг: LOW -> LOW, NORMAL/MEDIUM -> MEDIUM, HIGH/EXTREME -> HIGH
         if volatility_level == "LOW":
-            _adaptive_system_state["volatility_state"] = "LOW"
+            _adaptive_system_state.volatility_state = "LOW"
         elif volatility_level in ["NORMAL", "MEDIUM"]:
-            _adaptive_system_state["volatility_state"] = "MEDIUM"
+            _adaptive_system_state.volatility_state = "MEDIUM"
         else:  # HIGH, EXTREME
-            _adaptive_system_state["volatility_state"] = "HIGH"
+            _adaptive_system_state.volatility_state = "HIGH"
 
 def pause_trading_manually():
     """
@@ -414,20 +467,18 @@ def pause_trading_manually():
     """
     global _control_plane_state, _prometheus_metrics, _adaptive_system_state
     
-    if _control_plane_state["manual_pause_active"]:
+    if _control_plane_state.manual_pause_active:
         return False  # Уже приостановлена
     
-    _control_plane_state["manual_pause_active"] = True
+    _control_plane_state.manual_pause_active = True
     
     # HARDENING: Синхронизируем trading_paused через state machine
     state_machine = get_state_machine()
     state_machine.sync_to_system_state(system_state, manual_pause_active=True)
     
     # Обновляем метрику с новой структурой
-    if "success" not in _prometheus_metrics["admin_commands_total"]["pause"]:
-        _prometheus_metrics["admin_commands_total"]["pause"]["success"] = 0
     _prometheus_metrics["admin_commands_total"]["pause"]["success"] += 1
-    _adaptive_system_state["recovery_cycles"] = 0
+    _adaptive_system_state.recovery_cycles = 0
     
     logger.info("Trading paused manually via control plane")
     return True
@@ -449,7 +500,7 @@ def resume_trading_manually():
     if not system_state.system_health.trading_paused:
         return (False, "Trading is already active")
     
-    _control_plane_state["manual_pause_active"] = False
+    _control_plane_state.manual_pause_active = False
     
     # HARDENING: Синхронизируем trading_paused через state machine
     state_machine = get_state_machine()
@@ -457,34 +508,143 @@ def resume_trading_manually():
     
     # Обновляем метрику с новой структурой (result labels)
     # ВАЖНО: Эта функция вызывается только если safe_mode == False (проверка выше)
-    if "success" not in _prometheus_metrics["admin_commands_total"]["resume"]:
-        _prometheus_metrics["admin_commands_total"]["resume"]["success"] = 0
     _prometheus_metrics["admin_commands_total"]["resume"]["success"] += 1
-    _adaptive_system_state["recovery_cycles"] = 0
+    _adaptive_system_state.recovery_cycles = 0
     
     logger.info("Trading resumed manually via control plane")
     return (True, "Trading resumed")
 
 # ========== ALERT ESCALATION SYSTEM ==========
 
-# Alert deduplication: track last sent timestamp per alert type
-_alert_last_sent: dict[str, float] = {}
+class AlertId(IntEnum):
+    """Фиксированный набор алертов: индекс в _alert_last_sent"""
+    ANALYSIS_DURATION_WARN = 0
+    CONSECUTIVE_ERRORS_WARN = 1
+    VOLATILITY_WARN = 2
+    ANALYSIS_DURATION_CRITICAL = 3
+    CONSECUTIVE_ERRORS_CRITICAL = 4
+    SAFE_MODE_CRITICAL = 5
+    SCHEDULER_STALL_CRITICAL = 6
+
+# Alert deduplication: time.monotonic_ns() последней отправки по AlertId
+_alert_last_sent = array.array('q', [0] * len(AlertId))
+_ALERT_COOLDOWN_NS = ALERT_COOLDOWN * 1_000_000_000
+# Порог scheduler stall: HEARTBEAT_MISS_THRESHOLD пропущенных runtime heartbeat
+_SCHEDULER_STALL_THRESHOLD_NS = int(RUNTIME_HEARTBEAT_INTERVAL * HEARTBEAT_MISS_THRESHOLD * 1e9)
+
+def _should_send_alert(alert_id: AlertId, now_ns: int) -> bool:
+    """Проверяет, можно ли отправить алерт (cooldown); now_ns - time.monotonic_ns()"""
+    return (now_ns - _alert_last_sent[alert_id]) >= _ALERT_COOLDOWN_NS
+
+def _mark_alert_sent(alert_id: AlertId, now_ns: int):
+    """Отмечает, что алерт был отправлен"""
+    _alert_last_sent[alert_id] = now_ns
+
+
+@dataclass(slots=True)
+class _AlertContext:
+    """Входные данные одной оценки алертов (читаются один раз)"""
+    duration: float
+    uptime: float
+    analysis_count: int
+    consecutive_errors: int
+    safe_mode: bool
+    volatility: float
+    heartbeat_age_ns: Optional[int]  # None - heartbeat в этом процессе ещё не было
+
+
+def _analysis_duration_warn_text(ctx: _AlertContext) -> Tuple[str, str]:
+    return (
+        f"⚠️ **WARN**: Market analysis slow\n\n"
+        f"Duration: {ctx.duration:.2f}s (limit: {ALERT_ANALYSIS_TIME:.2f}s)\n"
+        f"Uptime: {ctx.uptime:.0f}s\n"
+        f"Analysis runs: {ctx.analysis_count}\n"
+        f"Trading continues normally.",
+        f"WARN alert: Analysis duration {ctx.duration:.2f}s > {ALERT_ANALYSIS_TIME:.2f}s"
+    )
 
-def _get_alert_key(alert_type: str, level: str) -> str:
-    """Генерирует ключ для дедупликации алертов"""
-    return f"{level}:{alert_type}"
+def _consecutive_errors_warn_text(ctx: _AlertContext) -> Tuple[str, str]:
+    return (
+        f"⚠️ **WARN**: Multiple consecutive errors\n\n"
+        f"Consecutive errors: {ctx.consecutive_errors} "
+        f"(threshold: {WARN_ERROR_THRESHOLD})\n"
+        f"Uptime: {ctx.uptime:.0f}s\n"
+        f"Trading continues normally.",
+        f"WARN alert: Consecutive errors {ctx.consecutive_errors} >= {WARN_ERROR_THRESHOLD}"
+    )
 
-def _should_send_alert(alert_key: str) -> bool:
-    """Проверяет, можно ли отправить алерт (cooldown)"""
-    global _alert_last_sent
-    now = time.monotonic()
-    last_sent = _alert_last_sent.get(alert_key, 0.0)
-    return (now - last_sent) >= ALERT_COOLDOWN
+def _volatility_warn_text(ctx: _AlertContext) -> Tuple[str, str]:
+    return (
+        f"⚠️ **WARN**: Market volatility spike\n\n"
+        f"Volatility: {ctx.volatility:.3f} (threshold: {VOLATILITY_THRESHOLD:.3f})\n"
+        f"Uptime: {ctx.uptime:.0f}s\n"
+        f"Trading continues normally.",
+        f"WARN alert: Volatility {ctx.volatility:.3f} > {VOLATILITY_THRESHOLD:.3f}"
+    )
 
-def _mark_alert_sent(alert_key: str):
-    """Отмечает, что алерт был отправлен"""
-    global _alert_last_sent
-    _alert_last_sent[alert_key] = time.monotonic()
+def _analysis_duration_critical_text(ctx: _AlertContext) -> Tuple[str, str]:
+    return (
+        f"🚨 **CRITICAL**: Market analysis exceeded maximum time\n\n"
+        f"Duration: {ctx.duration:.2f}s (max: {MAX_ANALYSIS_TIME:.2f}s)\n"
+        f"Uptime: {ctx.uptime:.0f}s\n"
+        f"Analysis runs: {ctx.analysis_count}\n"
+        f"**Trading paused for safety.**",
+        f"CRITICAL alert: Analysis duration {ctx.duration:.2f}s > {MAX_ANALYSIS_TIME:.2f}s"
+    )
+
+def _consecutive_errors_critical_text(ctx: _AlertContext) -> Tuple[str, str]:
+    return (
+        f"🚨 **CRITICAL**: Critical error threshold exceeded\n\n"
+        f"Consecutive errors: {ctx.consecutive_errors} "
+        f"(threshold: {CRITICAL_ERROR_THRESHOLD})\n"
+        f"Uptime: {ctx.uptime:.0f}s\n"
+        f"**Trading paused for safety.**",
+        f"CRITICAL alert: Consecutive errors {ctx.consecutive_errors} >= {CRITICAL_ERROR_THRESHOLD}"
+    )
+
+def _safe_mode_critical_text(ctx: _AlertContext) -> Tuple[str, str]:
+    return (
+        f"🚨 **CRITICAL**: System entered safe mode\n\n"
+        f"Consecutive errors: {ctx.consecutive_errors}\n"
+        f"Uptime: {ctx.uptime:.0f}s\n"
+        f"**Trading paused for safety.**",
+        "CRITICAL alert: System entered safe_mode"
+    )
+
+def _scheduler_stall_critical_text(ctx: _AlertContext) -> Tuple[str, str]:
+    expected_interval = RUNTIME_HEARTBEAT_INTERVAL
+    time_since_heartbeat = ctx.heartbeat_age_ns / 1e9
+    missed_heartbeats = int((time_since_heartbeat - expected_interval) / expected_interval)
+    return (
+        f"🚨 **CRITICAL**: Scheduler stall detected\n\n"
+        f"Time since last heartbeat: {time_since_heartbeat:.1f}s\n"
+        f"Expected interval: {expected_interval}s\n"
+        f"Missed heartbeats: {missed_heartbeats}\n"
+        f"Uptime: {ctx.uptime:.0f}s\n"
+        f"**Trading paused for safety.**",
+        f"CRITICAL alert: Scheduler stall detected (missed {missed_heartbeats} heartbeats)"
+    )
+
+# Таблица алертов в порядке оценки: (id, level, type, условие, текст, pause_trading).
+# CRITICAL-алерты приостанавливают торговлю.
+# Scheduler stall проверяется по monotonic ns - не зависит от коррекции системных часов.
+_ALERT_RULES = (
+    (AlertId.ANALYSIS_DURATION_WARN, "WARN", "analysis_duration",
+     lambda ctx: ctx.duration > ALERT_ANALYSIS_TIME, _analysis_duration_warn_text, False),
+    (AlertId.CONSECUTIVE_ERRORS_WARN, "WARN", "consecutive_errors",
+     lambda ctx: ctx.consecutive_errors >= WARN_ERROR_THRESHOLD, _consecutive_errors_warn_text, False),
+    (AlertId.VOLATILITY_WARN, "WARN", "volatility",
+     lambda ctx: ctx.volatility > VOLATILITY_THRESHOLD, _volatility_warn_text, False),
+    (AlertId.ANALYSIS_DURATION_CRITICAL, "CRITICAL", "analysis_duration",
+     lambda ctx: ctx.duration > MAX_ANALYSIS_TIME, _analysis_duration_critical_text, True),
+    (AlertId.CONSECUTIVE_ERRORS_CRITICAL, "CRITICAL", "consecutive_errors",
+     lambda ctx: ctx.consecutive_errors >= CRITICAL_ERROR_THRESHOLD, _consecutive_errors_critical_text, True),
+    (AlertId.SAFE_MODE_CRITICAL, "CRITICAL", "safe_mode",
+     lambda ctx: ctx.safe_mode, _safe_mode_critical_text, True),
+    (AlertId.SCHEDULER_STALL_CRITICAL, "CRITICAL", "scheduler_stall",
+     lambda ctx: ctx.heartbeat_age_ns is not None and ctx.heartbeat_age_ns > _SCHEDULER_STALL_THRESHOLD_NS,
+     _scheduler_stall_critical_text, True),
+)
 
 async def evaluate_and_send_alerts(duration: float):
     """
@@ -499,192 +659,217 @@ async def evaluate_and_send_alerts(duration: float):
         # Получаем текущие метрики
         metrics = get_analysis_metrics()
         now = time.monotonic()
+        now_ns = time.monotonic_ns()
+        health = system_state.system_health
         
         # Вычисляем uptime для сообщений
         uptime = 0.0
         if metrics["start_time"] is not None:
             uptime = now - metrics["start_time"]
         
+        last_heartbeat_mono_ns = health.last_heartbeat_mono_ns
+        ctx = _AlertContext(
+            duration=duration,
+            uptime=uptime,
+            analysis_count=metrics.get('analysis_count', 0),
+            consecutive_errors=health.consecutive_errors,
+            safe_mode=health.safe_mode,
+            # TODO: Реализовать отслеживание волатильности
+            volatility=0.0,  # Placeholder
+            heartbeat_age_ns=(now_ns - last_heartbeat_mono_ns) if last_heartbeat_mono_ns else None,
+        )
+        
         alerts_to_send = []
+        for alert_id, level, alert_type, condition, render, pause_trading in _ALERT_RULES:
+            if not condition(ctx) or not _should_send_alert(alert_id, now_ns):
+                continue
+            message, log_line = render(ctx)
+            alert = {"level": level, "type": alert_type, "message": message}
+            if pause_trading:
+                alert["pause_trading"] = True
+            alerts_to_send.append(alert)
+            _mark_alert_sent(alert_id, now_ns)
+            if level == "CRITICAL":
+                logger.error(log_line)
+            else:
+                logger.warning(log_line)
         
-        # ========== WARN ALERTS ==========
-        
-        # WARN: Analysis duration > ALERT_ANALYSIS_TIME
-        if duration > ALERT_ANALYSIS_TIME:
-            alert_key = _get_alert_key("analysis_duration_warn", "WARN")
-            if _should_send_alert(alert_key):
-                alerts_to_send.append({
-                    "level": "WARN",
-                    "type": "analysis_duration",
-                    "message": (
-                        f"⚠️ **WARN**: Market analysis slow\n\n"
-                        f"Duration: {duration:.2f}s (limit: {ALERT_ANALYSIS_TIME:.2f}s)\n"
-                        f"Uptime: {uptime:.0f}s\n"
-                        f"Analysis runs: {metrics.get('analysis_count', 0)}\n"
-                        f"Trading continues normally."
-                    )
-                })
-                _mark_alert_sent(alert_key)
-                logger.warning(f"WARN alert: Analysis duration {duration:.2f}s > {ALERT_ANALYSIS_TIME:.2f}s")
-        
-        # WARN: Consecutive errors >= WARN_ERROR_THRESHOLD
-        if system_state.system_health.consecutive_errors >= WARN_ERROR_THRESHOLD:
-            alert_key = _get_alert_key("consecutive_errors_warn", "WARN")
-            if _should_send_alert(alert_key):
-                alerts_to_send.append({
-                    "level": "WARN",
-                    "type": "consecutive_errors",
-                    "message": (
-                        f"⚠️ **WARN**: Multiple consecutive errors\n\n"
-                        f"Consecutive errors: {system_state.system_health.consecutive_errors} "
-                        f"(threshold: {WARN_ERROR_THRESHOLD})\n"
-                        f"Uptime: {uptime:.0f}s\n"
-                        f"Trading continues normally."
-                    )
-                })
-                _mark_alert_sent(alert_key)
-                logger.warning(f"WARN alert: Consecutive errors {system_state.system_health.consecutive_errors} >= {WARN_ERROR_THRESHOLD}")
-        
-        # WARN: Volatility spike (placeholder - пока не отслеживается)
-        # TODO: Реализовать отслеживание волатильности
-        volatility = 0.0  # Placeholder
-        if volatility > VOLATILITY_THRESHOLD:
-            alert_key = _get_alert_key("volatility_warn", "WARN")
-            if _should_send_alert(alert_key):
-                alerts_to_send.append({
-                    "level": "WARN",
-                    "type": "volatility",
-                    "message": (
-                        f"⚠️ **WARN**: Market volatility spike\n\n"
-                        f"Volatility: {volatility:.3f} (threshold: {VOLATILITY_THRESHOLD:.3f})\n"
-                        f"Uptime: {uptime:.0f}s\n"
-                        f"Trading continues normally."
-                    )
-                })
-                _mark_alert_sent(alert_key)
-                logger.warning(f"WARN alert: Volatility {volatility:.3f} > {VOLATILITY_THRESHOLD:.3f}")
-        
-        # ========== CRITICAL ALERTS ==========
-        
-        # CRITICAL: Analysis duration > MAX_ANALYSIS_TIME
-        if duration > MAX_ANALYSIS_TIME:
-            alert_key = _get_alert_key("analysis_duration_critical", "CRITICAL")
-            if _should_send_alert(alert_key):
-                alerts_to_send.append({
-                    "level": "CRITICAL",
-                    "type": "analysis_duration",
-                    "message": (
-                        f"🚨 **CRITICAL**: Market analysis exceeded maximum time\n\n"
-                        f"Duration: {duration:.2f}s (max: {MAX_ANALYSIS_TIME:.2f}s)\n"
-                        f"Uptime: {uptime:.0f}s\n"
-                        f"Analysis runs: {metrics.get('analysis_count', 0)}\n"
-                        f"**Trading paused for safety.**"
-                    ),
-                    "pause_trading": True
-                })
-                _mark_alert_sent(alert_key)
-                logger.error(f"CRITICAL alert: Analysis duration {duration:.2f}s > {MAX_ANALYSIS_TIME:.2f}s")
-        
-        # CRITICAL: Consecutive errors >= CRITICAL_ERROR_THRESHOLD
-        if system_state.system_health.consecutive_errors >= CRITICAL_ERROR_THRESHOLD:
-            alert_key = _get_alert_key("consecutive_errors_critical", "CRITICAL")
-            if _should_send_alert(alert_key):
-                alerts_to_send.append({
-                    "level": "CRITICAL",
-                    "type": "consecutive_errors",
-                    "message": (
-                        f"🚨 **CRITICAL**: Critical error threshold exceeded\n\n"
-                        f"Consecutive errors: {system_state.system_health.consecutive_errors} "
-                        f"(threshold: {CRITICAL_ERROR_THRESHOLD})\n"
-                        f"Uptime: {uptime:.0f}s\n"
-                        f"**Trading paused for safety.**"
-                    ),
-                    "pause_trading": True
-                })
-                _mark_alert_sent(alert_key)
-                logger.error(f"CRITICAL alert: Consecutive errors {system_state.system_health.consecutive_errors} >= {CRITICAL_ERROR_THRESHOLD}")
-        
-        # CRITICAL: System entered safe_mode
-        if system_state.system_health.safe_mode:
-            alert_key = _get_alert_key("safe_mode", "CRITICAL")
-            if _should_send_alert(alert_key):
-                alerts_to_send.append({
-                    "level": "CRITICAL",
-                    "type": "safe_mode",
-                    "message": (
-                        f"🚨 **CRITICAL**: System entered safe mode\n\n"
-                        f"Consecutive errors: {system_state.system_health.consecutive_errors}\n"
-                        f"Uptime: {uptime:.0f}s\n"
-                        f"**Trading paused for safety.**"
-                    ),
-                    "pause_trading": True
-                })
-                _mark_alert_sent(alert_key)
-                logger.error(f"CRITICAL alert: System entered safe_mode")
-        
-        # CRITICAL: Scheduler stall detected (via heartbeat miss)
-        # Проверяем через последний heartbeat
-        if system_state.system_health.last_heartbeat:
-            time_since_heartbeat = (datetime.now(UTC) - system_state.system_health.last_heartbeat).total_seconds()
-            expected_interval = RUNTIME_HEARTBEAT_INTERVAL
-            if time_since_heartbeat > expected_interval * HEARTBEAT_MISS_THRESHOLD:
-                alert_key = _get_alert_key("scheduler_stall", "CRITICAL")
-                if _should_send_alert(alert_key):
-                    missed_heartbeats = int((time_since_heartbeat - expected_interval) / expected_interval)
-                    alerts_to_send.append({
-                        "level": "CRITICAL",
-                        "type": "scheduler_stall",
-                        "message": (
-                            f"🚨 **CRITICAL**: Scheduler stall detected\n\n"
-                            f"Time since last heartbeat: {time_since_heartbeat:.1f}s\n"
-                            f"Expected interval: {expected_interval}s\n"
-                            f"Missed heartbeats: {missed_heartbeats}\n"
-                            f"Uptime: {uptime:.0f}s\n"
-                            f"**Trading paused for safety.**"
-                        ),
-                        "pause_trading": True
-                    })
-                    _mark_alert_sent(alert_key)
-                    logger.error(f"CRITICAL alert: Scheduler stall detected (missed {missed_heartbeats} heartbeats)")
-        
-        # Отправляем все алерты (неблокирующе)
+        # Отправку выполняет telegram_alert_worker: здесь только очередь
         for alert in alerts_to_send:
             try:
-                # Отправляем через Telegram (неблокирующе)
-                await asyncio.wait_for(
-                    asyncio.to_thread(send_message, alert["message"]),
-                    timeout=10.0
-                )
-                logger.info(f"Alert sent: {alert['level']} - {alert['type']}")
-                
-                # HARDENING: CRITICAL alerts: приостанавливаем торговлю через manual pause
-                if alert.get("pause_trading") and alert["level"] == "CRITICAL":
-                    _control_plane_state["manual_pause_active"] = True
-                    state_machine = get_state_machine()
-                    state_machine.sync_to_system_state(system_state, manual_pause_active=True)
-                    logger.error(f"Trading paused due to CRITICAL alert: {alert['type']}")
-                    
-            except asyncio.TimeoutError:
-                logger.warning(f"Timeout sending alert: {alert['level']} - {alert['type']}")
-            except Exception as e:
-                logger.warning(f"Error sending alert {alert['level']} - {alert['type']}: {type(e).__name__}: {e}")
+                _telegram_alert_queue.put_nowait(alert)
+            except asyncio.QueueFull:
+                logger.warning(f"Alert queue full, dropping alert: {alert['level']} - {alert['type']}")
                 
     except Exception as e:
         # Не блокируем analysis loop при ошибках в алертах
         logger.warning(f"Error in alert evaluation: {type(e).__name__}: {e}")
 
+# ========== TELEGRAM ALERT WORKER ==========
+# Алерты отправляет одна долгоживущая задача; очередь ограничена, чтобы при
+# недоступном Telegram не копить отправки без предела
+TELEGRAM_ALERT_QUEUE_SIZE = 128
+TELEGRAM_ALERT_DRAIN_TIMEOUT = 5.0  # секунд на дописывание очереди при shutdown
+_telegram_alert_queue: asyncio.Queue = asyncio.Queue(maxsize=TELEGRAM_ALERT_QUEUE_SIZE)
+
+def _on_alert_sent(alert: dict):
+    """Действия после успешной отправки алерта"""
+    logger.info(f"Alert sent: {alert['level']} - {alert['type']}")
+    
+    # HARDENING: CRITICAL alerts: приостанавливаем торговлю через manual pause
+    if alert.get("pause_trading") and alert["level"] == "CRITICAL":
+        _control_plane_state.manual_pause_active = True
+        state_machine = get_state_machine()
+        state_machine.sync_to_system_state(system_state, manual_pause_active=True)
+        logger.error(f"Trading paused due to CRITICAL alert: {alert['type']}")
+
+async def telegram_alert_worker():
+    """
+    Отправляет алерты из _telegram_alert_queue в Telegram.
+    
+    Все алерты, накопившиеся в очереди, отправляются параллельно (общее
+    время - самая долгая отправка), каждый со своим таймаутом 10s.
+    """
+    while True:
+        batch = [await _telegram_alert_queue.get()]
+        while not _telegram_alert_queue.empty():
+            batch.append(_telegram_alert_queue.get_nowait())
+        try:
+            results = await asyncio.gather(
+                *(
+                    asyncio.wait_for(asyncio.to_thread(send_message, alert["message"]), timeout=10.0)
+                    for alert in batch
+                ),
+                return_exceptions=True
+            )
+            for alert, result in zip(batch, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    logger.warning(f"Timeout sending alert: {alert['level']} - {alert['type']}")
+                    continue
+                if isinstance(result, BaseException):
+                    logger.warning(f"Error sending alert {alert['level']} - {alert['type']}: {type(result).__name__}: {result}")
+                    continue
+                try:
+                    _on_alert_sent(alert)
+                except Exception as e:
+                    logger.warning(f"Error sending alert {alert['level']} - {alert['type']}: {type(e).__name__}: {e}")
+        finally:
+            for _ in batch:
+                _telegram_alert_queue.task_done()
+
 # ========== SINGLE-INSTANCE PROTECTION ==========
 
+# Дескриптор PID file, на котором удерживается flock все время работы процесса
+_pid_file_fd: Optional[int] = None
+
+# Попыток заблокировать PID file, если его заменили между open() и flock()
+PID_LOCK_ATTEMPTS = 3
+
+
+def _read_proc_comm(pid) -> Optional[str]:
+    """Имя исполняемого файла процесса из /proc (Linux), None если недоступно"""
+    try:
+        with open(f"/proc/{pid}/comm", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _is_instance_alive(pid: int) -> bool:
+    """
+    Проверяет, что процесс pid жив и это, вероятно, наш бот.
+    
+    На Linux сравнивает /proc/<pid>/comm с собственным: если PID после
+    перезагрузки занят другой программой, PID file считается устаревшим.
+    """
+    if pid == os.getpid():
+        # PID file от прошлого запуска с тем же PID (например, PID 1 в контейнере)
+        return False
+    try:
+        os.kill(pid, 0)  # Signal 0 = проверка существования
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Процесс есть, но принадлежит другому пользователю
+        pass
+    if sys.platform.startswith("linux"):
+        comm = _read_proc_comm(pid)
+        own_comm = _read_proc_comm("self")
+        if comm is not None and own_comm is not None and comm != own_comm:
+            return False
+    return True
+
+
 def check_single_instance() -> bool:
     """
     Проверяет, что только один экземпляр процесса может работать.
     Использует PID file с файловой блокировкой.
     
+    На Unix PID file блокируется через fcntl.flock(LOCK_EX | LOCK_NB) и
+    остаётся заблокированным до выхода процесса: два одновременных запуска
+    не могут оба увидеть устаревший файл и оба стартовать.
+    
     Returns:
         bool: True если можно запускаться, False если уже запущен другой экземпляр
     """
+    global _pid_file_fd
     pid_path = Path(PID_FILE)
     
+    if HAS_FCNTL:
+        for _ in range(PID_LOCK_ATTEMPTS):
+            try:
+                fd = os.open(pid_path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError as e:
+                logger.error(f"Failed to open PID file: {e}")
+                return False
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                logger.warning(f"Another instance holds the PID file lock ({PID_FILE}). Exiting.")
+                return False
+            except OSError as e:
+                os.close(fd)
+                logger.error(f"Failed to lock PID file: {e}")
+                return False
+            
+            # Блокировка действует, только если по пути PID_FILE всё ещё наш inode:
+            # файл могли удалить/заменить между open() и flock()
+            try:
+                path_stat = os.stat(pid_path)
+            except FileNotFoundError:
+                path_stat = None
+            fd_stat = os.fstat(fd)
+            if path_stat is not None and (path_stat.st_dev, path_stat.st_ino) == (fd_stat.st_dev, fd_stat.st_ino):
+                break
+            os.close(fd)
+        else:
+            logger.error(f"PID file {PID_FILE} keeps being replaced while locking. Exiting.")
+            return False
+        
+        # Блокировка наша. Содержимое проверяем на случай экземпляра,
+        # запущенного без flock
+        try:
+            old_pid = int(os.read(fd, 32).strip() or 0)
+        except ValueError:
+            old_pid = 0
+        if old_pid and _is_instance_alive(old_pid):
+            os.close(fd)
+            logger.warning(f"Another instance is running (PID: {old_pid}). Exiting.")
+            return False
+        
+        try:
+            os.ftruncate(fd, 0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, str(os.getpid()).encode())
+        except OSError as e:
+            os.close(fd)
+            logger.error(f"Failed to create PID file: {e}")
+            return False
+        _pid_file_fd = fd
+        logger.info(f"PID file created: {PID_FILE} (PID: {os.getpid()})")
+        return True
+    
     # Проверяем существующий PID file
     if pid_path.exists():
         try:
@@ -693,15 +878,13 @@ def check_single_instance() -> bool:
                 old_pid = int(f.read().strip())
             
             # Проверяем, жив ли процесс
-            try:
-                os.kill(old_pid, 0)  # Signal 0 = проверка существования
+            if _is_instance_alive(old_pid):
                 # Процесс жив - другой экземпляр работает
                 logger.warning(f"Another instance is running (PID: {old_pid}). Exiting.")
                 return False
-            except ProcessLookupError:
-                # Процесс не существует - старый PID file
-                logger.info(f"Removing stale PID file (PID: {old_pid} no longer exists)")
-                pid_path.unlink()
+            # Процесс не существует - старый PID file
+            logger.info(f"Removing stale PID file (PID: {old_pid} no longer exists)")
+            pid_path.unlink()
         except (ValueError, IOError) as e:
             logger.warning(f"Error reading PID file: {e}. Removing it.")
             try:
@@ -720,8 +903,28 @@ def check_single_instance() -> bool:
         return False
 
 def cleanup_pid_file():
-    """Удаляет PID file при завершении"""
+    """
+    Очищает PID file при завершении (только если он принадлежит этому процессу).
+    
+    С flock файл не удаляется, а обнуляется: после unlink() новый экземпляр
+    мог бы заблокировать новый inode по тому же пути, пока другой ждёт
+    блокировку старого, и оба бы стартовали.
+    """
+    global _pid_file_fd
     pid_path = Path(PID_FILE)
+    if HAS_FCNTL:
+        if _pid_file_fd is None:
+            # Блокировку мы не получали - файл принадлежит другому экземпляру
+            return
+        try:
+            os.ftruncate(_pid_file_fd, 0)
+            logger.info("PID file cleared")
+        except OSError as e:
+            logger.warning(f"Failed to clear PID file: {e}")
+        # Закрытие дескриптора снимает flock
+        os.close(_pid_file_fd)
+        _pid_file_fd = None
+        return
     if pid_path.exists():
         try:
             pid_path.unlink()
@@ -732,7 +935,7 @@ def cleanup_pid_file():
 # ========== THREAD-SAFE HEARTBEAT ACCESS ==========
 def get_last_heartbeat_timestamp() -> Optional[float]:
     """
-    Thread-safe чтение last_heartbeat timestamp.
+    Thread-safe чтение last_heartbeat timestamp (без lock).
     
     Используется ThreadWatchdog для проверки состояния event loop
     из отдельного потока (вне asyncio).
@@ -740,11 +943,8 @@ def get_last_heartbeat_timestamp() -> Optional[float]:
     Returns:
         Optional[float]: Unix timestamp последнего heartbeat или None
     """
-    global _heartbeat_lock
-    with _heartbeat_lock:
-        if system_state.system_health.last_heartbeat:
-            return system_state.system_health.last_heartbeat.timestamp()
-        return None
+    ts = _last_heartbeat_ts
+    return ts if ts else None
 
 
 def update_heartbeat_thread_safe():
@@ -754,9 +954,9 @@ def update_heartbeat_thread_safe():
     Вызывается из asyncio heartbeat loop для обновления timestamp,
     который читается ThreadWatchdog.
     """
-    global _heartbeat_lock
-    with _heartbeat_lock:
-        system_state.update_heartbeat()
+    global _last_heartbeat_ts
+    system_state.update_heartbeat()
+    _last_heartbeat_ts = time.time()
 
 
 # ========== THREAD-BASED WATCHDOG ==========
@@ -806,8 +1006,6 @@ class ThreadWatchdog:
         self.heartbeat_timeout = heartbeat_timeout
         self.thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
-        self.triggered = False  # Idempotent: предотвращает повторные срабатывания
-        self.trigger_lock = threading.Lock()
         
         # HARDENING: Явный lifecycle state
         self.lifecycle_state = ThreadWatchdogState.INIT
@@ -831,7 +1029,6 @@ class ThreadWatchdog:
                 return
         
         self.stop_event.clear()
-        self.triggered = False
         self.first_heartbeat_received = False
         self.event_loop_set = False
         
@@ -875,6 +1072,19 @@ class ThreadWatchdog:
                         f"event_loop_set={self.event_loop_set}"
                     )
     
+    def _try_transition(self, expected: ThreadWatchdogState, new: ThreadWatchdogState) -> bool:
+        """
+        HARDENING: CAS для lifecycle state под lifecycle_lock.
+        
+        Returns:
+            True если состояние было expected и стало new
+        """
+        with self.lifecycle_lock:
+            if self.lifecycle_state != expected:
+                return False
+            self.lifecycle_state = new
+            return True
+    
     def stop(self, timeout: float = 5.0):
         """
         HARDENING: Останавливает watchdog.
@@ -911,54 +1121,63 @@ class ThreadWatchdog:
         
         Lifecycle: INIT → ARMED → TRIGGERED → STOPPED
         """
-        while not self.stop_event.is_set():
-            try:
-                # Проверяем каждые N секунд
-                if self.stop_event.wait(THREAD_WATCHDOG_INTERVAL):
-                    # stop_event установлен - выходим
-                    break
-                
-                # HARDENING: Проверяем состояние через state machine (thread-safe чтение)
-                # Если уже в FATAL, watchdog ОБЯЗАН остановиться
-                if self.state_machine.should_exit_fatal():
-                    logger.info("THREAD_WATCHDOG: System in FATAL state, exiting (invariant: no work after FATAL)")
-                    with self.lifecycle_lock:
-                        self.lifecycle_state = ThreadWatchdogState.STOPPED
-                    break
-                
-                # HARDENING: SAFE_MODE TTL - DUPLICATE ENFORCEMENT В THREAD
-                # Дублируем TTL-логику: если now - entered_at > SAFE_MODE_TTL → os._exit
-                # НЕ ждём asyncio, TTL не должен зависеть от event loop
-                current_state = self.state_machine.state
-                if current_state == SystemStateEnum.SAFE_MODE:
-                    safe_mode_entered_at = self.state_machine.get_safe_mode_entered_at()
-                    safe_mode_ttl = self.state_machine.get_safe_mode_ttl()
-                    
-                    if safe_mode_entered_at is not None:
-                        duration = (datetime.now(UTC) - safe_mode_entered_at).total_seconds()
-                        
-                        if duration >= safe_mode_ttl:
-                            logger.critical(
-                                f"THREAD_WATCHDOG: SAFE_MODE TTL expired - "
-                                f"duration={duration:.1f}s >= ttl={safe_mode_ttl}s, "
-                                f"calling os._exit({FATAL_EXIT_CODE}) "
-                                f"(invariant: SAFE_MODE TTL ⇒ exit even if asyncio stalled)"
-                            )
-                            # КРИТИЧНО: os._exit напрямую, не через asyncio
-                            os._exit(FATAL_EXIT_CODE)
-                
-                # HARDENING: Проверяем lifecycle state
-                with self.lifecycle_lock:
-                    if self.lifecycle_state == ThreadWatchdogState.STOPPED:
-                        break
-                    if self.lifecycle_state == ThreadWatchdogState.TRIGGERED:
-                        # Уже сработал - только мониторим FATAL
-                        continue
+        # Локальные ссылки: цикл работает всё время жизни процесса
+        wait = self.stop_event.wait
+        get_snapshot = self.state_machine.get_state_snapshot
+        get_hb = get_last_heartbeat_timestamp
+        lifecycle_lock = self.lifecycle_lock
+        now = time.time
+        _monotonic = time.monotonic
+        interval = THREAD_WATCHDOG_INTERVAL
+        heartbeat_timeout = self.heartbeat_timeout
+        STATE_FATAL = SystemStateEnum.FATAL
+        STATE_SAFE_MODE = SystemStateEnum.SAFE_MODE
+        ARMED = ThreadWatchdogState.ARMED
+        TRIGGERED = ThreadWatchdogState.TRIGGERED
+        STOPPED = ThreadWatchdogState.STOPPED
+        
+        # Проверяем каждые N секунд; wait() == True - stop_event установлен, выходим
+        while not wait(interval):
+            # HARDENING: Один снимок состояния state machine на тик (thread-safe чтение)
+            current_state, safe_mode_entered_mono, safe_mode_ttl = get_snapshot()
+            
+            # Если уже в FATAL, watchdog ОБЯЗАН остановиться
+            if current_state == STATE_FATAL:
+                logger.info("THREAD_WATCHDOG: System in FATAL state, exiting (invariant: no work after FATAL)")
+                with lifecycle_lock:
+                    self.lifecycle_state = STOPPED
+                break
+            
+            # HARDENING: SAFE_MODE TTL - DUPLICATE ENFORCEMENT В THREAD
+            # Дублируем TTL-логику: если now - entered_at > SAFE_MODE_TTL → os._exit
+            # НЕ ждём asyncio, TTL не должен зависеть от event loop
+            if current_state == STATE_SAFE_MODE and safe_mode_entered_mono is not None:
+                duration = _monotonic() - safe_mode_entered_mono
                 
+                if duration >= safe_mode_ttl:
+                    logger.critical(
+                        f"THREAD_WATCHDOG: SAFE_MODE TTL expired - "
+                        f"duration={duration:.1f}s >= ttl={safe_mode_ttl}s, "
+                        f"calling os._exit({FATAL_EXIT_CODE}) "
+                        f"(invariant: SAFE_MODE TTL ⇒ exit even if asyncio stalled)"
+                    )
+                    try:
+                        flush_logs()
+                    finally:
+                        # КРИТИЧНО: os._exit напрямую, не через asyncio
+                        os._exit(FATAL_EXIT_CODE)
+            
+            # HARDENING: Проверяем lifecycle state
+            lifecycle_state = self.lifecycle_state
+            if lifecycle_state == STOPPED:
+                break
+            if lifecycle_state == TRIGGERED:
+                # Уже сработал - только мониторим FATAL
+                continue
+            
+            try:
                 # Thread-safe чтение last_heartbeat timestamp
-                last_heartbeat_ts = get_last_heartbeat_timestamp()
-                current_time = time.time()
-                
+                last_heartbeat_ts = get_hb()
                 if last_heartbeat_ts is None:
                     # Heartbeat ещё не был обновлён - пропускаем проверку
                     continue
@@ -969,21 +1188,20 @@ class ThreadWatchdog:
                     self.arm()  # Попытка перехода в ARMED
                 
                 # HARDENING: Проверяем, что мы в ARMED состоянии перед детектированием
-                with self.lifecycle_lock:
-                    if self.lifecycle_state != ThreadWatchdogState.ARMED:
-                        # Ещё не готов - пропускаем проверку
-                        continue
+                if self.lifecycle_state != ARMED:
+                    # Ещё не готов - пропускаем проверку
+                    continue
                 
-                time_since_heartbeat = current_time - last_heartbeat_ts
+                time_since_heartbeat = now() - last_heartbeat_ts
                 
                 # Проверяем timeout
-                if time_since_heartbeat > self.heartbeat_timeout:
+                if time_since_heartbeat > heartbeat_timeout:
                     # HARDENING: LOOP_STALL DETECTED
                     # Отправляем событие в state machine, НЕ мутируем состояние напрямую
-                    self._trigger_loop_stall(time_since_heartbeat, last_heartbeat_ts)
-                
+                    self._trigger_loop_stall(time_since_heartbeat, last_heartbeat_ts, current_state)
+            
             except Exception as e:
-                # Критическая ошибка в watchdog - логируем, но продолжаем
+                # Ошибка при проверке heartbeat / отправке события - логируем, но продолжаем
                 logger.error(
                     f"THREAD_WATCHDOG_ERROR: {type(e).__name__}: {e}",
                     exc_info=True
@@ -993,7 +1211,8 @@ class ThreadWatchdog:
         
         logger.info("ThreadWatchdog loop exited")
     
-    def _trigger_loop_stall(self, time_since_heartbeat: float, last_heartbeat_ts: float):
+    def _trigger_loop_stall(self, time_since_heartbeat: float, last_heartbeat_ts: float,
+                            current_state: Optional[SystemStateEnum] = None):
         """
         HARDENING: Триггерит LOOP_STALL через state machine.
         
@@ -1003,28 +1222,18 @@ class ThreadWatchdog:
         Thread-safe, idempotent (не срабатывает повторно).
         Lifecycle: ARMED → TRIGGERED
         """
-        with self.trigger_lock:
-            # HARDENING: Проверяем lifecycle state для idempotency
-            with self.lifecycle_lock:
-                if self.lifecycle_state == ThreadWatchdogState.TRIGGERED:
-                    # Уже сработал - idempotent
-                    return
-                if self.lifecycle_state != ThreadWatchdogState.ARMED:
-                    logger.warning(
-                        f"THREAD_WATCHDOG: Cannot trigger in state {self.lifecycle_state.value}, "
-                        f"must be ARMED"
-                    )
-                    return
-                
-                self.lifecycle_state = ThreadWatchdogState.TRIGGERED
-            
-            if self.triggered:
-                # Дополнительная проверка для thread-safety
-                return
-            
-            self.triggered = True
+        # HARDENING: Idempotency - ARMED → TRIGGERED выигрывает только один вызов
+        if not self._try_transition(ThreadWatchdogState.ARMED, ThreadWatchdogState.TRIGGERED):
+            lifecycle_state = self.lifecycle_state
+            if lifecycle_state != ThreadWatchdogState.TRIGGERED:
+                logger.warning(
+                    f"THREAD_WATCHDOG: Cannot trigger in state {lifecycle_state.value}, "
+                    f"must be ARMED"
+                )
+            return
         
         # Генерируем incident_id
+        import uuid
         incident_id = f"thread-watchdog-{uuid.uuid4().hex[:8]}"
         
         logger.critical(
@@ -1035,9 +1244,11 @@ class ThreadWatchdog:
             f"incident_id={incident_id}"
         )
         
-        # HARDENING: Проверяем состояние через state machine (thread-safe чтение)
+        # HARDENING: current_state - снимок state machine из текущего тика _watchdog_loop
+        # (без снимка читаем state напрямую, thread-safe чтение)
         # Если уже в SAFE_MODE или FATAL, не отправляем событие повторно
-        current_state = self.state_machine.state
+        if current_state is None:
+            current_state = self.state_machine.state
         if current_state == SystemStateEnum.SAFE_MODE:
             # HARDENING: TTL проверяется в state machine, не здесь
             logger.debug("THREAD_WATCHDOG: Already in SAFE_MODE, TTL check handled by state machine")
@@ -1158,35 +1369,27 @@ class FatalReaper:
         """
         logger.critical("FATAL_REAPER: Loop started")
         
-        while not self.stop_event.is_set():
-            try:
-                # Проверяем каждые N секунд
-                if self.stop_event.wait(self.check_interval):
-                    # stop_event установлен - выходим
-                    break
-                
-                # HARDENING: Thread-safe чтение состояния
-                current_state = self.state_machine.state
-                
-                if current_state == SystemStateEnum.FATAL:
-                    logger.critical(
-                        f"FATAL_REAPER: FATAL state detected - "
-                        f"calling os._exit({FATAL_EXIT_CODE}) "
-                        f"(invariant: FATAL ⇒ process MUST exit)"
-                    )
-                    # КРИТИЧНО: os._exit, не sys.exit
-                    # os._exit убивает процесс немедленно, не вызывая cleanup
-                    # Это гарантирует выход даже если asyncio мёртв
-                    os._exit(FATAL_EXIT_CODE)
-                
-            except Exception as e:
-                # Критическая ошибка в reaper - логируем, но продолжаем
-                logger.error(
-                    f"FATAL_REAPER_ERROR: {type(e).__name__}: {e}",
-                    exc_info=True
+        wait = self.stop_event.wait
+        state_machine = self.state_machine
+        interval = self.check_interval
+        STATE_FATAL = SystemStateEnum.FATAL
+        
+        # Проверяем каждые N секунд; wait() == True - stop_event установлен, выходим
+        while not wait(interval):
+            # HARDENING: Thread-safe чтение состояния
+            if state_machine.state == STATE_FATAL:
+                logger.critical(
+                    f"FATAL_REAPER: FATAL state detected - "
+                    f"calling os._exit({FATAL_EXIT_CODE}) "
+                    f"(invariant: FATAL ⇒ process MUST exit)"
                 )
-                # Небольшая задержка перед следующей проверкой
-                time.sleep(1.0)
+                # КРИТИЧНО: os._exit, не sys.exit
+                # os._exit убивает процесс немедленно, не вызывая cleanup
+                # Это гарантирует выход даже если asyncio мёртв
+                try:
+                    flush_logs()
+                finally:
+                    os._exit(FATAL_EXIT_CODE)
         
         logger.info("FATAL_REAPER: Loop exited")
 
@@ -1558,6 +1761,12 @@ async def run_market_analysis():
         
         # Инициализация экосистемы
         logger.info("🧠 Инициализация экосистемы...")
+        from core.decision_core import get_decision_core
+        from brains.market_regime_brain import get_market_regime_brain
+        from brains.risk_exposure_brain import get_risk_exposure_brain
+        from brains.cognitive_filter import get_cognitive_filter
+        from brains.opportunity_awareness import get_opportunity_awareness
+        from execution.gatekeeper import get_gatekeeper
         decision_core = get_decision_core()
         market_regime_brain = get_market_regime_brain()
         risk_exposure_brain = get_risk_exposure_brain()
@@ -1785,6 +1994,7 @@ async def run_market_analysis():
             # Продолжаем выполнение - не возвращаем False, чтобы цикл продолжался
         except Exception as e:
             logger.error(f"⚠️ Ошибка при генерации сигналов: {type(e).__name__}: {e}")
+            import traceback
             logger.error(traceback.format_exc())
         
         # Check budget and yield after signal generation (shutdown-aware)
@@ -1874,6 +2084,7 @@ async def run_market_analysis():
         
     except Exception as e:
         error_msg = f"Критическая ошибка в цикле анализа: {type(e).__name__}: {e}"
+        import traceback
         error_trace = traceback.format_exc()
         
         # Определяем, является ли это fault injection
@@ -1961,8 +2172,8 @@ async def market_analysis_loop():
     }
     
     # Инициализируем адаптивный интервал
-    if _adaptive_system_state["adaptive_interval"] is None:
-        _adaptive_system_state["adaptive_interval"] = float(ANALYSIS_INTERVAL)
+    if _adaptive_system_state.adaptive_interval is None:
+        _adaptive_system_state.adaptive_interval = float(ANALYSIS_INTERVAL)
     
     # ========== МЕТРИКИ ==========
     metrics = {
@@ -2020,7 +2231,7 @@ async def market_analysis_loop():
             # 1. Адаптивный интервал анализа (на основе волатильности и ошибок)
             if ADAPTIVE_INTERVAL_ENABLED:
                 # Базовый интервал из глобального состояния
-                base_interval = _adaptive_system_state["adaptive_interval"]
+                base_interval = _adaptive_system_state.adaptive_interval
                 
                 # Корректировка на основе волатильности
                 volatility_multiplier = 1.0
@@ -2058,7 +2269,7 @@ async def market_analysis_loop():
                             logger.info(f"📈 Adaptive base interval increased: {old_base:.0f}s → {base_interval:.0f}s (errors: {consecutive_errors})")
                 
                 # Обновляем базовый интервал в глобальном состоянии
-                _adaptive_system_state["adaptive_interval"] = base_interval
+                _adaptive_system_state.adaptive_interval = base_interval
                 
                 # Пересчитываем интервал с учетом волатильности (после обновления base_interval)
                 volatility_adjusted_interval = base_interval * volatility_multiplier
@@ -2085,7 +2296,7 @@ async def market_analysis_loop():
             
             # 2. Auto-resume trading (на основе последовательных успешных циклов)
             # ВАЖНО: Manual pause переопределяет auto-resume
-            manual_pause = _control_plane_state.get("manual_pause_active", False)
+            manual_pause = _control_plane_state.manual_pause_active
             
             if AUTO_RESUME_TRADING_ENABLED:
                 if system_state.system_health.trading_paused:
@@ -2093,14 +2304,14 @@ async def market_analysis_loop():
                     if manual_pause:
                         # Manual pause активна - не пытаемся auto-resume
                         # Сбрасываем recovery cycles, чтобы не накапливать их
-                        if _adaptive_system_state["recovery_cycles"] > 0:
-                            _adaptive_system_state["recovery_cycles"] = 0
+                        if _adaptive_system_state.recovery_cycles > 0:
+                            _adaptive_system_state.recovery_cycles = 0
                     elif success and consecutive_errors == 0:
                         # Успешный цикл - увеличиваем счетчик восстановления (только если не manual pause)
-                        _adaptive_system_state["recovery_cycles"] += 1
-                        remaining = AUTO_RESUME_SUCCESS_CYCLES - _adaptive_system_state["recovery_cycles"]
+                        _adaptive_system_state.recovery_cycles += 1
+                        remaining = AUTO_RESUME_SUCCESS_CYCLES - _adaptive_system_state.recovery_cycles
                         if remaining > 0:
-                            logger.debug(f"🔄 Recovery progress: {_adaptive_system_state['recovery_cycles']}/{AUTO_RESUME_SUCCESS_CYCLES} successful cycles (remaining: {remaining})")
+                            logger.debug(f"🔄 Recovery progress: {_adaptive_system_state.recovery_cycles}/{AUTO_RESUME_SUCCESS_CYCLES} successful cycles (remaining: {remaining})")
                         else:
                             # Достаточно успешных циклов - возобновляем торговлю
                             # HARDENING: safe_mode MUST ONLY be cleared by successful recovery cycles через state machine
@@ -2115,8 +2326,8 @@ async def market_analysis_loop():
                             
                             # HARDENING: trading_paused управляется state machine (derived property)
                             # После выхода из SAFE_MODE trading_paused автоматически False
-                            state_machine.sync_to_system_state(system_state, manual_pause_active=_control_plane_state.get("manual_pause_active", False))
-                            _adaptive_system_state["recovery_cycles"] = 0
+                            state_machine.sync_to_system_state(system_state, manual_pause_active=_control_plane_state.manual_pause_active)
+                            _adaptive_system_state.recovery_cycles = 0
                             logger.info(f"🔄 Trading auto-resumed after {AUTO_RESUME_SUCCESS_CYCLES} successful cycles")
                             # Отправляем уведомление
                             try:
@@ -2128,22 +2339,22 @@ async def market_analysis_loop():
                                 pass
                     else:
                         # Ошибка или неуспешный цикл - сбрасываем счетчик
-                        if _adaptive_system_state["recovery_cycles"] > 0:
-                            logger.debug(f"🔄 Recovery reset: error detected (was {_adaptive_system_state['recovery_cycles']}/{AUTO_RESUME_SUCCESS_CYCLES})")
-                        _adaptive_system_state["recovery_cycles"] = 0
+                        if _adaptive_system_state.recovery_cycles > 0:
+                            logger.debug(f"🔄 Recovery reset: error detected (was {_adaptive_system_state.recovery_cycles}/{AUTO_RESUME_SUCCESS_CYCLES})")
+                        _adaptive_system_state.recovery_cycles = 0
                 else:
                     # Торговля активна - сбрасываем счетчик восстановления
-                    if _adaptive_system_state["recovery_cycles"] > 0:
-                        _adaptive_system_state["recovery_cycles"] = 0
+                    if _adaptive_system_state.recovery_cycles > 0:
+                        _adaptive_system_state.recovery_cycles = 0
                     # Если manual pause была активна, но торговля активна - снимаем флаг
                     if manual_pause:
-                        _control_plane_state["manual_pause_active"] = False
+                        _control_plane_state.manual_pause_active = False
                 
                 # Сбрасываем счетчик при входе в safe_mode
                 if system_state.system_health.safe_mode:
-                    if _adaptive_system_state["recovery_cycles"] > 0:
-                        logger.debug(f"🔄 Recovery reset: safe_mode activated (was {_adaptive_system_state['recovery_cycles']}/{AUTO_RESUME_SUCCESS_CYCLES})")
-                    _adaptive_system_state["recovery_cycles"] = 0
+                    if _adaptive_system_state.recovery_cycles > 0:
+                        logger.debug(f"🔄 Recovery reset: safe_mode activated (was {_adaptive_system_state.recovery_cycles}/{AUTO_RESUME_SUCCESS_CYCLES})")
+                    _adaptive_system_state.recovery_cycles = 0
             else:
                 # Auto-resume отключен - используем старую логику на основе safe_mode exit
                 if adaptive_state["last_safe_mode_state"] and not system_state.system_health.safe_mode:
@@ -2159,7 +2370,7 @@ async def market_analysis_loop():
                     if time_since_exit >= AUTO_RESUME_SAFE_MODE_DELAY:
                         # HARDENING: Автоматически возобновляем торговлю через state machine
                         state_machine = get_state_machine()
-                        state_machine.sync_to_system_state(system_state, manual_pause_active=_control_plane_state.get("manual_pause_active", False))
+                        state_machine.sync_to_system_state(system_state, manual_pause_active=_control_plane_state.manual_pause_active)
                         adaptive_state["safe_mode_exit_time"] = None
                         logger.info(f"🔄 Trading auto-resumed after safe_mode exit (delay: {AUTO_RESUME_SAFE_MODE_DELAY}s)")
                         # Отправляем уведомление
@@ -2201,7 +2412,7 @@ async def market_analysis_loop():
                         exc_info=True
                     )
             
-            alert_task = asyncio.create_task(_safe_evaluate_alerts(), name="AlertEvaluation")
+            alert_task = spawn_task(_safe_evaluate_alerts(), "AlertEvaluation")
             # Note: This is a fire-and-forget task created inside a registered loop
             # It will be cancelled when the parent loop (MarketAnalysis) is cancelled
             
@@ -2295,6 +2506,7 @@ async def market_analysis_loop():
             break
         except Exception as e:
             logger.error(f"Critical error in market analysis loop: {type(e).__name__}: {e}")
+            import traceback
             logger.error(traceback.format_exc())
             # Пауза с проверкой shutdown
             # Используем await asyncio.sleep() с проверкой shutdown каждую секунду
@@ -2409,8 +2621,7 @@ async def runtime_heartbeat_loop():
                         )
                         
                         # Метрика для Prometheus
-                        _prometheus_metrics["heartbeat_enforcement_total"] = \
-                            _prometheus_metrics.get("heartbeat_enforcement_total", 0) + 1
+                        _counters[IDX_HEARTBEAT_ENFORCEMENT] += 1
                         
                         # Записываем ошибку для health tracking
                         system_state.record_error(f"HEARTBEAT_MISS_ENFORCEMENT: {incident_id}")
@@ -3192,6 +3403,24 @@ async def _telegram_polling_task(app, shutdown_event):
 import json
 import time
 
+# orjson сериализует сразу в bytes (C-реализация); без него — stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_body(data, indent: bool = False) -> bytes:
+    """Сериализует тело HTTP-ответа в UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+# Тело ответа 500 не зависит от запроса — сериализуем один раз
+_HTTP_500_BODY = _json_body({"status": "error", "message": "Internal Server Error"})
+
 async def handle_admin_status():
     """
     GET /admin/status - возвращает статус системы
@@ -3210,11 +3439,11 @@ async def handle_admin_status():
     # SAFE MODE HARD LOCK: safe_mode только читается, никогда не изменяется
     status_data = {
         "trading_paused": system_state.system_health.trading_paused,
-        "manual_pause_active": _control_plane_state.get("manual_pause_active", False),
+        "manual_pause_active": _control_plane_state.manual_pause_active,
         "safe_mode": system_state.system_health.safe_mode,  # READ-ONLY
         "uptime_seconds": round(uptime, 2)
     }
-    return 200, json.dumps(status_data, indent=2).encode('utf-8')
+    return 200, _json_body(status_data, indent=True)
 
 async def handle_admin_pause():
     """
@@ -3230,24 +3459,23 @@ async def handle_admin_pause():
     logger.info("ADMIN COMMAND RECEIVED: pause")
     
     # REQUIREMENT: Concurrency safety - prevent race conditions
-    async with _get_admin_lock():
+    assert _admin_command_lock is not None, "admin lock is created in start_http_server()"
+    async with _admin_command_lock:
         try:
             # Idempotent: можно вызывать несколько раз
             # Атомарное обновление состояния
             # HARDENING: safe_mode НЕ изменяется здесь - он остается как есть
-            _control_plane_state["manual_pause_active"] = True
+            _control_plane_state.manual_pause_active = True
             # HARDENING: Синхронизируем trading_paused через state machine
             state_machine = get_state_machine()
             state_machine.sync_to_system_state(system_state, manual_pause_active=True)
             # SAFE MODE HARD LOCK: safe_mode остается неизменным
             
             # Инкрементируем метрику ДО возврата ответа (новая структура с result labels)
-            if "success" not in _prometheus_metrics["admin_commands_total"]["pause"]:
-                _prometheus_metrics["admin_commands_total"]["pause"]["success"] = 0
             _prometheus_metrics["admin_commands_total"]["pause"]["success"] += 1
             
             logger.info("ADMIN COMMAND APPLIED: pause - trading_paused=True, manual_pause_active=True")
-            return 200, json.dumps({"status": "paused"}).encode('utf-8')
+            return 200, _json_body({"status": "paused"})
         except Exception as e:
             logger.error(f"ADMIN COMMAND ERROR: pause - {type(e).__name__}: {e}")
             raise
@@ -3267,7 +3495,8 @@ async def handle_admin_resume():
     
     # REQUIREMENT: Concurrency safety - prevent race conditions
     # WHY: Concurrent HTTP requests cannot race-clear safe_mode or resume trading while safe_mode == true
-    async with _get_admin_lock():
+    assert _admin_command_lock is not None, "admin lock is created in start_http_server()"
+    async with _admin_command_lock:
         # ========== SAFE MODE HARD LOCK ENFORCEMENT ==========
         # КРИТИЧНО: safe_mode является read-only для HTTP API
         # Проверяем safe_mode ПЕРЕД любыми изменениями состояния (hard lock)
@@ -3276,13 +3505,11 @@ async def handle_admin_resume():
         if safe_mode_before:
             # SAFE MODE HARD LOCK: блокируем команду
             # Инкрементируем метрику для blocked_safe_mode
-            if "blocked_safe_mode" not in _prometheus_metrics["admin_commands_total"]["resume"]:
-                _prometheus_metrics["admin_commands_total"]["resume"]["blocked_safe_mode"] = 0
             _prometheus_metrics["admin_commands_total"]["resume"]["blocked_safe_mode"] += 1
             
             # ВАЖНО: trading_paused и manual_pause_active НЕ изменяются
             trading_paused_before = system_state.system_health.trading_paused
-            manual_pause_before = _control_plane_state["manual_pause_active"]
+            manual_pause_before = _control_plane_state.manual_pause_active
             
             # WARN-level logging as required: "ADMIN RESUME BLOCKED: safe_mode_active"
             logger.warning(
@@ -3294,21 +3521,19 @@ async def handle_admin_resume():
             
             # Возвращаем HTTP 403 с правильным JSON форматом
             # REQUIREMENT: response body MUST include reason: "safe_mode_active"
-            return 403, json.dumps({
+            return 403, _json_body({
                 "reason": "safe_mode_active"
-            }).encode('utf-8')
+            })
         
         # ========== SAFE MODE CHECK PASSED - PROCEED WITH RESUME ==========
         # Атомарное обновление состояния
         # HARDENING: safe_mode НЕ изменяется здесь - он остается как есть
-        _control_plane_state["manual_pause_active"] = False
+        _control_plane_state.manual_pause_active = False
         # HARDENING: Синхронизируем trading_paused через state machine
         state_machine = get_state_machine()
         state_machine.sync_to_system_state(system_state, manual_pause_active=False)
         
         # Инкрементируем метрику для успешного выполнения
-        if "success" not in _prometheus_metrics["admin_commands_total"]["resume"]:
-            _prometheus_metrics["admin_commands_total"]["resume"]["success"] = 0
         _prometheus_metrics["admin_commands_total"]["resume"]["success"] += 1
         
         # Логируем подтверждение, что safe_mode не изменен
@@ -3317,85 +3542,80 @@ async def handle_admin_resume():
             f"ADMIN COMMAND APPLIED: resume - trading_paused=False, manual_pause_active=False. "
             f"SAFE MODE HARD LOCK verified: safe_mode={safe_mode_after} (unchanged from {safe_mode_before})"
         )
-        return 200, json.dumps({"status": "resumed"}).encode('utf-8')
+        return 200, _json_body({"status": "resumed"})
 
-async def handle_metrics():
-    """GET /metrics - возвращает Prometheus-совместимые метрики"""
-    # GLOBAL STATE (intentional) - только чтение
-    global _control_plane_state, _prometheus_metrics
-    metrics = get_analysis_metrics()
-    prom_metrics = get_prometheus_metrics()
+def render_prometheus_exposition(buf: bytearray) -> None:
+    """
+    Дописывает в buf метрики в Prometheus text exposition format.
+    
+    Читает счётчики напрямую (без копий dict через get_*_metrics) и пишет
+    сразу bytes - на scrape не создаются промежуточные dict и строки.
+    """
+    health = system_state.system_health
     
     # Вычисляем uptime
     uptime = 0.0
-    if metrics.get("start_time") is not None:
-        uptime = time.monotonic() - metrics["start_time"]
+    start_time = _analysis_metrics.get("start_time")
+    if start_time is not None:
+        uptime = time.monotonic() - start_time
     
     # Определяем mode для labels (low cardinality)
-    mode = "SAFE_MODE" if system_state.system_health.safe_mode else "NORMAL"
-    if system_state.system_health.consecutive_errors > 0:
+    mode = "SAFE_MODE" if health.safe_mode else "NORMAL"
+    if health.consecutive_errors > 0:
         mode = "CAUTION"
-    
-    # Формируем Prometheus metrics
-    lines = []
+    mode_label = b'mode="%s"' % mode.encode()
     
     # Histogram: market_analysis_duration_seconds
-    for bucket in ANALYSIS_DURATION_BUCKETS:
-        count = prom_metrics["analysis_duration_buckets"].get(bucket, 0)
-        lines.append(f'market_analysis_duration_seconds_bucket{{le="{bucket:.1f}",mode="{mode}"}} {count}')
-    total_count = prom_metrics["analysis_duration_count"]
-    lines.append(f'market_analysis_duration_seconds_bucket{{le="+Inf",mode="{mode}"}} {total_count}')
-    lines.append(f'market_analysis_duration_seconds_sum{{mode="{mode}"}} {prom_metrics["analysis_duration_sum"]:.3f}')
-    lines.append(f'market_analysis_duration_seconds_count{{mode="{mode}"}} {total_count}')
+    for bucket, count in zip(_ANALYSIS_DURATION_BOUNDS, _hist_buckets):
+        buf += b'market_analysis_duration_seconds_bucket{le="%.1f",%s} %d\n' % (bucket, mode_label, count)
+    total_count = _counters[IDX_ANALYSIS_DURATION_COUNT]
+    buf += b'market_analysis_duration_seconds_bucket{le="+Inf",%s} %d\n' % (mode_label, total_count)
+    buf += b'market_analysis_duration_seconds_sum{%s} %.3f\n' % (mode_label, _hist_sum[0])
+    buf += b'market_analysis_duration_seconds_count{%s} %d\n' % (mode_label, total_count)
     
     # Gauge: last_analysis_duration_seconds
-    duration = metrics.get("last_analysis_duration", 0.0)
-    lines.append(f'last_analysis_duration_seconds{{mode="{mode}"}} {duration:.3f}')
+    duration = _analysis_metrics.get("last_analysis_duration", 0.0)
+    buf += b'last_analysis_duration_seconds{%s} %.3f\n' % (mode_label, duration)
     
     # Counters
-    runs_total = metrics.get("analysis_count", 0)
-    lines.append(f'market_analysis_runs_total {runs_total}')
-    cycles_total = prom_metrics["analysis_cycles_total"]
-    lines.append(f'analysis_cycles_total{{mode="{mode}"}} {cycles_total}')
-    errors_total = system_state.system_health.consecutive_errors
-    lines.append(f'market_analysis_errors_total{{mode="{mode}"}} {errors_total}')
-    stalls_total = prom_metrics["scheduler_stalls_total"]
-    lines.append(f'scheduler_stalls_total {stalls_total}')
+    buf += b'market_analysis_runs_total %d\n' % _analysis_metrics.get("analysis_count", 0)
+    buf += b'analysis_cycles_total{%s} %d\n' % (mode_label, _analysis_cycles_total)
+    buf += b'market_analysis_errors_total{%s} %d\n' % (mode_label, health.consecutive_errors)
+    buf += b'scheduler_stalls_total %d\n' % _scheduler_stalls_total
     
     # Gauges
-    lines.append(f'market_volatility 0.000')
-    lines.append(f'uptime_seconds {uptime:.3f}')
-    safe_mode_value = 1 if system_state.system_health.safe_mode else 0
-    lines.append(f'safe_mode {safe_mode_value}')
-    trading_paused_value = 1 if system_state.system_health.trading_paused else 0
-    lines.append(f'trading_paused {trading_paused_value}')
+    buf += b'market_volatility 0.000\n'
+    buf += b'uptime_seconds %.3f\n' % uptime
+    buf += b'safe_mode %d\n' % (1 if health.safe_mode else 0)
+    buf += b'trading_paused %d\n' % (1 if health.trading_paused else 0)
     
     # Adaptive system metrics
-    adaptive_system = get_adaptive_system_state()
-    adaptive_interval = adaptive_system.get("adaptive_interval", float(ANALYSIS_INTERVAL))
-    lines.append(f'adaptive_analysis_interval_seconds {adaptive_interval:.1f}')
-    recovery_cycles = adaptive_system.get("recovery_cycles", 0)
+    adaptive_interval = _adaptive_system_state.adaptive_interval
+    if adaptive_interval is None:
+        # Интервал ещё не инициализирован первым циклом анализа
+        adaptive_interval = float(ANALYSIS_INTERVAL)
+    buf += b'adaptive_analysis_interval_seconds %.1f\n' % adaptive_interval
+    recovery_cycles = _adaptive_system_state.recovery_cycles
     recovery_remaining = max(0, AUTO_RESUME_SUCCESS_CYCLES - recovery_cycles) if AUTO_RESUME_TRADING_ENABLED else 0
-    lines.append(f'recovery_cycles_remaining {recovery_remaining}')
+    buf += b'recovery_cycles_remaining %d\n' % recovery_remaining
     
     # Control plane metrics
-    manual_pause_value = 1 if _control_plane_state["manual_pause_active"] else 0
-    lines.append(f'manual_pause_active {manual_pause_value}')
+    buf += b'manual_pause_active %d\n' % (1 if _control_plane_state.manual_pause_active else 0)
     
     # Admin commands metrics with result labels
     admin_commands = _prometheus_metrics["admin_commands_total"]
-    # Pause commands
-    pause_success = admin_commands.get("pause", {}).get("success", 0)
-    lines.append(f'admin_commands_total{{command="pause", result="success"}} {pause_success}')
-    # Resume commands
-    resume_success = admin_commands.get("resume", {}).get("success", 0)
-    resume_blocked = admin_commands.get("resume", {}).get("blocked_safe_mode", 0)
-    lines.append(f'admin_commands_total{{command="resume", result="success"}} {resume_success}')
-    lines.append(f'admin_commands_total{{command="resume", result="blocked_safe_mode"}} {resume_blocked}')
-    
-    # Объединяем все метрики
-    body = '\n'.join(lines) + '\n'
-    return 200, body.encode('utf-8')
+    pause = admin_commands.get("pause", {})
+    resume = admin_commands.get("resume", {})
+    buf += b'admin_commands_total{command="pause", result="success"} %d\n' % pause.get("success", 0)
+    buf += b'admin_commands_total{command="resume", result="success"} %d\n' % resume.get("success", 0)
+    buf += b'admin_commands_total{command="resume", result="blocked_safe_mode"} %d\n' % resume.get("blocked_safe_mode", 0)
+
+async def handle_metrics():
+    """GET /metrics - возвращает Prometheus-совместимые метрики"""
+    # GLOBAL STATE (intentional) - только чтение
+    buf = bytearray()
+    render_prometheus_exposition(buf)
+    return 200, bytes(buf)
 
 async def handle_chaos_inject():
     """
@@ -3413,10 +3633,10 @@ async def handle_chaos_inject():
     # Проверка доступа (только в debug mode)
     chaos_enabled = os.environ.get("CHAOS_ENABLED", "false").lower() == "true"
     if not chaos_enabled:
-        return 403, json.dumps({
+        return 403, _json_body({
             "error": "chaos_disabled",
             "message": "Chaos injection disabled. Set CHAOS_ENABLED=true to enable."
-        }).encode('utf-8')
+        })
     
     try:
         # Парсим body
@@ -3456,26 +3676,26 @@ async def handle_chaos_inject():
         except Exception:
             pass  # Не критично если task_dump не доступен
         
-        return 200, json.dumps({
+        return 200, _json_body({
             "status": "chaos_injected",
             "incident_id": incident_id,
             "chaos_type": chaos_type.value,
             "duration": duration,
             "message": f"Chaos injection started. Event loop will stall for {duration}s."
-        }).encode('utf-8')
+        })
         
     except RuntimeError as e:
         # Chaos уже активен
-        return 409, json.dumps({
+        return 409, _json_body({
             "error": "chaos_already_active",
             "message": str(e)
-        }).encode('utf-8')
+        })
     except Exception as e:
         logger.error(f"CHAOS_INJECTION_ERROR: {type(e).__name__}: {e}")
-        return 500, json.dumps({
+        return 500, _json_body({
             "error": "chaos_injection_failed",
             "message": str(e)
-        }).encode('utf-8')
+        })
 
 async def handle_chaos_stop():
     """
@@ -3488,9 +3708,9 @@ async def handle_chaos_stop():
     global _chaos_was_active
     chaos_enabled = os.environ.get("CHAOS_ENABLED", "false").lower() == "true"
     if not chaos_enabled:
-        return 403, json.dumps({
+        return 403, _json_body({
             "error": "chaos_disabled"
-        }).encode('utf-8')
+        })
     
     try:
         chaos_engine = get_chaos_engine()
@@ -3522,21 +3742,21 @@ async def handle_chaos_stop():
             _chaos_was_active = False
         
         if stopped:
-            return 200, json.dumps({
+            return 200, _json_body({
                 "status": "chaos_stopped",
                 "message": "Chaos injection stopped successfully"
-            }).encode('utf-8')
+            })
         else:
-            return 404, json.dumps({
+            return 404, _json_body({
                 "error": "no_active_chaos",
                 "message": "No active chaos injection"
-            }).encode('utf-8')
+            })
     except Exception as e:
         logger.error(f"CHAOS_STOP_ERROR: {type(e).__name__}: {e}")
-        return 500, json.dumps({
+        return 500, _json_body({
             "error": "chaos_stop_failed",
             "message": str(e)
-        }).encode('utf-8')
+        })
 
 
 def build_http_routes():
@@ -3561,6 +3781,37 @@ def build_http_routes():
     return routes
 
 
+# Текст статусов HTTP-ответов
+_HTTP_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    500: "Internal Server Error"
+}
+
+# Хвост заголовков после значения Content-Length
+_HTTP_RESPONSE_HEADERS_END = b"\r\nConnection: close\r\n\r\n"
+
+
+@functools.lru_cache(maxsize=64)
+def _http_response_prefix(status_code: int, content_type: str) -> bytes:
+    """
+    Префикс HTTP-ответа до значения Content-Length.
+    
+    Набор пар (status, content-type) у роутера небольшой, поэтому
+    строка статуса и заголовки кодируются один раз и переиспользуются.
+    """
+    status_text = _HTTP_STATUS_TEXT.get(status_code, "Unknown")
+    return (
+        f"HTTP/1.1 {status_code} {status_text}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: "
+    ).encode('utf-8')
+
+
 # HTTP Server lifecycle state (singleton protection)
 _http_server_started = False
 _http_server_instance = None
@@ -3578,7 +3829,7 @@ async def start_http_server():
     - Event loop ownership check
     - Graceful shutdown support
     """
-    global _http_server_started, _http_server_instance
+    global _http_server_started, _http_server_instance, _admin_command_lock
     
     # Защита от двойного старта
     if _http_server_started:
@@ -3594,6 +3845,9 @@ async def start_http_server():
         logger.error(f"HTTP SERVER: No running event loop - {type(e).__name__}: {e}")
         raise
     
+    # Lock admin-команд создаётся один раз, до приёма первого запроса
+    _admin_command_lock = asyncio.Lock()
+    
     # ========== ЕДИНЫЙ ROUTER ==========
     # Используем build_http_routes() - единый источник истины
     routes = build_http_routes()
@@ -3721,7 +3975,7 @@ async def start_http_server():
                                     logger.info(f"HTTP RESPONSE {status_code} {method} {path}")
                                 except Exception as e:
                                     status_code = 500
-                                    response_body = json.dumps({"status": "error", "message": "Internal Server Error"}).encode('utf-8')
+                                    response_body = _HTTP_500_BODY
                                     content_type = "application/json"
                                     logger.error(f"HTTP RESPONSE 500: Handler error: {type(e).__name__}: {e} - {method} {path}")
                             else:
@@ -3740,42 +3994,26 @@ async def start_http_server():
                                     content_type = "text/plain"
                                     logger.info(f"HTTP RESPONSE 404: {method} {path}")
             
-            # Формируем HTTP response
-            status_text = {
-                200: "OK",
-                400: "Bad Request",
-                403: "Forbidden",
-                404: "Not Found",
-                405: "Method Not Allowed",
-                408: "Request Timeout",
-                500: "Internal Server Error"
-            }.get(status_code, "Unknown")
-            
-            response_headers = (
-                f"HTTP/1.1 {status_code} {status_text}\r\n"
-                f"Content-Type: {content_type}\r\n"
-                f"Content-Length: {len(response_body)}\r\n"
-                f"Connection: close\r\n"
-                f"\r\n"
-            )
-            response = response_headers.encode('utf-8') + response_body
-            
-            # Отправляем ответ
-            writer.write(response)
+            # Формируем HTTP response: префикс заголовков берётся из кэша,
+            # на каждый запрос подставляется только Content-Length
+            writer.writelines((
+                _http_response_prefix(status_code, content_type),
+                b"%d" % len(response_body),
+                _HTTP_RESPONSE_HEADERS_END,
+                response_body,
+            ))
             await writer.drain()
             
         except Exception as e:
             # Критическая ошибка - отправляем 500
             try:
-                error_body = json.dumps({"status": "error", "message": "Internal Server Error"}).encode('utf-8')
-                response = (
-                    f"HTTP/1.1 500 Internal Server Error\r\n"
-                    f"Content-Type: application/json\r\n"
-                    f"Content-Length: {len(error_body)}\r\n"
-                    f"Connection: close\r\n"
-                    f"\r\n"
-                ).encode('utf-8') + error_body
-                writer.write(response)
+                error_body = _HTTP_500_BODY
+                writer.writelines((
+                    _http_response_prefix(500, "application/json"),
+                    b"%d" % len(error_body),
+                    _HTTP_RESPONSE_HEADERS_END,
+                    error_body,
+                ))
                 await writer.drain()
                 logger.error(f"HTTP RESPONSE 500: Critical error: {type(e).__name__}: {e}")
             except Exception:
@@ -3912,7 +4150,7 @@ async def telegram_supervisor(system_state):
                     )
                     raise
             
-            polling_task = asyncio.create_task(_safe_polling(), name="TelegramPolling")
+            polling_task = spawn_task(_safe_polling(), "TelegramPolling")
             logger.info("✅ Telegram polling started successfully")
             
             # Reset backoff on success
@@ -4217,36 +4455,44 @@ async def main():
     # Теперь запускаем остальные задачи
     tasks = [
         register_task(
-            asyncio.create_task(market_analysis_loop(), name="MarketAnalysis"),
+            spawn_task(market_analysis_loop(), "MarketAnalysis"),
             "MarketAnalysis"
         ),
         register_task(
-            asyncio.create_task(runtime_heartbeat_loop(), name="RuntimeHeartbeat"),
+            spawn_task(runtime_heartbeat_loop(), "RuntimeHeartbeat"),
             "RuntimeHeartbeat"
         ),
         register_task(
-            asyncio.create_task(heartbeat_loop(), name="TelegramHeartbeat"),
+            spawn_task(heartbeat_loop(), "TelegramHeartbeat"),
             "TelegramHeartbeat"
         ),
         register_task(
-            asyncio.create_task(daily_report_loop(), name="DailyReport"),
+            spawn_task(daily_report_loop(), "DailyReport"),
             "DailyReport"
         ),
         # ========== PRODUCTION HARDENING MONITORS ==========
         register_task(
-            asyncio.create_task(loop_guard_watchdog(), name="LoopGuardWatchdog"),
+            spawn_task(loop_guard_watchdog(), "LoopGuardWatchdog"),
             "LoopGuardWatchdog"
         ),
         register_task(
-            asyncio.create_task(safe_mode_ttl_monitor(), name="SafeModeTTLMonitor"),
+            spawn_task(safe_mode_ttl_monitor(), "SafeModeTTLMonitor"),
             "SafeModeTTLMonitor"
         ),
     ]
     
+    # Отправка алертов (очередь заполняет evaluate_and_send_alerts)
+    tasks.append(
+        register_task(
+            spawn_task(telegram_alert_worker(), "TelegramAlertWorker"),
+            "TelegramAlertWorker"
+        )
+    )
+    
     # Теперь запускаем Telegram supervisor с явным отслеживанием
     logger.info("Starting Telegram supervisor (after system initialization)...")
     telegram_task = register_task(
-        asyncio.create_task(telegram_supervisor(system_state), name="TelegramSupervisor"),
+        spawn_task(telegram_supervisor(system_state), "TelegramSupervisor"),
         "TelegramSupervisor"
     )
     
@@ -4254,7 +4500,7 @@ async def main():
     if ENABLE_SYNTHETIC_DECISION_TICK:
         tasks.append(
             register_task(
-                asyncio.create_task(synthetic_decision_tick_loop(), name="SyntheticDecisionTick"),
+                spawn_task(synthetic_decision_tick_loop(), "SyntheticDecisionTick"),
                 "SyntheticDecisionTick"
             )
         )
@@ -4264,7 +4510,7 @@ async def main():
     if FAULT_INJECT_LOOP_STALL:
         tasks.append(
             register_task(
-                asyncio.create_task(loop_stall_injection_task(), name="LoopStallInjection"),
+                spawn_task(loop_stall_injection_task(), "LoopStallInjection"),
                 "LoopStallInjection"
             )
         )
@@ -4292,12 +4538,11 @@ async def main():
                 if state_machine.should_exit_fatal():
                     logger.critical("FATAL_STATE_DETECTED: Executing centralized exit handler")
                     
-                    # Flush logs перед exit
-                    for handler in root_logger.handlers:
-                        handler.flush()
-                    
                     # HARDENING: Централизованный exit с правильным кодом для systemd
                     logger.critical(f"FATAL_EXIT: Exiting with code {FATAL_EXIT_CODE} (systemd will restart)")
+                    
+                    # Flush logs перед exit (очередь QueueListener)
+                    flush_logs()
                     os._exit(FATAL_EXIT_CODE)
                     
             except asyncio.CancelledError:
@@ -4307,7 +4552,7 @@ async def main():
     
     # Запускаем FATAL state monitor
     fatal_monitor_task = register_task(
-        asyncio.create_task(fatal_state_monitor(), name="FatalStateMonitor"),
+        spawn_task(fatal_state_monitor(), "FatalStateMonitor"),
         "FatalStateMonitor"
     )
     
@@ -4325,6 +4570,7 @@ async def main():
         logger.info("Shutdown requested (KeyboardInterrupt/CancelledError)")
     except Exception as e:
         error_msg = f"CRITICAL ERROR during runtime: {type(e).__name__}: {e}"
+        import traceback
         error_trace = traceback.format_exc()
         
         logger.critical(f"{error_msg}\n{error_trace}")
@@ -4388,6 +4634,15 @@ async def main():
         # Если не уложились → os._exit(FATAL_EXIT_CODE)
         shutdown_start_time = time.time()
         
+        # Даём telegram_alert_worker дописать уже поставленные алерты.
+        # Без проверки empty(): worker забирает пачку из очереди до отправки,
+        # поэтому пустая очередь ещё не значит, что алерты отправлены.
+        # join() возвращается сразу, если незавершённых алертов нет.
+        try:
+            await asyncio.wait_for(_telegram_alert_queue.join(), timeout=TELEGRAM_ALERT_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Alert queue not drained within {TELEGRAM_ALERT_DRAIN_TIMEOUT}s - pending alerts dropped")
+        
         try:
             # КРИТИЧНО: Явно останавливаем Telegram polling ПЕРЕД общей отменой задач
             # Это гарантирует, что polling полностью остановлен до выхода процесса
@@ -4417,6 +4672,14 @@ async def main():
         # CRITICAL: This must complete before checking remaining tasks
         await shutdown_all_tasks()
         
+        # Анализ остановлен - дописываем очередь DecisionTrace, не блокируя event loop
+        gatekeeper_module = sys.modules.get("execution.gatekeeper")
+        if gatekeeper_module is not None:
+            try:
+                await asyncio.to_thread(gatekeeper_module.flush_traces, TRACE_FLUSH_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Error flushing DecisionTrace queue: {type(e).__name__}: {e}")
+        
         # ========== HTTP ADMIN SERVER SHUTDOWN ==========
         # Server type: asyncio.start_server (asyncio.Server)
         # CRITICAL: asyncio.start_server creates handler tasks for each connection
@@ -4513,8 +4776,7 @@ async def main():
         cleanup_pid_file()
         
         # Flush logs before exit
-        for handler in root_logger.handlers:
-            handler.flush()
+        flush_logs()
         
         # ========== THREAD WATCHDOG SHUTDOWN ==========
         # Останавливаем ThreadWatchdog перед завершением
@@ -4769,13 +5031,13 @@ if __name__ == "__main__":
         raise
     except Exception as e:
         error_msg = f"CRITICAL ERROR at entry point: {type(e).__name__}: {e}"
+        import traceback
         error_trace = traceback.format_exc()
         
         logger.critical(f"{error_msg}\n{error_trace}")
         
         # Flush logs перед exit
-        for handler in root_logger.handlers:
-            handler.flush()
+        flush_logs()
         
         # systemd: non-zero exit code для критических ошибок
         exit_code = 1
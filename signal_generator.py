@@ -3,10 +3,7 @@
 Используется в main.py и ecosystem_main.py для устранения дублирования кода
 """
 from config import SYMBOLS, TIMEFRAMES
-from indicators import (
-    atr, rsi, macd, momentum, trend_strength,
-    bollinger_bands, stochastic, adx, ema_crossover, volume_analysis
-)
+from indicators import atr, trend_strength, adx, ema_crossover, compute_bundle
 from context_engine import determine_state
 from states import market_direction, is_flat
 from risk import risk_level, enhanced_risk_level, calculate_stop_distance
@@ -69,6 +66,10 @@ def generate_signals_for_symbols(
         "errors": 0
     }
     
+    # Сигналы, прошедшие анализ, и параметры их демо-сделок
+    pending_signals = []
+    pending_trades = {}
+    
     for symbol in SYMBOLS:
         print(f"🔍 Проверяю символ: {symbol}")
         stats["processed"] += 1
@@ -124,14 +125,16 @@ def generate_signals_for_symbols(
             momentum_data = {}
             if candles_map.get("15m"):
                 try:
-                    momentum_data["rsi_15m"] = rsi(candles_map["15m"], period=14)
-                    momentum_data["macd_15m"] = macd(candles_map["15m"])
-                    momentum_data["momentum_15m"] = momentum(candles_map["15m"])
-                    momentum_data["bb_15m"] = bollinger_bands(candles_map["15m"], period=20)
-                    momentum_data["stoch_15m"] = stochastic(candles_map["15m"], k_period=14)
-                    momentum_data["adx_15m"] = adx(candles_map["15m"], period=14)
-                    momentum_data["ema_cross_15m"] = ema_crossover(candles_map["15m"], fast_period=12, slow_period=26)
-                    momentum_data["volume_15m"] = volume_analysis(candles_map["15m"], period=20)
+                    # Все индикаторы 15m одним вызовом (общие float-колонки и EMA)
+                    bundle_15m = compute_bundle(candles_map["15m"])
+                    momentum_data["rsi_15m"] = bundle_15m["rsi"]
+                    momentum_data["macd_15m"] = bundle_15m["macd"]
+                    momentum_data["momentum_15m"] = bundle_15m["momentum"]
+                    momentum_data["bb_15m"] = bundle_15m["bb"]
+                    momentum_data["stoch_15m"] = bundle_15m["stoch"]
+                    momentum_data["adx_15m"] = bundle_15m["adx"]
+                    momentum_data["ema_cross_15m"] = bundle_15m["ema_cross"]
+                    momentum_data["volume_15m"] = bundle_15m["volume"]
                 except Exception as e:
                     print(f"   ⚠️ Ошибка расчета индикаторов 15m: {e}")
                     momentum_data = {}
@@ -355,6 +358,7 @@ def generate_signals_for_symbols(
                 
                 # Формируем данные сигнала для Gatekeeper (для обратной совместимости)
                 signal_data = {
+                    "side": side,
                     "zone": zone,
                     "position_size": pos_size,
                     "leverage": lev,
@@ -366,47 +370,20 @@ def generate_signals_for_symbols(
                     "volatility_pct": volatility_pct
                 }
                 
-                print(f"   ✅ Отправляем сигнал для {symbol} через Gatekeeper...")
-                try:
-                    # Используем Gatekeeper для отправки сигнала
-                    gatekeeper.send_signal(
-                        symbol=symbol,
-                        signal_data=signal_data,
-                        states=states,
-                        directions=directions,
-                        risk=risk,
-                        score=score,
-                        mode=mode,
-                        reasons=reasons,
-                        system_state=system_state,
-                        snapshot=snapshot  # Передаём snapshot для портфельного анализа
-                    )
-                    print(f"   ✅ Сигнал обработан Gatekeeper для {symbol}")
-                    
-                    # Логируем через SignalSnapshotStore - entry point с fault injection
-                    from core.signal_snapshot_store import SignalSnapshotStore
-                    SignalSnapshotStore.save(snapshot)
-                    stats["signals_sent"] += 1
-                    
-                    # Открываем демо-сделку после успешной отправки сигнала
-                    try:
-                        from demo_trades import log_demo_trade
-                        zone = signal_data.get("zone")
-                        if zone and entry and stop and target:
-                            log_demo_trade(
-                                symbol, side, entry, stop, target,
-                                position_size=pos_size,
-                                leverage=lev
-                            )
-                            print(f"   ✅ Демо-сделка открыта для {symbol} (после отправки сигнала)")
-                    except Exception as trade_error:
-                        print(f"   ⚠️ Не удалось открыть демо-сделку для {symbol}: {type(trade_error).__name__}: {trade_error}")
-                        # Не блокируем процесс, это не критично
-                except Exception as e:
-                    print(f"   ❌ Ошибка при отправке сигнала для {symbol}: {type(e).__name__}: {e}")
-                    import traceback
-                    print(f"   Трассировка:\n{traceback.format_exc()}")
-                    stats["signals_blocked"] += 1
+                print(f"   ✅ Сигнал для {symbol} поставлен в очередь Gatekeeper")
+                # Сигналы тика отправляются одной пачкой после цикла по символам
+                pending_signals.append({
+                    "symbol": symbol,
+                    "signal_data": signal_data,
+                    "states": states,
+                    "directions": directions,
+                    "risk": risk,
+                    "score": score,
+                    "mode": mode,
+                    "reasons": reasons,
+                    "snapshot": snapshot  # Передаём snapshot для портфельного анализа
+                })
+                pending_trades[symbol] = (side, entry, stop, target, pos_size, lev)
             else:
                 print(f"   ⏸ Сигнал для {symbol} не новый (состояние 15m={state_15m} уже было отправлено) - пропускаем")
 
@@ -419,5 +396,48 @@ def generate_signals_for_symbols(
             stats["errors"] += 1
             # Продолжаем обработку других символов при ошибке
     
+    def on_signal_processed(item):
+        """Пост-обработка сигнала сразу после Gatekeeper (до следующего сигнала пачки)"""
+        symbol = item["symbol"]
+        snapshot = item["snapshot"]
+        signal_data = item["signal_data"]
+        side, entry, stop, target, pos_size, lev = pending_trades[symbol]
+        try:
+            print(f"   ✅ Сигнал обработан Gatekeeper для {symbol}")
+            
+            # Логируем через SignalSnapshotStore - entry point с fault injection
+            from core.signal_snapshot_store import SignalSnapshotStore
+            SignalSnapshotStore.save(snapshot)
+            stats["signals_sent"] += 1
+            
+            # Открываем демо-сделку после успешной отправки сигнала
+            # (до оценки следующего сигнала - он увидит эту позицию в портфеле)
+            try:
+                from demo_trades import log_demo_trade
+                zone = signal_data.get("zone")
+                if zone and entry and stop and target:
+                    log_demo_trade(
+                        symbol, side, entry, stop, target,
+                        position_size=pos_size,
+                        leverage=lev
+                    )
+                    print(f"   ✅ Демо-сделка открыта для {symbol} (после отправки сигнала)")
+            except Exception as trade_error:
+                print(f"   ⚠️ Не удалось открыть демо-сделку для {symbol}: {type(trade_error).__name__}: {trade_error}")
+                # Не блокируем процесс, это не критично
+        except Exception as e:
+            print(f"   ❌ Ошибка при отправке сигнала для {symbol}: {type(e).__name__}: {e}")
+            import traceback
+            print(f"   Трассировка:\n{traceback.format_exc()}")
+            stats["signals_blocked"] += 1
+    
+    if pending_signals:
+        print(f"📤 Отправка {len(pending_signals)} сигналов через Gatekeeper...")
+        gatekeeper.send_signals_batch(
+            pending_signals,
+            system_state=system_state,
+            on_processed=on_signal_processed
+        )
+    
     return stats
 
@@ -1,6 +1,38 @@
 from typing import Optional, Dict
+import logging
 from core.market_state import MarketState, get_state_text, normalize_states_dict
 
+logger = logging.getLogger(__name__)
+
+# Шаблоны сообщения собираются один раз при импорте: набор таймфреймов
+# в блоке контекста фиксирован (1H / 30m / 15m)
+_SEPARATOR = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+_HEADER_TEMPLATE = (
+    "📊 **{symbol}**\n\n"
+    + _SEPARATOR + "\n\n"
+    "📈 **КОНТЕКСТ:**\n"
+    "• 1H: `{state_1h}` ({direction_1h})\n"
+    "• 30m: `{state_30m}` ({direction_30m})\n"
+    "• 15m: `{state_15m}`\n\n"
+    "{risk_emoji} **Риск:** `{risk}`\n\n"
+    "{direction_emoji} **{action}**\n"
+).format
+_ZONE_TEMPLATE = (
+    "\n💰 **ПАРАМЕТРЫ ВХОДА:**\n"
+    "• Вход: `{entry:.4f}`\n"
+    "• Стоп: `{stop:.4f}`\n"
+    "• Цель: `{target:.4f}`\n"
+    "• R:R: `{r_ratio:.2f}`\n"
+).format
+_CANDLE_TEMPLATE = (
+    "\n🕯 **АНАЛИТИКА СВЕЧЕЙ:**\n"
+    "• Паттерн: `{pattern}`\n"
+    "• Сигнал: {signal_emoji} `{signal}`\n"
+    "• Сила: `{strength}/5`\n"
+).format
+_RISK_EMOJI = {"HIGH": "🔴", "MEDIUM": "🟡"}
+
+
 def build_signal(symbol, states: Dict[str, Optional[MarketState]], risk, directions, zone=None, 
                  position_size=None, leverage=None, candle_analysis=None):
     """
@@ -21,8 +53,6 @@ def build_signal(symbol, states: Dict[str, Optional[MarketState]], risk, directi
     states = normalize_states_dict(states)
     
     # Проверка инварианта: все значения должны быть MarketState enum или None
-    import logging
-    logger = logging.getLogger(__name__)
     for key, state in states.items():
         if state is not None and not isinstance(state, MarketState):
             logger.error(
@@ -48,11 +78,9 @@ def build_signal(symbol, states: Dict[str, Optional[MarketState]], risk, directi
         
         r_ratio = abs(reward_amount / risk_amount) if risk_amount != 0 else 0
         
-        zone_text = "\n💰 **ПАРАМЕТРЫ ВХОДА:**\n"
-        zone_text += f"• Вход: `{zone['entry']:.4f}`\n"
-        zone_text += f"• Стоп: `{zone['stop']:.4f}`\n"
-        zone_text += f"• Цель: `{zone['target']:.4f}`\n"
-        zone_text += f"• R:R: `{r_ratio:.2f}`\n"
+        zone_text = _ZONE_TEMPLATE(
+            entry=zone['entry'], stop=zone['stop'], target=zone['target'], r_ratio=r_ratio
+        )
 
     # Информация о позиции
     position_text = ""
@@ -72,43 +100,27 @@ def build_signal(symbol, states: Dict[str, Optional[MarketState]], risk, directi
         
         if pattern:
             signal_emoji = "🟢" if signal == "BULLISH" else "🔴" if signal == "BEARISH" else "⚪"
-            candle_text = "\n🕯 **АНАЛИТИКА СВЕЧЕЙ:**\n"
-            candle_text += f"• Паттерн: `{pattern}`\n"
-            candle_text += f"• Сигнал: {signal_emoji} `{signal}`\n"
-            candle_text += f"• Сила: `{strength}/5`\n"
+            candle_text = _CANDLE_TEMPLATE(
+                pattern=pattern, signal_emoji=signal_emoji, signal=signal, strength=strength
+            )
 
     # Эмодзи для риска
-    if risk == "HIGH":
-        risk_emoji = "🔴"
-    elif risk == "MEDIUM":
-        risk_emoji = "🟡"
-    else:
-        risk_emoji = "🟢"
+    risk_emoji = _RISK_EMOJI.get(risk, "🟢")
     
     # Эмодзи для направления
     direction_emoji = "🟢" if action.startswith("LONG") else "🔴" if action.startswith("SHORT") else "⚪"
     
-    signal_msg = f"📊 **{symbol}**\n\n"
-    signal_msg += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-    
-    signal_msg += "📈 **КОНТЕКСТ:**\n"
-    signal_msg += f"• 1H: `{get_state_text(states.get('1h'))}` ({directions.get('1h', 'FLAT')})\n"
-    signal_msg += f"• 30m: `{get_state_text(states.get('30m'))}` ({directions.get('30m', 'FLAT')})\n"
-    signal_msg += f"• 15m: `{get_state_text(states.get('15m'))}`\n\n"
-    
-    signal_msg += f"{risk_emoji} **Риск:** `{risk}`\n\n"
-    
-    signal_msg += f"{direction_emoji} **{action}**\n"
-    
-    if zone_text:
-        signal_msg += zone_text
-    
-    if position_text:
-        signal_msg += position_text
-    
-    if candle_text:
-        signal_msg += candle_text
-    
-    signal_msg += "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    signal_msg = _HEADER_TEMPLATE(
+        symbol=symbol,
+        state_1h=get_state_text(states.get('1h')),
+        direction_1h=directions.get('1h', 'FLAT'),
+        state_30m=get_state_text(states.get('30m')),
+        direction_30m=directions.get('30m', 'FLAT'),
+        state_15m=get_state_text(states.get('15m')),
+        risk_emoji=risk_emoji,
+        risk=risk,
+        direction_emoji=direction_emoji,
+        action=action
+    )
     
-    return signal_msg
+    return signal_msg + zone_text + position_text + candle_text + "\n" + _SEPARATOR
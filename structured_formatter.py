@@ -0,0 +1,159 @@
+"""
+Structured Formatter - форматирование строк runner.log
+
+ФОРМАТ:
+timestamp=<ISO 8601 UTC> level=<LEVEL> pid=<PID> task=<task> component=<component> message=<message>
+
+Для машинной обработки (vector, Loki и т.п.) есть JsonLinesFormatter - одна
+компактная JSON-строка на запись:
+{"t": <epoch float>, "l": <levelno>, "p": <pid>, "tk": <task>, "c": <component>, "m": <message>[, "exc": <traceback>]}
+
+Записи проходят через очередь логирования: StructuredQueueHandler сохраняет
+сообщение и текст traceback раздельно, чтобы JsonLinesFormatter мог вывести
+traceback в поле "exc".
+
+Модуль полностью аннотирован типами и не зависит от остального бота,
+поэтому его можно собрать mypyc (`mypyc structured_formatter.py`):
+скомпилированное расширение с тем же именем импортируется вместо .py
+без изменений в runner.py.
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import time
+from typing import Any, Dict, Tuple
+
+# orjson сериализует заметно быстрее stdlib json; без него — stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Префикс "YYYY-MM-DDTHH:MM:SS" последней отформатированной секунды:
+# записи внутри одной секунды не пересчитывают дату
+_iso_second_cache: Tuple[int, str] = (-1, "")
+
+
+def iso_from_epoch(created: float) -> str:
+    """ISO 8601 (UTC) для record.created - то же, что datetime.fromtimestamp(..., UTC).isoformat()"""
+    global _iso_second_cache
+    seconds = int(created)
+    micros = round((created - seconds) * 1e6)
+    if micros >= 1000000:
+        seconds += 1
+        micros -= 1000000
+    cached_seconds, prefix = _iso_second_cache
+    if cached_seconds != seconds:
+        t = time.gmtime(seconds)
+        prefix = "%04d-%02d-%02dT%02d:%02d:%02d" % (
+            t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec
+        )
+        _iso_second_cache = (seconds, prefix)
+    if micros:
+        return "%s.%06d+00:00" % (prefix, micros)
+    return prefix + "+00:00"
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler, который не склеивает traceback с сообщением.
+    
+    Базовый prepare() записывает traceback в msg и обнуляет exc_info, поэтому
+    formatter в QueueListener не видит исключение. Здесь traceback остаётся
+    в record.exc_text (строка - запись по-прежнему pickleable).
+    """
+    _exc_formatter: logging.Formatter = logging.Formatter()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = self._exc_formatter.formatException(record.exc_info)
+        if record.stack_info:
+            # Как в базовом prepare(): stack остаётся частью сообщения
+            message += "\n" + self._exc_formatter.formatStack(record.stack_info)
+        # Копия: не меняем запись для других handlers в цепочке
+        record = copy.copy(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        record.stack_info = None
+        return record
+
+
+def _exception_text(formatter: logging.Formatter, record: logging.LogRecord) -> str:
+    """Текст traceback записи: из exc_text (после очереди) или из exc_info"""
+    if record.exc_text:
+        return record.exc_text
+    if record.exc_info:
+        return formatter.formatException(record.exc_info)
+    return ""
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Structured formatter для production logging.
+    Формат: timestamp | level | pid | task | component | message
+    """
+    pid: int
+    _template: str
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pid = os.getpid()
+        # pid не меняется - подставляем его в шаблон один раз
+        self._template = f"timestamp=%s level=%s pid={self.pid} task=%s component=%s message=%s"
+
+    def format(self, record: logging.LogRecord) -> str:
+        # task_name/component проставляет ContextFilter в runner.py
+        task_name = getattr(record, 'task_name', 'main')
+        component = getattr(record, 'component', 'runner')
+
+        # JSON-like структурированный формат (читаемый для journalctl)
+        log_entry: str = self._template % (
+            iso_from_epoch(record.created),
+            record.levelname,
+            task_name,
+            component,
+            record.getMessage(),
+        )
+
+        # Добавляем exception info если есть
+        exc_text = _exception_text(self, record)
+        if exc_text:
+            log_entry += "\n" + exc_text
+
+        return log_entry
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    NDJSON formatter: одна JSON-строка на запись, без текстовой сборки полей.
+    Включается в runner.py через LOG_FORMAT=ndjson (только для файла).
+    """
+    pid: int
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pid = os.getpid()
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "t": record.created,
+            "l": record.levelno,
+            "p": self.pid,
+            "tk": getattr(record, 'task_name', 'main'),
+            "c": getattr(record, 'component', 'runner'),
+            "m": record.getMessage(),
+        }
+        exc_text = _exception_text(self, record)
+        if exc_text:
+            entry["exc"] = exc_text
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
@@ -4,6 +4,7 @@
 Вместо разрозненных переменных и singleton объектов,
 все важное состояние хранится здесь и передается явно.
 """
+import time
 from datetime import datetime, UTC
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
@@ -20,7 +21,7 @@ except ImportError:
     Opportunity = Any
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Метрики производительности"""
     total_cycles: int = 0
@@ -29,13 +30,16 @@ class PerformanceMetrics:
     last_error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemHealth:
     """Здоровье системы"""
     is_running: bool = True
     safe_mode: bool = False  # Режим безопасности - блокирует торговлю
     trading_paused: bool = False  # Торговля приостановлена (CRITICAL alert)
     last_heartbeat: Optional[datetime] = None
+    # time.monotonic_ns() последнего heartbeat (0 - ещё не было в этом процессе);
+    # для проверок интервала, last_heartbeat - для отображения
+    last_heartbeat_mono_ns: int = 0
     consecutive_errors: int = 0
 
 
@@ -186,6 +190,7 @@ class SystemState:
     def update_heartbeat(self):
         """Обновляет время последнего heartbeat"""
         self.system_health.last_heartbeat = datetime.now(UTC)
+        self.system_health.last_heartbeat_mono_ns = time.monotonic_ns()
     
     def reset(self):
         """Сбрасывает состояние (для тестов)"""
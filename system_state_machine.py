@@ -36,11 +36,10 @@ INVARIANTS:
 import asyncio
 import time
 import logging
-import uuid
 import queue
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, UTC
 
 logger = logging.getLogger(__name__)
@@ -101,6 +100,8 @@ class SystemStateMachine:
         # HARDENING: TTL управляется только state machine, не глобальными переменными
         self._safe_mode_ttl = safe_mode_ttl
         self._safe_mode_entered_at: Optional[datetime] = None
+        # То же время по time.monotonic() - для проверки TTL в ThreadWatchdog
+        self._safe_mode_entered_monotonic: Optional[float] = None
         
         # Heartbeat для SAFE_MODE
         self._last_heartbeat: Optional[datetime] = None
@@ -250,6 +251,7 @@ class SystemStateMachine:
                 return False
             
             # Создаём incident_id для корреляции
+            import uuid
             incident_id = f"state-{uuid.uuid4().hex[:8]}"
             
             # Выполняем переход
@@ -259,9 +261,11 @@ class SystemStateMachine:
             # Специальная обработка для SAFE_MODE
             if new_state == SystemState.SAFE_MODE:
                 self._safe_mode_entered_at = datetime.now(UTC)
+                self._safe_mode_entered_monotonic = time.monotonic()
                 self._recovery_cycles = 0  # Сбрасываем recovery cycles
             elif old_state == SystemState.SAFE_MODE:
                 self._safe_mode_entered_at = None
+                self._safe_mode_entered_monotonic = None
             
             # Специальная обработка для RECOVERING
             if new_state == SystemState.RECOVERING:
@@ -406,6 +410,7 @@ class SystemStateMachine:
             return False
         
         if incident_id is None:
+            import uuid
             incident_id = f"thread-watchdog-{uuid.uuid4().hex[:8]}"
         
         # HARDENING: Проверяем текущее состояние БЕЗ блокировки (только чтение)
@@ -559,6 +564,21 @@ class SystemStateMachine:
         """
         return self._safe_mode_entered_at
     
+    def get_safe_mode_entered_monotonic(self) -> Optional[float]:
+        """
+        HARDENING: Thread-safe чтение времени входа в SAFE_MODE по time.monotonic().
+        Для TTL-проверки в ThreadWatchdog без datetime-арифметики.
+        """
+        return self._safe_mode_entered_monotonic
+    
+    def get_state_snapshot(self) -> Tuple[SystemState, Optional[float], float]:
+        """
+        HARDENING: Снимок (state, safe_mode_entered_monotonic, safe_mode_ttl) для ThreadWatchdog.
+        Одно обращение к state machine на тик вместо отдельных чтений.
+        НЕ использует async/await, безопасно вызывать из thread.
+        """
+        return self._state, self._safe_mode_entered_monotonic, self._safe_mode_ttl
+    
     def get_safe_mode_ttl(self) -> float:
         """
         HARDENING: Thread-safe чтение safe_mode_ttl для ThreadWatchdog.
@@ -0,0 +1,108 @@
+"""
+Тесты короткого пути портфельного анализа Gatekeeper.
+
+Gatekeeper._uncorrelated_portfolio_analysis возвращает ALLOW без вызова
+Portfolio Brain. Это допустимо только если Portfolio Brain вернул бы тот же
+результат: не BLOCK / SCALE_DOWN / REDUCE и recommended_size_multiplier == 1.0.
+"""
+import itertools
+from datetime import datetime, UTC
+
+import pytest
+
+pytest.importorskip("telegram")  # execution.gatekeeper импортирует telegram_bot
+
+from core.market_state import MarketState
+from core.portfolio_brain import (
+    PortfolioBrain,
+    PortfolioDecision,
+    PortfolioState,
+    PositionDirection,
+    PositionSnapshot,
+)
+from core.signal_snapshot import SignalSnapshot
+from execution.gatekeeper import Gatekeeper
+
+
+def _shortcut(snapshot, open_positions, portfolio_state):
+    # Короткий путь не использует состояние Gatekeeper - полная инициализация не нужна
+    gatekeeper = object.__new__(Gatekeeper)
+    return gatekeeper._uncorrelated_portfolio_analysis(snapshot, open_positions, portfolio_state)
+
+
+def _position(symbol, size, confidence, entropy=0.3, market_state=MarketState.A):
+    return PositionSnapshot(
+        symbol=symbol,
+        direction=PositionDirection.LONG,
+        size=size,
+        entry_price=100.0,
+        unrealized_pnl=0.0,
+        market_state=market_state,
+        confidence=confidence,
+        entropy=entropy,
+    )
+
+
+def _portfolio_state(open_positions, risk_budget=1000.0, used_risk=100.0):
+    total = sum(pos.size for pos in open_positions)
+    return PortfolioState(
+        total_exposure=total,
+        long_exposure=total,
+        short_exposure=0.0,
+        net_exposure=total,
+        risk_budget=risk_budget,
+        used_risk=used_risk,
+    )
+
+
+def _signal(symbol="ETHUSDT", confidence=0.6, entropy=0.3, state=MarketState.B):
+    return SignalSnapshot(
+        timestamp=datetime.now(UTC),
+        symbol=symbol,
+        timeframe_anchor="15m",
+        states={"15m": state},
+        confidence=confidence,
+        entropy=entropy,
+    )
+
+
+class TestUncorrelatedPortfolioShortcut:
+    """Короткий путь не должен менять решение Portfolio Brain"""
+
+    def test_low_confidence_vs_portfolio_average_goes_to_brain(self):
+        """confidence < 0.8 × средней confidence портфеля → SCALE_DOWN 0.7, а не ALLOW 1.0"""
+        open_positions = [_position("BTCUSDT", 200.0, 0.8), _position("SOLUSDT", 100.0, 0.8)]
+        portfolio_state = _portfolio_state(open_positions)
+        snapshot = _signal(confidence=0.45)
+
+        analysis = PortfolioBrain().evaluate(snapshot, open_positions, portfolio_state)
+        assert analysis.decision == PortfolioDecision.SCALE_DOWN
+        assert analysis.recommended_size_multiplier == pytest.approx(0.7)
+
+        assert _shortcut(snapshot, open_positions, portfolio_state) is None
+
+    def test_shortcut_allow_matches_brain(self):
+        """Каждый ALLOW короткого пути совпадает с полным анализом Portfolio Brain"""
+        brain = PortfolioBrain()
+        shortcut_hits = 0
+        for confidence, book_confidence, exposure, used_risk in itertools.product(
+            (0.4, 0.45, 0.6, 0.9),
+            (0.3, 0.6, 0.8, 1.0),
+            (100.0, 500.0, 850.0, 1200.0),
+            (100.0, 600.0),
+        ):
+            open_positions = [
+                _position("BTCUSDT", exposure / 2, book_confidence),
+                _position("SOLUSDT", exposure / 2, book_confidence, market_state=MarketState.C),
+            ]
+            portfolio_state = _portfolio_state(open_positions, used_risk=used_risk)
+            snapshot = _signal(confidence=confidence)
+
+            shortcut = _shortcut(snapshot, open_positions, portfolio_state)
+            if shortcut is None:
+                continue
+            shortcut_hits += 1
+            analysis = brain.evaluate(snapshot, open_positions, portfolio_state)
+            assert analysis.decision == PortfolioDecision.ALLOW
+            assert analysis.recommended_size_multiplier == shortcut.recommended_size_multiplier
+        assert shortcut_hits > 0